@@ -4,6 +4,7 @@ import logging
 import logging.handlers
 import os
 import sys
+import threading
 from collections import defaultdict
 
 from types import ModuleType
@@ -30,16 +31,30 @@ _LOGGER = logging.getLogger(__name__)
 
 ATTR_COMPONENT = 'component'
 
+DATA_SETUP_TASKS = 'setup_tasks'
+DATA_SETUP_TIMELINE = 'setup_timeline'
+DATA_SETUP_WAITS = 'setup_waits'
+
+# Set up one at a time before any other component
+FIRST_COMPONENTS = ('logger', 'recorder', 'introduction')
+
 ERROR_LOG_FILENAME = 'home-assistant.log'
 _PERSISTENT_ERRORS = {}
 HA_COMPONENT_URL = '[{}](https://home-assistant.io/components/{}/)'
 
+# The setup task of the component whose setup runs in this thread
+_SETUP_THREAD = threading.local()
+
 
 def setup_component(hass: core.HomeAssistant, domain: str,
                     config: Optional[Dict]=None) -> bool:
     """Setup a component and all its dependencies."""
-    return run_coroutine_threadsafe(
-        async_setup_component(hass, domain, config), loop=hass.loop).result()
+    parent = getattr(_SETUP_THREAD, 'task', None)
+    if parent is None:
+        coro = async_setup_component(hass, domain, config)
+    else:
+        coro = _async_setup_from_thread(hass, domain, config, parent)
+    return run_coroutine_threadsafe(coro, loop=hass.loop).result()
 
 
 @asyncio.coroutine
@@ -100,26 +115,100 @@ def _async_setup_component(hass: core.HomeAssistant,
                            domain: str, config) -> bool:
     """Setup a component for Home Assistant.
 
+    A component that is already being set up is not set up twice, the caller
+    waits for the setup in progress instead.
+
     This method is a coroutine.
     """
-    # pylint: disable=too-many-return-statements
     if domain in hass.config.components:
         return True
 
+    setup_tasks = hass.data.get(DATA_SETUP_TASKS)
+    if setup_tasks is None:
+        setup_tasks = hass.data[DATA_SETUP_TASKS] = {}
+
+    setup_waits = _async_setup_waits(hass)
+    caller = asyncio.Task.current_task(loop=hass.loop)
+    task = setup_tasks.get(domain)
+
+    if task is None:
+        task = setup_tasks[domain] = hass.loop.create_task(
+            _async_run_setup_component(hass, domain, config))
+    else:
+        # Waiting on a setup that is waiting on us would never finish
+        blocked = task
+        while blocked is not None:
+            if blocked is caller:
+                _LOGGER.error('Attempt made to setup %s during setup of %s',
+                              domain, domain)
+                _async_persistent_notification(hass, domain, True)
+                return False
+            blocked = setup_waits.get(blocked)
+
+    setup_waits[caller] = task
+    try:
+        # Shielded so a cancelled caller does not abort the shared setup
+        return (yield from asyncio.shield(task, loop=hass.loop))
+    finally:
+        setup_waits.pop(caller, None)
+
+
+@asyncio.coroutine
+def _async_setup_from_thread(hass: core.HomeAssistant, domain: str,
+                             config: Optional[Dict], parent) -> bool:
+    """Setup a component for a thread that blocks the setup task parent.
+
+    This method is a coroutine.
+    """
+    setup_waits = _async_setup_waits(hass)
+    setup_waits[parent] = asyncio.Task.current_task(loop=hass.loop)
+    try:
+        return (yield from async_setup_component(hass, domain, config))
+    finally:
+        setup_waits.pop(parent, None)
+
+
+def _async_setup_waits(hass: core.HomeAssistant):
+    """Return which task each task blocked on a component setup waits for.
+
+    This method must be run in the event loop.
+    """
+    setup_waits = hass.data.get(DATA_SETUP_WAITS)
+    if setup_waits is None:
+        setup_waits = hass.data[DATA_SETUP_WAITS] = {}
+    return setup_waits
+
+
+def _run_setup_in_thread(parent, component, hass: core.HomeAssistant,
+                         config) -> bool:
+    """Run the setup of a component that is not async.
+
+    This method needs to run in an executor.
+    """
+    _SETUP_THREAD.task = parent
+    try:
+        return component.setup(hass, config)
+    finally:
+        _SETUP_THREAD.task = None
+
+
+@asyncio.coroutine
+def _async_run_setup_component(hass: core.HomeAssistant,
+                               domain: str, config) -> bool:
+    """Run the setup of a component.
+
+    This method is a coroutine.
+    """
+    # pylint: disable=too-many-return-statements
     setup_lock = hass.data.get('setup_lock')
     if setup_lock is None:
         setup_lock = hass.data['setup_lock'] = asyncio.Lock(loop=hass.loop)
 
-    setup_progress = hass.data.get('setup_progress')
-    if setup_progress is None:
-        setup_progress = hass.data['setup_progress'] = []
-
-    if domain in setup_progress:
-        _LOGGER.error('Attempt made to setup %s during setup of %s',
-                      domain, domain)
-        _async_persistent_notification(hass, domain, True)
-        return False
+    setup_timeline = hass.data.get(DATA_SETUP_TIMELINE)
+    if setup_timeline is None:
+        setup_timeline = hass.data[DATA_SETUP_TIMELINE] = {}
 
+    start = hass.loop.time()
     try:
         # Used to indicate to discovery that a setup is ongoing and allow it
         # to wait till it is done.
@@ -128,7 +217,6 @@ def _async_setup_component(hass: core.HomeAssistant,
             yield from setup_lock.acquire()
             did_lock = True
 
-        setup_progress.append(domain)
         config = yield from async_prepare_setup_component(hass, config, domain)
 
         if config is None:
@@ -146,8 +234,12 @@ def _async_setup_component(hass: core.HomeAssistant,
             if async_comp:
                 result = yield from component.async_setup(hass, config)
             else:
+                # Not on the default pool: sync setups block on platform
+                # setups, which run there.
                 result = yield from hass.loop.run_in_executor(
-                    None, component.setup, hass, config)
+                    hass.executors[core.POOL_SETUP], _run_setup_in_thread,
+                    asyncio.Task.current_task(loop=hass.loop), component,
+                    hass, config)
         except Exception:  # pylint: disable=broad-except
             _LOGGER.exception('Error during setup of component %s', domain)
             _async_persistent_notification(hass, domain, True)
@@ -172,7 +264,8 @@ def _async_setup_component(hass: core.HomeAssistant,
 
         return True
     finally:
-        setup_progress.remove(domain)
+        hass.data[DATA_SETUP_TASKS].pop(domain, None)
+        setup_timeline[domain] = (start, hass.loop.time())
         if did_lock:
             setup_lock.release()
 
@@ -414,12 +507,104 @@ def async_from_config_dict(config: Dict[str, Any],
     service.HASS = hass
 
     # Setup the components
-    for domain in loader.load_order_components(components):
-        yield from _async_setup_component(hass, domain, config)
+    yield from _async_setup_components(hass, components, config)
 
     return hass
 
 
+@asyncio.coroutine
+def _async_setup_components(hass: core.HomeAssistant, components, config):
+    """Setup components concurrently along their dependencies.
+
+    Each component is set up as soon as its dependencies are done. The
+    ordering rules of loader.load_order_components are kept: the
+    FIRST_COMPONENTS go first and components that depend on group wait for
+    all components that do not.
+
+    This method is a coroutine.
+    """
+    load_order = loader.load_order_components(components)
+    setup_lock = hass.data.get('setup_lock')
+    if setup_lock is None:
+        setup_lock = hass.data['setup_lock'] = asyncio.Lock(loop=hass.loop)
+
+    tasks = {}
+    waited_on = {}
+
+    # Sync setups hold a worker of the setup pool until they are done. Keep
+    # half of them free for the components those setups set up themselves.
+    sync_slots = asyncio.Semaphore(
+        max(1, hass.executors[core.POOL_SETUP].max_workers // 2),
+        loop=hass.loop)
+
+    @asyncio.coroutine
+    def setup_when_ready(domain, after):
+        """Wait for the dependencies of a component and set it up."""
+        waits = [tasks[dep] for dep in after]
+        if waits:
+            yield from asyncio.wait(waits, loop=hass.loop)
+
+        if hasattr(loader.get_component(domain), 'async_setup'):
+            return (yield from _async_setup_component(hass, domain, config))
+
+        with (yield from sync_slots):
+            return (yield from _async_setup_component(hass, domain, config))
+
+    # Discovery waits on the setup lock, hold it so it does not start
+    # setting up components while the rest are still in flight.
+    yield from setup_lock.acquire()
+    try:
+        for domain in FIRST_COMPONENTS:
+            if domain in load_order:
+                yield from _async_setup_component(hass, domain, config)
+
+        no_group = [domain for domain in load_order
+                    if domain not in FIRST_COMPONENTS and
+                    'group' not in loader.load_order_component(domain)]
+
+        # load_order lists dependencies before the components that use them
+        for domain in no_group + [domain for domain in load_order
+                                  if domain not in FIRST_COMPONENTS and
+                                  domain not in no_group]:
+            component = loader.get_component(domain)
+            after = set(dep for dep in getattr(component, 'DEPENDENCIES', [])
+                        if dep in tasks)
+            if domain not in no_group:
+                after.update(no_group)
+            waited_on[domain] = after
+            tasks[domain] = hass.loop.create_task(
+                setup_when_ready(domain, after))
+
+        if tasks:
+            yield from asyncio.wait(tasks.values(), loop=hass.loop)
+    finally:
+        setup_lock.release()
+
+    if _LOGGER.isEnabledFor(logging.INFO):
+        _log_critical_path(hass, waited_on)
+
+
+def _log_critical_path(hass: core.HomeAssistant, waited_on):
+    """Log the chain of component setups that took the longest."""
+    timeline = hass.data.get(DATA_SETUP_TIMELINE, {})
+    finished = [domain for domain in waited_on if domain in timeline]
+    if not finished:
+        return
+
+    path = []
+    domain = max(finished, key=lambda domain: timeline[domain][1])
+    while domain is not None:
+        path.append(domain)
+        gates = [dep for dep in waited_on.get(domain, ()) if dep in timeline]
+        domain = max(gates, key=lambda dep: timeline[dep][1]) \
+            if gates else None
+
+    _LOGGER.info('Critical setup path: %s', ' <- '.join(
+        '{} ({:.2f}s)'.format(domain, timeline[domain][1] -
+                              timeline[domain][0])
+        for domain in path))
+
+
 def from_config_file(config_path: str,
                      hass: Optional[core.HomeAssistant]=None,
                      verbose: bool=False,
@@ -19,7 +19,8 @@ from homeassistant.const import (
     HTTP_BAD_REQUEST, HTTP_CREATED, HTTP_NOT_FOUND,
     HTTP_UNPROCESSABLE_ENTITY, MATCH_ALL, URL_API, URL_API_COMPONENTS,
     URL_API_CONFIG, URL_API_DISCOVERY_INFO, URL_API_ERROR_LOG,
-    URL_API_EVENT_FORWARD, URL_API_EVENTS, URL_API_SERVICES,
+    URL_API_EVENT_FORWARD, URL_API_EVENTS, URL_API_EVENTS_BULK,
+    URL_API_EXECUTORS, URL_API_SERVICES,
     URL_API_STATES, URL_API_STATES_ENTITY, URL_API_STREAM, URL_API_TEMPLATE,
     __version__)
 from homeassistant.exceptions import TemplateError
@@ -32,12 +33,22 @@ DEPENDENCIES = ['http']
 
 STREAM_PING_PAYLOAD = "ping"
 STREAM_PING_INTERVAL = 50  # seconds
+STREAM_MAX_QUEUE = 100  # events a client may fall behind
+
+DATA_STREAM_HUB = 'api_stream_hub'
+
+# Queued to end a stream
+_STREAM_STOP = object()
+_STREAM_PING_MESSAGE = 'data: {}\n\n'.format(
+    STREAM_PING_PAYLOAD).encode('UTF-8')
 
 _LOGGER = logging.getLogger(__name__)
 
 
 def setup(hass, config):
     """Register the API with the HTTP interface."""
+    hass.data[DATA_STREAM_HUB] = StreamHub(hass)
+
     hass.http.register_view(APIStatusView)
     hass.http.register_view(APIEventStream)
     hass.http.register_view(APIConfigView)
@@ -46,10 +57,12 @@ def setup(hass, config):
     hass.http.register_view(APIEntityStateView)
     hass.http.register_view(APIEventListenersView)
     hass.http.register_view(APIEventView)
+    hass.http.register_view(APIEventBulkView)
     hass.http.register_view(APIServicesView)
     hass.http.register_view(APIDomainServicesView)
     hass.http.register_view(APIEventForwardingView)
     hass.http.register_view(APIComponentsView)
+    hass.http.register_view(APIExecutorsView)
     hass.http.register_view(APIErrorLogView)
     hass.http.register_view(APITemplateView)
 
@@ -68,6 +81,100 @@ class APIStatusView(HomeAssistantView):
         return self.json_message('API running.')
 
 
+class StreamHub(object):
+    """Serialize each event once and push it to all event streams.
+
+    Clients are indexed by the event types they are restricted to. Each
+    client has a bounded queue, a client that falls behind that far is
+    disconnected.
+    """
+
+    def __init__(self, hass):
+        """Initialize the hub."""
+        self.hass = hass
+        self._restrict = {}
+        self._all = set()
+        self._by_type = {}
+        self._unsub = None
+
+    def __len__(self):
+        """Return the number of attached clients."""
+        return len(self._restrict)
+
+    @ha.callback
+    def async_attach(self, restrict=None):
+        """Attach a client and return the queue it reads from.
+
+        restrict is a list of event types to only stream, None for all.
+        """
+        queue = asyncio.Queue(maxsize=STREAM_MAX_QUEUE, loop=self.hass.loop)
+        self._restrict[queue] = restrict
+
+        if restrict:
+            for event_type in restrict:
+                self._by_type.setdefault(event_type, set()).add(queue)
+        else:
+            self._all.add(queue)
+
+        if self._unsub is None:
+            self._unsub = self.hass.bus.async_listen(
+                MATCH_ALL, self._async_forward)
+
+        return queue
+
+    @ha.callback
+    def async_detach(self, queue):
+        """Detach the client reading from queue."""
+        if queue not in self._restrict:
+            return
+
+        restrict = self._restrict.pop(queue)
+
+        if restrict:
+            for event_type in restrict:
+                queues = self._by_type[event_type]
+                queues.discard(queue)
+                if not queues:
+                    self._by_type.pop(event_type)
+        else:
+            self._all.discard(queue)
+
+        if not self._restrict:
+            self._unsub()
+            self._unsub = None
+
+    @ha.callback
+    def _async_forward(self, event):
+        """Serialize an event and queue it for the clients that want it."""
+        if event.event_type == EVENT_TIME_CHANGED:
+            return
+
+        queues = self._by_type.get(event.event_type)
+        if queues:
+            queues = self._all | queues
+        elif self._all:
+            queues = list(self._all)
+        else:
+            return
+
+        if event.event_type == EVENT_HOMEASSISTANT_STOP:
+            payload = _STREAM_STOP
+        else:
+            payload = 'data: {}\n\n'.format(
+                rem.json_dumps(event)).encode('UTF-8')
+
+        for queue in queues:
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                _LOGGER.warning('Closing event stream that fell %d events '
+                                'behind', STREAM_MAX_QUEUE)
+                self.async_detach(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(_STREAM_STOP)
+
+
 class APIEventStream(HomeAssistantView):
     """View to handle EventStream requests."""
 
@@ -77,63 +184,39 @@ class APIEventStream(HomeAssistantView):
     @asyncio.coroutine
     def get(self, request):
         """Provide a streaming interface for the event bus."""
-        stop_obj = object()
-        to_write = asyncio.Queue(loop=self.hass.loop)
+        hub = self.hass.data[DATA_STREAM_HUB]
 
         restrict = request.GET.get('restrict')
         if restrict:
             restrict = restrict.split(',') + [EVENT_HOMEASSISTANT_STOP]
 
-        @asyncio.coroutine
-        def forward_events(event):
-            """Forward events to the open request."""
-            if event.event_type == EVENT_TIME_CHANGED:
-                return
-
-            if restrict and event.event_type not in restrict:
-                return
-
-            _LOGGER.debug('STREAM %s FORWARDING %s', id(stop_obj), event)
-
-            if event.event_type == EVENT_HOMEASSISTANT_STOP:
-                data = stop_obj
-            else:
-                data = json.dumps(event, cls=rem.JSONEncoder)
-
-            yield from to_write.put(data)
-
-        response = web.StreamResponse()
-        response.content_type = 'text/event-stream'
-        yield from response.prepare(request)
-
-        unsub_stream = self.hass.bus.async_listen(MATCH_ALL, forward_events)
+        to_write = hub.async_attach(restrict)
 
         try:
-            _LOGGER.debug('STREAM %s ATTACHED', id(stop_obj))
+            response = web.StreamResponse()
+            response.content_type = 'text/event-stream'
+            yield from response.prepare(request)
+
+            _LOGGER.debug('STREAM %s ATTACHED', id(to_write))
 
             # Fire off one message so browsers fire open event right away
-            yield from to_write.put(STREAM_PING_PAYLOAD)
+            payload = _STREAM_PING_MESSAGE
+
+            while payload is not _STREAM_STOP:
+                _LOGGER.debug('STREAM %s WRITING %s', id(to_write), payload)
+                response.write(payload)
+                yield from response.drain()
 
-            while True:
                 try:
                     with async_timeout.timeout(STREAM_PING_INTERVAL,
                                                loop=self.hass.loop):
                         payload = yield from to_write.get()
-
-                    if payload is stop_obj:
-                        break
-
-                    msg = "data: {}\n\n".format(payload)
-                    _LOGGER.debug('STREAM %s WRITING %s', id(stop_obj),
-                                  msg.strip())
-                    response.write(msg.encode("UTF-8"))
-                    yield from response.drain()
                 except asyncio.TimeoutError:
-                    yield from to_write.put(STREAM_PING_PAYLOAD)
+                    payload = _STREAM_PING_MESSAGE
 
         finally:
-            _LOGGER.debug('STREAM %s RESPONSE CLOSED', id(stop_obj))
-            unsub_stream()
+            _LOGGER.debug('STREAM %s RESPONSE CLOSED', id(to_write))
+            hub.async_detach(to_write)
 
 
 class APIConfigView(HomeAssistantView):
@@ -173,10 +256,11 @@ class APIStatesView(HomeAssistantView):
     url = URL_API_STATES
     name = "api:states"
 
-    @ha.callback
+    @asyncio.coroutine
     def get(self, request):
         """Get current states."""
-        return self.json(self.hass.states.async_all())
+        response = yield from self.async_json(self.hass.states.async_all())
+        return response
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -262,18 +346,40 @@ class APIEventView(HomeAssistantView):
             return self.json_message('Event data should be a JSON object',
                                      HTTP_BAD_REQUEST)
 
-        # Special case handling for event STATE_CHANGED
-        # We will try to convert state dicts back to State objects
-        if event_type == ha.EVENT_STATE_CHANGED and event_data:
-            for key in ('old_state', 'new_state'):
-                state = ha.State.from_dict(event_data.get(key))
+        async_fire_remote_event(self.hass, event_type, event_data)
+
+        return self.json_message("Event {} fired.".format(event_type))
 
-                if state:
-                    event_data[key] = state
 
-        self.hass.bus.async_fire(event_type, event_data, ha.EventOrigin.remote)
+class APIEventBulkView(HomeAssistantView):
+    """View to fire a batch of events, used by the event forwarder."""
 
-        return self.json_message("Event {} fired.".format(event_type))
+    url = URL_API_EVENTS_BULK
+    name = "api:events-bulk"
+
+    @asyncio.coroutine
+    def post(self, request):
+        """Fire a list of events in order."""
+        try:
+            events = yield from request.json()
+        except ValueError:
+            return self.json_message('Invalid JSON specified',
+                                     HTTP_BAD_REQUEST)
+
+        if not isinstance(events, list) or not all(
+                isinstance(event, dict) and
+                isinstance(event.get('event_type'), str) and
+                isinstance(event.get('event_data') or {}, dict)
+                for event in events):
+            return self.json_message(
+                'Events should be a list of objects with an event_type '
+                'and optional event_data object', HTTP_BAD_REQUEST)
+
+        for event in events:
+            async_fire_remote_event(
+                self.hass, event['event_type'], event.get('event_data'))
+
+        return self.json_message("{} events fired.".format(len(events)))
 
 
 class APIServicesView(HomeAssistantView):
@@ -392,6 +498,19 @@ class APIComponentsView(HomeAssistantView):
         return self.json(self.hass.config.components)
 
 
+class APIExecutorsView(HomeAssistantView):
+    """View to handle executor statistics requests."""
+
+    url = URL_API_EXECUTORS
+    name = "api:executors"
+
+    @ha.callback
+    def get(self, request):
+        """Get the statistics of the executor pools."""
+        return self.json({name: executor.stats() for name, executor
+                          in self.hass.executors.items()})
+
+
 class APIErrorLogView(HomeAssistantView):
     """View to handle ErrorLog requests."""
 
@@ -424,6 +543,21 @@ class APITemplateView(HomeAssistantView):
                                      HTTP_BAD_REQUEST)
 
 
+@ha.callback
+def async_fire_remote_event(hass, event_type, event_data):
+    """Fire an event received from another instance."""
+    # Special case handling for event STATE_CHANGED
+    # We will try to convert state dicts back to State objects
+    if event_type == ha.EVENT_STATE_CHANGED and event_data:
+        for key in ('old_state', 'new_state'):
+            state = ha.State.from_dict(event_data.get(key))
+
+            if state:
+                event_data[key] = state
+
+    hass.bus.async_fire(event_type, event_data, ha.EventOrigin.remote)
+
+
 def async_services_json(hass):
     """Generate services data to JSONify."""
     return [{"domain": key, "services": value}
@@ -18,7 +18,9 @@ from homeassistant.const import (
     CONF_SENSOR_CLASS, CONF_SENSORS)
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity import async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import (
+    async_track_render_info, async_track_state_change)
+from homeassistant.helpers.template import RenderInfo
 import homeassistant.helpers.config_validation as cv
 
 _LOGGER = logging.getLogger(__name__)
@@ -42,8 +44,7 @@ def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
 
     for device, device_config in config[CONF_SENSORS].items():
         value_template = device_config[CONF_VALUE_TEMPLATE]
-        entity_ids = (device_config.get(ATTR_ENTITY_ID) or
-                      value_template.extract_entities())
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
         friendly_name = device_config.get(ATTR_FRIENDLY_NAME, device)
         sensor_class = device_config.get(CONF_SENSOR_CLASS)
 
@@ -80,14 +81,22 @@ class BinarySensorTemplate(BinarySensorDevice):
         self._sensor_class = sensor_class
         self._template = value_template
         self._state = None
+        self._track_render_info = entity_ids is None
+        self._render_info = None
+        self._async_unsub_render_info = None
 
         @callback
         def template_bsensor_state_listener(entity, old_state, new_state):
             """Called when the target device changes state."""
             hass.async_add_job(self.async_update_ha_state, True)
 
-        async_track_state_change(
-            hass, entity_ids, template_bsensor_state_listener)
+        self._state_listener = template_bsensor_state_listener
+
+        # Without configured entities the states accessed by the last
+        # render are tracked, see async_update.
+        if entity_ids is not None:
+            async_track_state_change(
+                hass, entity_ids, template_bsensor_state_listener)
 
     @property
     def name(self):
@@ -112,8 +121,10 @@ class BinarySensorTemplate(BinarySensorDevice):
     @asyncio.coroutine
     def async_update(self):
         """Update the state from the template."""
+        render_info = RenderInfo()
         try:
-            self._state = self._template.async_render().lower() == 'true'
+            self._state = self._template.async_render_tracked(
+                render_info).lower() == 'true'
         except TemplateError as ex:
             if ex.args and ex.args[0].startswith(
                     "UndefinedError: 'None' has no attribute"):
@@ -122,3 +133,17 @@ class BinarySensorTemplate(BinarySensorDevice):
                 return
             _LOGGER.error(ex)
             self._state = False
+        finally:
+            self._async_track_render_info(render_info)
+
+    @callback
+    def _async_track_render_info(self, render_info):
+        """Listen to changes of the states the last render accessed."""
+        if not self._track_render_info or render_info == self._render_info:
+            return
+
+        if self._async_unsub_render_info is not None:
+            self._async_unsub_render_info()
+        self._render_info = render_info
+        self._async_unsub_render_info = async_track_render_info(
+            self.hass, render_info, self._state_listener)
@@ -7,9 +7,11 @@ https://home-assistant.io/components/camera/
 """
 import asyncio
 import logging
+import re
 
 from aiohttp import web
 
+from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers.config_validation import PLATFORM_SCHEMA  # noqa
@@ -26,12 +28,27 @@ STATE_IDLE = 'idle'
 
 ENTITY_IMAGE_URL = '/api/camera_proxy/{0}?token={1}'
 
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds between frames fetched for MJPEG viewers
+FRAME_INTERVAL = 0.5
+
+CONF_RELAY = 'relay'
+
+DATA_RELAYS = 'camera_relays'
+RELAY_READ_SIZE = 102400
+MAX_FRAME_SIZE = 10 * 1024 * 1024
+JPEG_START = b'\xff\xd8'
+JPEG_END = b'\xff\xd9'
+MAX_PART_HEADERS = 1024
+RE_BOUNDARY = re.compile(br'^--(\S+)', re.MULTILINE)
+RE_CONTENT_LENGTH = re.compile(br'content-length:\s*(\d+)', re.IGNORECASE)
+
 
 @asyncio.coroutine
 def async_setup(hass, config):
     """Setup the camera component."""
-    component = EntityComponent(
-        logging.getLogger(__name__), DOMAIN, hass, SCAN_INTERVAL)
+    component = EntityComponent(_LOGGER, DOMAIN, hass, SCAN_INTERVAL)
 
     hass.http.register_view(CameraImageView(hass, component.entities))
     hass.http.register_view(CameraMjpegStream(hass, component.entities))
@@ -46,6 +63,7 @@ class Camera(Entity):
     def __init__(self):
         """Initialize a camera."""
         self.is_streaming = False
+        self._frame_broker = None
 
     @property
     def access_token(self):
@@ -62,6 +80,18 @@ class Camera(Entity):
         """Return a link to the camera feed as entity picture."""
         return ENTITY_IMAGE_URL.format(self.entity_id, self.access_token)
 
+    @property
+    def frame_max_age(self):
+        """Return seconds a fetched frame may be reused for snapshots."""
+        return 0
+
+    @property
+    def frame_broker(self):
+        """Return the broker that shares the frames of this camera."""
+        if getattr(self, '_frame_broker', None) is None:
+            self._frame_broker = FrameBroker(self.hass, self)
+        return self._frame_broker
+
     @property
     def is_recording(self):
         """Return true if the device is recording."""
@@ -97,42 +127,7 @@ class Camera(Entity):
 
         This method must be run in the event loop.
         """
-        response = web.StreamResponse()
-
-        response.content_type = ('multipart/x-mixed-replace; '
-                                 'boundary=--jpegboundary')
-        yield from response.prepare(request)
-
-        def write(img_bytes):
-            """Write image to stream."""
-            response.write(bytes(
-                '--jpegboundary\r\n'
-                'Content-Type: image/jpeg\r\n'
-                'Content-Length: {}\r\n\r\n'.format(
-                    len(img_bytes)), 'utf-8') + img_bytes + b'\r\n')
-
-        last_image = None
-
-        try:
-            while True:
-                img_bytes = yield from self.async_camera_image()
-                if not img_bytes:
-                    break
-
-                if img_bytes is not None and img_bytes != last_image:
-                    write(img_bytes)
-
-                    # Chrome seems to always ignore first picture,
-                    # print it twice.
-                    if last_image is None:
-                        write(img_bytes)
-
-                    last_image = img_bytes
-                    yield from response.drain()
-
-                yield from asyncio.sleep(.5)
-        finally:
-            yield from response.write_eof()
+        yield from async_write_mjpeg_stream(request, self.frame_broker)
 
     @property
     def state(self):
@@ -160,6 +155,343 @@ class Camera(Entity):
         return attr
 
 
+@asyncio.coroutine
+def async_write_mjpeg_stream(request, frames):
+    """Write the frames of a FrameFanOut to the client as an MJPEG stream.
+
+    A client that is slow to receive skips to the latest frame.
+    This method must be run in the event loop.
+    """
+    response = web.StreamResponse()
+
+    response.content_type = ('multipart/x-mixed-replace; '
+                             'boundary=--jpegboundary')
+    yield from response.prepare(request)
+
+    def write(img_bytes):
+        """Write image to stream."""
+        response.write(bytes(
+            '--jpegboundary\r\n'
+            'Content-Type: image/jpeg\r\n'
+            'Content-Length: {}\r\n\r\n'.format(
+                len(img_bytes)), 'utf-8') + img_bytes + b'\r\n')
+
+    frames.async_subscribe()
+    sequence = None
+
+    try:
+        while True:
+            frame = yield from frames.async_next_frame(sequence)
+            if frame is None:
+                break
+
+            write(frame)
+
+            # Chrome seems to always ignore first picture,
+            # print it twice.
+            if sequence is None:
+                write(frame)
+
+            sequence = frames.sequence
+            yield from response.drain()
+    finally:
+        frames.async_unsubscribe()
+        yield from response.write_eof()
+
+
+@callback
+def async_get_relay(hass, key, async_open):
+    """Return the MjpegRelay for key, create it with async_open if needed.
+
+    Relays are shared by everyone asking for the same key so a stream is
+    only opened once per upstream.
+    """
+    relays = hass.data.get(DATA_RELAYS)
+    if relays is None:
+        relays = hass.data[DATA_RELAYS] = {}
+
+    if key not in relays:
+        relays[key] = MjpegRelay(hass, async_open)
+    return relays[key]
+
+
+class FrameFanOut(object):
+    """Hand out the latest frame of a source to any number of viewers.
+
+    The source runs while anyone is subscribed. Frames are numbered by
+    sequence, a viewer that is behind skips to the latest frame.
+    """
+
+    def __init__(self, hass):
+        """Initialize the fan out."""
+        self.hass = hass
+        self.frame = None
+        self.sequence = 0
+        self._subscribers = 0
+        self._poll = None
+        self._new_frame = asyncio.Future(loop=hass.loop)
+
+    @callback
+    def async_subscribe(self):
+        """Add a viewer and start the source."""
+        self._subscribers += 1
+        if self._poll is None:
+            self._poll = self.hass.loop.create_task(self._async_poll())
+
+    @callback
+    def async_unsubscribe(self):
+        """Remove a viewer, stop the source when nobody is left."""
+        self._subscribers -= 1
+        if self._subscribers:
+            return
+
+        if self._poll is not None:
+            self._poll.cancel()
+            self._poll = None
+        # The next viewer may come much later, it should not get this frame
+        self._async_reset_frame()
+
+    @asyncio.coroutine
+    def async_next_frame(self, sequence):
+        """Return the frame after sequence, None if the source stopped.
+
+        Returns the current frame right away when sequence is None.
+        This method must be run in the event loop.
+        """
+        if sequence is None and self.frame is not None:
+            return self.frame
+
+        if sequence is None or sequence == self.sequence:
+            # Shielded so a viewer leaving does not wake up all others
+            yield from asyncio.shield(self._new_frame, loop=self.hass.loop)
+
+        if sequence == self.sequence:
+            return None
+        return self.frame
+
+    @asyncio.coroutine
+    def _async_poll(self):
+        """Run the source, wake up the viewers when it stops."""
+        try:
+            yield from self._async_produce()
+        except asyncio.CancelledError:
+            return
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception('Error getting frames')
+
+        # Source stopped delivering, end the streams
+        self._poll = None
+        self._async_reset_frame()
+        self._async_notify()
+
+    @asyncio.coroutine
+    def _async_produce(self):
+        """Publish frames till the source runs dry."""
+        raise NotImplementedError()
+
+    @callback
+    def _async_publish(self, frame):
+        """Hand out a frame if it changed."""
+        if frame != self.frame:
+            self.frame = frame
+            self.sequence += 1
+            self._async_notify()
+
+    @callback
+    def _async_reset_frame(self):
+        """Forget the last frame, it is stale once the source stops."""
+        self.frame = None
+
+    @callback
+    def _async_notify(self):
+        """Wake up everyone waiting for the next frame."""
+        self._new_frame.set_result(None)
+        self._new_frame = asyncio.Future(loop=self.hass.loop)
+
+
+class FrameBroker(FrameFanOut):
+    """Fetch the frames of a camera once and share them with all viewers.
+
+    While anyone is subscribed a frame is fetched every FRAME_INTERVAL
+    seconds. Fetches that overlap are shared.
+    """
+
+    def __init__(self, hass, camera):
+        """Initialize the broker."""
+        super().__init__(hass)
+        self.camera = camera
+        self.fetched_at = None
+        self._fetch = None
+
+    @asyncio.coroutine
+    def async_get_frame(self, max_age=0):
+        """Return a frame that is at most max_age seconds old.
+
+        This method must be run in the event loop.
+        """
+        if self.frame is not None and \
+                self.hass.loop.time() - self.fetched_at < max_age:
+            return self.frame
+
+        frame = yield from self._async_fetch()
+        return frame
+
+    @callback
+    def _async_reset_frame(self):
+        """Forget the last frame and when it was fetched."""
+        super()._async_reset_frame()
+        self.fetched_at = None
+
+    @asyncio.coroutine
+    def _async_produce(self):
+        """Fetch frames while there are viewers."""
+        while (yield from self._async_fetch()):
+            yield from asyncio.sleep(FRAME_INTERVAL, loop=self.hass.loop)
+
+    @asyncio.coroutine
+    def _async_fetch(self):
+        """Fetch a frame, sharing the fetch with concurrent callers."""
+        if self._fetch is None:
+            self._fetch = self.hass.loop.create_task(
+                self._async_fetch_frame())
+
+        frame = yield from asyncio.shield(self._fetch, loop=self.hass.loop)
+        return frame
+
+    @asyncio.coroutine
+    def _async_fetch_frame(self):
+        """Fetch a frame from the camera and hand it out when new."""
+        try:
+            frame = yield from self.camera.async_camera_image()
+        finally:
+            self._fetch = None
+
+        if frame:
+            self.fetched_at = self.hass.loop.time()
+            self._async_publish(frame)
+
+        return frame
+
+
+class MjpegRelay(FrameFanOut):
+    """Share one upstream MJPEG stream between all viewers.
+
+    async_open is a coroutine returning a (read, close) pair of coroutine
+    functions for a new upstream stream. The stream is opened for the
+    first viewer and closed after the last one left. Frames are cut out of
+    the stream once, viewers that are slow drop frames.
+    """
+
+    def __init__(self, hass, async_open):
+        """Initialize the relay."""
+        super().__init__(hass)
+        self._async_open = async_open
+
+    @asyncio.coroutine
+    def _async_produce(self):
+        """Read the upstream stream and publish the frames in it."""
+        read, close = yield from self._async_open()
+        parser = MjpegParser()
+
+        try:
+            while True:
+                data = yield from read(RELAY_READ_SIZE)
+                if not data:
+                    return
+
+                frames = parser.feed(data)
+                if frames:
+                    # Only the latest frame of a chunk is worth sending
+                    self._async_publish(frames[-1])
+        finally:
+            self.hass.async_add_job(close())
+
+
+class MjpegParser(object):
+    """Cut the JPEG frames out of an MJPEG stream.
+
+    A frame starts at the start of image marker. It ends after the
+    Content-Length of its part when the part headers have one, else at the
+    next multipart boundary. JPEGs can embed thumbnails with their own end
+    of image marker, so that marker is only used to end a frame when the
+    stream has neither.
+    """
+
+    def __init__(self):
+        """Initialize the parser."""
+        self._buffer = bytearray()
+        self._boundary = None
+        self._scan = 0
+
+    def feed(self, data):
+        """Add data read from the stream, return the completed frames."""
+        buf = self._buffer
+        buf.extend(data)
+        frames = []
+
+        while True:
+            start = buf.find(JPEG_START)
+            if start < 0:
+                # Keep what may be the headers of the next part
+                del buf[:-MAX_PART_HEADERS]
+                self._scan = 0
+                return frames
+
+            headers = bytes(buf[:start])
+            if self._boundary is None:
+                match = RE_BOUNDARY.search(headers)
+                if match:
+                    self._boundary = b'\n--' + match.group(1)
+
+            frame = self._cut_frame(start, headers)
+            if frame is None:
+                break
+
+            frames.append(frame)
+            self._scan = 0
+
+        if len(buf) > MAX_FRAME_SIZE:
+            _LOGGER.warning('Dropping MJPEG frame larger than %d bytes',
+                            MAX_FRAME_SIZE)
+            del buf[:]
+            self._scan = 0
+
+        return frames
+
+    def _cut_frame(self, start, headers):
+        """Remove the frame at start from the buffer and return it.
+
+        Return None if the frame is not complete yet.
+        """
+        buf = self._buffer
+        match = RE_CONTENT_LENGTH.search(headers)
+        if match:
+            end = start + int(match.group(1))
+            if len(buf) < end:
+                return None
+            frame = bytes(buf[start:end]).rstrip(b'\r\n')
+            if frame.endswith(JPEG_END):
+                del buf[:end]
+                return frame
+            # Wrong length, fall back on the markers
+
+        if self._boundary is not None:
+            marker, extra = self._boundary, 0
+        else:
+            marker, extra = JPEG_END, len(JPEG_END)
+
+        # Resume the search where the last feed left off
+        end = buf.find(marker, max(start + 2, self._scan))
+        if end < 0:
+            self._scan = max(len(buf) - len(marker), start + 2)
+            return None
+
+        end += extra
+        frame = bytes(buf[start:end]).rstrip(b'\r\n')
+        del buf[:end]
+        return frame
+
+
 class CameraView(HomeAssistantView):
     """Base CameraView."""
 
@@ -202,7 +534,8 @@ class CameraImageView(CameraView):
     @asyncio.coroutine
     def handle(self, request, camera):
         """Serve camera image."""
-        image = yield from camera.async_camera_image()
+        image = yield from camera.frame_broker.async_get_frame(
+            camera.frame_max_age)
 
         if image is None:
             return web.Response(status=500)
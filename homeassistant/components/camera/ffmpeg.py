@@ -10,9 +10,11 @@ import logging
 import voluptuous as vol
 from aiohttp import web
 
-from homeassistant.components.camera import Camera, PLATFORM_SCHEMA
+from homeassistant.components.camera import (
+    Camera, PLATFORM_SCHEMA, CONF_RELAY, async_write_mjpeg_stream)
 from homeassistant.components.ffmpeg import (
-    async_run_test, get_binary, CONF_INPUT, CONF_EXTRA_ARGUMENTS)
+    async_get_mjpeg_relay, async_run_test, get_binary, CONF_INPUT,
+    CONF_EXTRA_ARGUMENTS)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.const import CONF_NAME
 from homeassistant.util.async import run_coroutine_threadsafe
@@ -27,6 +29,7 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
     vol.Required(CONF_INPUT): cv.string,
     vol.Optional(CONF_EXTRA_ARGUMENTS): cv.string,
     vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
+    vol.Optional(CONF_RELAY, default=False): cv.boolean,
 })
 
 
@@ -47,6 +50,7 @@ class FFmpegCamera(Camera):
         self._name = config.get(CONF_NAME)
         self._input = config.get(CONF_INPUT)
         self._extra_arguments = config.get(CONF_EXTRA_ARGUMENTS)
+        self._relay = config.get(CONF_RELAY)
 
     def camera_image(self):
         """Return bytes of camera image."""
@@ -67,6 +71,12 @@ class FFmpegCamera(Camera):
     @asyncio.coroutine
     def handle_async_mjpeg_stream(self, request):
         """Generate an HTTP MJPEG stream from the camera."""
+        if self._relay:
+            relay = async_get_mjpeg_relay(
+                self.hass, self._input, self._extra_arguments)
+            yield from async_write_mjpeg_stream(request, relay)
+            return
+
         from haffmpeg import CameraMjpegAsync
 
         stream = CameraMjpegAsync(get_binary(), loop=self.hass.loop)
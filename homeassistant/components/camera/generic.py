@@ -23,6 +23,7 @@ from homeassistant.util.async import run_coroutine_threadsafe
 
 _LOGGER = logging.getLogger(__name__)
 
+CONF_FRAME_MAX_AGE = 'frame_max_age'
 CONF_LIMIT_REFETCH_TO_URL_CHANGE = 'limit_refetch_to_url_change'
 CONF_STILL_IMAGE_URL = 'still_image_url'
 
@@ -32,6 +33,8 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
     vol.Required(CONF_STILL_IMAGE_URL): cv.template,
     vol.Optional(CONF_AUTHENTICATION, default=HTTP_BASIC_AUTHENTICATION):
         vol.In([HTTP_BASIC_AUTHENTICATION, HTTP_DIGEST_AUTHENTICATION]),
+    vol.Optional(CONF_FRAME_MAX_AGE, default=0):
+        vol.All(vol.Coerce(float), vol.Range(min=0)),
     vol.Optional(CONF_LIMIT_REFETCH_TO_URL_CHANGE, default=False): cv.boolean,
     vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
     vol.Optional(CONF_PASSWORD): cv.string,
@@ -58,6 +61,7 @@ class GenericCamera(Camera):
         self._still_image_url = device_info[CONF_STILL_IMAGE_URL]
         self._still_image_url.hass = hass
         self._limit_refetch = device_info[CONF_LIMIT_REFETCH_TO_URL_CHANGE]
+        self._frame_max_age = device_info[CONF_FRAME_MAX_AGE]
 
         username = device_info.get(CONF_USERNAME)
         password = device_info.get(CONF_PASSWORD)
@@ -124,6 +128,11 @@ class GenericCamera(Camera):
         self._last_url = url
         return self._last_image
 
+    @property
+    def frame_max_age(self):
+        """Return seconds a fetched frame may be reused for snapshots."""
+        return self._frame_max_age
+
     @property
     def name(self):
         """Return the name of this device."""
@@ -19,7 +19,9 @@ import voluptuous as vol
 from homeassistant.const import (
     CONF_NAME, CONF_USERNAME, CONF_PASSWORD, CONF_AUTHENTICATION,
     HTTP_BASIC_AUTHENTICATION, HTTP_DIGEST_AUTHENTICATION)
-from homeassistant.components.camera import (PLATFORM_SCHEMA, Camera)
+from homeassistant.components.camera import (
+    PLATFORM_SCHEMA, CONF_RELAY, Camera, async_get_relay,
+    async_write_mjpeg_stream)
 from homeassistant.helpers import config_validation as cv
 
 _LOGGER = logging.getLogger(__name__)
@@ -35,6 +37,7 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
         vol.In([HTTP_BASIC_AUTHENTICATION, HTTP_DIGEST_AUTHENTICATION]),
     vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
     vol.Optional(CONF_PASSWORD): cv.string,
+    vol.Optional(CONF_RELAY, default=False): cv.boolean,
     vol.Optional(CONF_USERNAME): cv.string,
 })
 
@@ -69,6 +72,7 @@ class MjpegCamera(Camera):
         self._username = device_info.get(CONF_USERNAME)
         self._password = device_info.get(CONF_PASSWORD)
         self._mjpeg_url = device_info[CONF_MJPEG_URL]
+        self._relay = device_info.get(CONF_RELAY)
 
         self._auth = None
         if self._username and self._password:
@@ -100,6 +104,14 @@ class MjpegCamera(Camera):
             yield from super().handle_async_mjpeg_stream(request)
             return
 
+        if self._relay:
+            # Cameras that share a URL may not share their credentials
+            relay = async_get_relay(
+                self.hass, (self._mjpeg_url, self._username, self._password),
+                self._async_open_stream)
+            yield from async_write_mjpeg_stream(request, relay)
+            return
+
         # connect to stream
         try:
             with async_timeout.timeout(10, loop=self.hass.loop):
@@ -125,6 +137,16 @@ class MjpegCamera(Camera):
             self.hass.async_add_job(stream.release())
             yield from response.write_eof()
 
+    @asyncio.coroutine
+    def _async_open_stream(self):
+        """Connect to the stream for the relay."""
+        with async_timeout.timeout(10, loop=self.hass.loop):
+            stream = yield from self.hass.websession.get(
+                self._mjpeg_url,
+                auth=self._auth
+            )
+        return stream.content.read, stream.release
+
     @property
     def name(self):
         """Return the name of this camera."""
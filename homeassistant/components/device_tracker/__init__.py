@@ -8,6 +8,7 @@ import asyncio
 from datetime import timedelta
 import logging
 import os
+import sqlite3
 from typing import Any, Sequence, Callable
 
 import voluptuous as vol
@@ -20,6 +21,7 @@ from homeassistant.components.discovery import SERVICE_NETGEAR
 from homeassistant.config import load_yaml_config_file
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_per_platform, discovery
+from homeassistant.helpers.batching import BatchWriter
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.typing import GPSType, ConfigType, HomeAssistantType
 import homeassistant.helpers.config_validation as cv
@@ -42,6 +44,10 @@ ENTITY_ID_ALL_DEVICES = group.ENTITY_ID_FORMAT.format('all_devices')
 ENTITY_ID_FORMAT = DOMAIN + '.{}'
 
 YAML_DEVICES = 'known_devices.yaml'
+DB_DEVICES = 'device_tracker.db'
+SPILL_SUFFIX = '.spill'
+
+DATA_DEVICE_STORE = 'device_tracker_store'
 
 CONF_TRACK_NEW = 'track_new_devices'
 DEFAULT_TRACK_NEW = True
@@ -55,6 +61,9 @@ DEFAULT_SCAN_INTERVAL = 12
 CONF_AWAY_HIDE = 'hide_if_away'
 DEFAULT_AWAY_HIDE = False
 
+CONF_DEVICE_STORE = 'device_store'
+DEFAULT_DEVICE_STORE = False
+
 EVENT_NEW_DEVICE = 'device_tracker_new_device'
 
 SERVICE_SEE = 'see'
@@ -72,7 +81,8 @@ PLATFORM_SCHEMA = cv.PLATFORM_SCHEMA.extend({
     vol.Optional(CONF_TRACK_NEW, default=DEFAULT_TRACK_NEW): cv.boolean,
     vol.Optional(CONF_CONSIDER_HOME,
                  default=timedelta(seconds=DEFAULT_CONSIDER_HOME)): vol.All(
-                     cv.time_period, cv.positive_timedelta)
+                     cv.time_period, cv.positive_timedelta),
+    vol.Optional(CONF_DEVICE_STORE): cv.boolean,
 })
 
 DISCOVERY_PLATFORMS = {
@@ -121,9 +131,18 @@ def async_setup(hass: HomeAssistantType, config: ConfigType):
         consider_home = conf.get(CONF_CONSIDER_HOME,
                                  timedelta(seconds=DEFAULT_CONSIDER_HOME))
         track_new = conf.get(CONF_TRACK_NEW, DEFAULT_TRACK_NEW)
+        use_store = conf.get(CONF_DEVICE_STORE, DEFAULT_DEVICE_STORE)
+
+    if use_store:
+        store = hass.data[DATA_DEVICE_STORE] = \
+            yield from hass.loop.run_in_executor(
+                None, DeviceStore, hass, hass.config.path(DB_DEVICES))
+        devices = yield from store.async_load(yaml_path, consider_home)
+    else:
+        store = None
+        devices = yield from async_load_config(yaml_path, hass, consider_home)
 
-    devices = yield from async_load_config(yaml_path, hass, consider_home)
-    tracker = DeviceTracker(hass, consider_home, track_new, devices)
+    tracker = DeviceTracker(hass, consider_home, track_new, devices, store)
 
     # update tracked devices
     update_tasks = [device.async_update_ha_state() for device in devices
@@ -149,7 +168,8 @@ def async_setup(hass: HomeAssistantType, config: ConfigType):
                     return
 
                 yield from async_setup_scanner_platform(
-                    hass, p_config, scanner, tracker.async_see)
+                    hass, p_config, scanner, tracker.async_see,
+                    tracker.async_mark_seen)
                 return
 
             ret = yield from hass.loop.run_in_executor(
@@ -201,9 +221,10 @@ class DeviceTracker(object):
     """Representation of a device tracker."""
 
     def __init__(self, hass: HomeAssistantType, consider_home: timedelta,
-                 track_new: bool, devices: Sequence) -> None:
+                 track_new: bool, devices: Sequence, store=None) -> None:
         """Initialize a device tracker."""
         self.hass = hass
+        self.store = store
         self.devices = {dev.dev_id: dev for dev in devices}
         self.mac_to_dev = {dev.mac: dev for dev in devices if dev.mac}
         self.consider_home = consider_home
@@ -278,6 +299,10 @@ class DeviceTracker(object):
             yield from self.group.async_update_tracked_entity_ids(
                 list(self.group.tracking) + [device.entity_id])
 
+        if self.store is not None:
+            self.store.async_add(device)
+            return
+
         # update known_devices.yaml
         self.hass.async_add_job(
             self.async_update_config(self.hass.config.path(YAML_DEVICES),
@@ -306,6 +331,30 @@ class DeviceTracker(object):
         self.group = yield from group.Group.async_create_group(
             self.hass, GROUP_NAME_ALL_DEVICES, entity_ids, False)
 
+    @callback
+    def async_mark_seen(self, macs: Sequence[str]):
+        """Mark devices that are home and stay home as seen again.
+
+        Only moves last_seen of those devices as their state would not
+        change. Returns the MACs of the devices that need a full see.
+
+        This method must be run in the event loop.
+        """
+        now = dt_util.utcnow()
+        need_see = []
+
+        for mac in macs:
+            device = self.mac_to_dev.get(str(mac).upper())
+
+            if device is None or device.state != STATE_HOME or \
+               not device.last_update_home or device.gps is not None or \
+               device.location_name or device.battery or device.attributes:
+                need_see.append(mac)
+            else:
+                device.last_seen = now
+
+        return need_see
+
     @callback
     def async_update_stale(self, now: dt_util.dt.datetime):
         """Update stale devices.
@@ -461,6 +510,123 @@ class Device(Entity):
             self.last_update_home = True
 
 
+class DeviceStore(object):
+    """Keep known devices in an indexed SQLite database.
+
+    New devices are written in batches by a worker thread instead of being
+    appended to the YAML file one at a time. Devices in the YAML file are
+    imported when the database is created, a YAML file that is added later
+    overrides the stored devices with the same id.
+    """
+
+    def __init__(self, hass: HomeAssistantType, path: str) -> None:
+        """Initialize the store and create its database if needed."""
+        self.hass = hass
+        self.path = path
+        self.created = not os.path.isfile(path)
+
+        with sqlite3.connect(path) as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS devices ('
+                         'dev_id TEXT PRIMARY KEY, mac TEXT, name TEXT, '
+                         'picture TEXT, track INTEGER, hide_if_away INTEGER, '
+                         'consider_home REAL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS devices_mac '
+                         'ON devices (mac)')
+        conn.close()
+
+        # A locked or busy database is retried, the spill file keeps the
+        # waiting rows across a restart.
+        self.writer = BatchWriter(hass, 'DeviceStore', self.write,
+                                  retry_exceptions=(sqlite3.OperationalError,),
+                                  spill_path=path + SPILL_SUFFIX)
+        self.writer.start()
+
+    @asyncio.coroutine
+    def async_load(self, yaml_path: str, consider_home: timedelta):
+        """Load the stored devices.
+
+        This method is a coroutine.
+        """
+        has_yaml = yield from self.hass.loop.run_in_executor(
+            None, os.path.isfile, yaml_path)
+
+        if has_yaml and self.created:
+            devices = yield from async_load_config(
+                yaml_path, self.hass, consider_home)
+            yield from self.hass.loop.run_in_executor(
+                None, self.import_devices, devices, yaml_path, consider_home)
+            has_yaml = False
+
+        rows = yield from self.hass.loop.run_in_executor(None, self.load)
+        devices = {}
+        for (dev_id, mac, name, picture, track, hide_if_away,
+             dev_consider_home) in rows:
+            if dev_consider_home is None:
+                dev_consider_home = consider_home
+            else:
+                dev_consider_home = timedelta(seconds=dev_consider_home)
+            devices[dev_id] = Device(
+                self.hass, dev_consider_home, bool(track),
+                dev_id, mac, name, picture=picture,
+                hide_if_away=bool(hide_if_away))
+
+        if has_yaml:
+            for device in (yield from async_load_config(
+                    yaml_path, self.hass, consider_home)):
+                devices[device.dev_id] = device
+
+        return list(devices.values())
+
+    def load(self):
+        """Return the rows of all stored devices."""
+        with sqlite3.connect(self.path) as conn:
+            rows = conn.execute(
+                'SELECT dev_id, mac, name, picture, track, hide_if_away, '
+                'consider_home FROM devices').fetchall()
+        conn.close()
+        return rows
+
+    def write(self, rows):
+        """Insert or replace device rows."""
+        with sqlite3.connect(self.path) as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO devices VALUES (?, ?, ?, ?, ?, ?, ?)',
+                rows)
+        conn.close()
+
+    def import_devices(self, devices: Sequence, yaml_path: str,
+                       consider_home: timedelta):
+        """Store devices loaded from YAML and move the YAML file aside."""
+        self.write([_device_row(device, consider_home)
+                    for device in devices])
+        os.rename(yaml_path, yaml_path + '.imported')
+        _LOGGER.warning('Imported %d devices from %s into %s, the file was '
+                        'renamed to %s.imported', len(devices), yaml_path,
+                        self.path, yaml_path)
+
+    @callback
+    def async_add(self, device: 'Device'):
+        """Queue a new device to be written.
+
+        This method must be run in the event loop.
+        """
+        self.writer.put(_device_row(device, device.consider_home))
+
+
+def _device_row(device: 'Device', consider_home: timedelta):
+    """Return the database row of a device.
+
+    Consider home is only stored if it differs from the default.
+    """
+    if device.consider_home == consider_home:
+        dev_consider_home = None
+    else:
+        dev_consider_home = device.consider_home.total_seconds()
+
+    return (device.dev_id, device.mac, device.name, device.config_picture,
+            int(device.track), int(device.away_hide), dev_consider_home)
+
+
 def load_config(path: str, hass: HomeAssistantType, consider_home: timedelta):
     """Load devices from YAML configuration file."""
     return run_coroutine_threadsafe(
@@ -510,32 +676,74 @@ def async_load_config(path: str, hass: HomeAssistantType,
 
 @asyncio.coroutine
 def async_setup_scanner_platform(hass: HomeAssistantType, config: ConfigType,
-                                 scanner: Any, async_see_device: Callable):
+                                 scanner: Any, async_see_device: Callable,
+                                 async_mark_seen: Callable=None):
     """Helper method to connect scanner-based platform to device tracker.
 
+    Each scan is compared to the previous one. Devices that arrived are
+    seen, devices that are still there are passed to async_mark_seen which
+    returns the ones that need to be seen anyway. Devices that left turn
+    stale after consider home. A scan that takes longer than the interval
+    is not waited for and no new scan starts before it is done.
+
     This method is a coroutine.
     """
     interval = config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
 
     # Initial scan of each mac we also tell about host name for config
     seen = set()  # type: Any
+    present = set()  # type: Any
+    scan_job = None
 
-    def device_tracker_scan(now: dt_util.dt.datetime):
-        """Called when interval matches."""
+    def scan_devices():
+        """Scan for devices and get the names of the ones not seen yet."""
         found_devices = scanner.scan_devices()
+        host_names = {mac: scanner.get_device_name(mac)
+                      for mac in found_devices if mac not in seen}
+        return found_devices, host_names
 
-        for mac in found_devices:
-            if mac in seen:
-                host_name = None
-            else:
-                host_name = scanner.get_device_name(mac)
-                seen.add(mac)
-            hass.async_add_job(async_see_device(mac=mac, host_name=host_name))
+    @asyncio.coroutine
+    def async_device_tracker_scan(now: dt_util.dt.datetime):
+        """Called when interval matches."""
+        nonlocal present, scan_job
+
+        if scan_job is not None and not scan_job.done():
+            _LOGGER.warning('Skipping scan, %s is still scanning',
+                            type(scanner).__name__)
+            return
+
+        scan_job = hass.loop.run_in_executor(None, scan_devices)
+
+        try:
+            found_devices, host_names = yield from asyncio.wait_for(
+                asyncio.shield(scan_job, loop=hass.loop), interval,
+                loop=hass.loop)
+        except asyncio.TimeoutError:
+            _LOGGER.warning('Scanning with %s took longer than %ss',
+                            type(scanner).__name__, interval)
+            return
+
+        seen.update(host_names)
+        found = set(found_devices)
+        see_macs = [mac for mac in found_devices
+                    if mac not in present or mac in host_names]
+        still_present = [mac for mac in found_devices
+                         if mac in present and mac not in host_names]
+        if async_mark_seen is None:
+            see_macs.extend(still_present)
+        else:
+            see_macs.extend(async_mark_seen(still_present))
+        present = found
+
+        if see_macs:
+            yield from asyncio.wait([
+                async_see_device(mac=mac, host_name=host_names.get(mac))
+                for mac in see_macs], loop=hass.loop)
 
     async_track_utc_time_change(
-        hass, device_tracker_scan, second=range(0, 60, interval))
+        hass, async_device_tracker_scan, second=range(0, 60, interval))
 
-    hass.async_add_job(device_tracker_scan, None)
+    hass.async_add_job(async_device_tracker_scan(None))
 
 
 def update_config(path: str, dev_id: str, device: Device):
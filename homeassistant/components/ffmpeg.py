@@ -84,3 +84,23 @@ def async_run_test(hass, input_source):
             return False
         FFMPEG_TEST_CACHE[input_source] = True
     return True
+
+
+def async_get_mjpeg_relay(hass, input_source, extra_arguments=None):
+    """Return the relay sharing one ffmpeg MJPEG stream of input_source.
+
+    This method must be run in the event loop.
+    """
+    from homeassistant.components.camera import async_get_relay
+
+    @asyncio.coroutine
+    def async_open():
+        """Start ffmpeg for the relay."""
+        from haffmpeg import CameraMjpegAsync
+
+        stream = CameraMjpegAsync(get_binary(), loop=hass.loop)
+        yield from stream.open_camera(input_source, extra_cmd=extra_arguments)
+        return stream.read, stream.close
+
+    return async_get_relay(
+        hass, (DOMAIN, input_source, extra_arguments), async_open)
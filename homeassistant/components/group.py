@@ -5,6 +5,7 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/group/
 """
 import asyncio
+from collections import Counter
 import logging
 import os
 
@@ -44,6 +45,8 @@ SET_VISIBILITY_SERVICE_SCHEMA = vol.Schema({
 SERVICE_RELOAD = 'reload'
 RELOAD_SERVICE_SCHEMA = vol.Schema({})
 
+DATA_EXPANDED = 'group_expanded'
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -108,6 +111,7 @@ def expand_entity_ids(hass, entity_ids):
     Async friendly.
     """
     found_ids = []
+    found = set()
 
     for entity_id in entity_ids:
         if not isinstance(entity_id, str):
@@ -120,22 +124,80 @@ def expand_entity_ids(hass, entity_ids):
             domain, _ = ha.split_entity_id(entity_id)
 
             if domain == DOMAIN:
-                found_ids.extend(
-                    ent_id for ent_id
-                    in expand_entity_ids(hass, get_entity_ids(hass, entity_id))
-                    if ent_id not in found_ids)
-
+                members = _expand_group(hass, entity_id)
             else:
-                if entity_id not in found_ids:
-                    found_ids.append(entity_id)
+                members = (entity_id,)
 
         except AttributeError:
             # Raised by split_entity_id if entity_id is not a string
-            pass
+            continue
+
+        for ent_id in members:
+            if ent_id not in found:
+                found.add(ent_id)
+                found_ids.append(ent_id)
 
     return found_ids
 
 
+def _group_members(hass, entity_id):
+    """Return the entity_id attribute of a group state, None if missing."""
+    group = hass.states.get(entity_id)
+
+    if group is None:
+        return None
+
+    return group.attributes.get(ATTR_ENTITY_ID)
+
+
+def _expand_group(hass, entity_id):
+    """Return the members of a group with nested groups flattened.
+
+    The result is cached until the members of the group or of any group
+    nested in it change. Groups keep their members in the same object
+    while their state changes, so comparing identities is enough.
+
+    Async friendly.
+    """
+    cache = hass.data.setdefault(DATA_EXPANDED, {})
+    cached = cache.get(entity_id)
+
+    if cached is not None:
+        groups, found_ids = cached
+        if all(_group_members(hass, group_id) is members
+               for group_id, members in groups):
+            return found_ids
+
+    groups = []
+    found_ids = []
+    found = set()
+    visited = set()
+
+    def expand(group_id):
+        """Add the members of a group, depth first."""
+        visited.add(group_id)
+        members = _group_members(hass, group_id)
+        groups.append((group_id, members))
+
+        for ent_id in members or ():
+            if not isinstance(ent_id, str):
+                continue
+
+            ent_id = ent_id.lower()
+
+            if ha.split_entity_id(ent_id)[0] == DOMAIN:
+                if ent_id not in visited:
+                    expand(ent_id)
+            elif ent_id not in found:
+                found.add(ent_id)
+                found_ids.append(ent_id)
+
+    expand(entity_id)
+    found_ids = tuple(found_ids)
+    cache[entity_id] = (tuple(groups), found_ids)
+    return found_ids
+
+
 def get_entity_ids(hass, entity_id, domain_filter=None):
     """Get members of this group.
 
@@ -239,6 +301,10 @@ class Group(Entity):
         self._assumed_state = False
         self._async_unsub_state_changed = None
         self._visible = True
+        # Counted (state, assumed) of each member and the totals of those
+        self._member_states = {}
+        self._state_counts = Counter()
+        self._assumed_count = 0
 
     @staticmethod
     def create_group(hass, name, entity_ids=None, user_defined=True,
@@ -394,79 +460,80 @@ class Group(Entity):
 
         This method must be run in the event loop.
         """
-        self._async_update_group_state(new_state)
+        self._async_update_group_state(entity_id, new_state)
         self.hass.async_add_job(self.async_update_ha_state())
 
-    @property
-    def _tracking_states(self):
-        """The states that the group is tracking."""
-        states = []
+    @callback
+    def _async_count_member(self, entity_id, state):
+        """Move a member from the counts of its last state to its new one.
 
-        for entity_id in self.tracking:
-            state = self.hass.states.get(entity_id)
+        This method must be run in the event loop.
+        """
+        counted = self._member_states.pop(entity_id, None)
+
+        if counted is not None:
+            self._state_counts[counted[0]] -= 1
+            if counted[1]:
+                self._assumed_count -= 1
+
+        if state is None:
+            return
+
+        assumed = bool(state.attributes.get(ATTR_ASSUMED_STATE))
+        self._member_states[entity_id] = (state.state, assumed)
+        self._state_counts[state.state] += 1
+        if assumed:
+            self._assumed_count += 1
 
-            if state is not None:
-                states.append(state)
+    @callback
+    def _async_count_members(self):
+        """Count the states of all members from scratch.
+
+        This method must be run in the event loop.
+        """
+        self._member_states = {}
+        self._state_counts = Counter()
+        self._assumed_count = 0
 
-        return states
+        for entity_id in self.tracking:
+            self._async_count_member(
+                entity_id, self.hass.states.get(entity_id))
 
     @callback
-    def _async_update_group_state(self, tr_state=None):
+    def _async_update_group_state(self, tr_entity_id=None, tr_state=None):
         """Update group state.
 
-        Optionally you can provide the only state changed since last update
-        allowing this method to take shortcuts.
+        Optionally you can provide the only member that changed since last
+        update, only its counts are updated instead of counting all members.
 
         This method must be run in the event loop.
         """
-        # To store current states of group entities. Might not be needed.
-        states = None
-        gr_state = self._state
+        if tr_entity_id is None:
+            self._async_count_members()
+        else:
+            self._async_count_member(tr_entity_id, tr_state)
+
         gr_on = self.group_on
         gr_off = self.group_off
 
         # We have not determined type of group yet
         if gr_on is None:
-            if tr_state is None:
-                states = self._tracking_states
-
-                for state in states:
-                    gr_on, gr_off = \
-                        _get_group_on_off(state.state)
+            if tr_entity_id is None:
+                for entity_id in self.tracking:
+                    counted = self._member_states.get(entity_id)
+                    if counted is None:
+                        continue
+                    gr_on, gr_off = _get_group_on_off(counted[0])
                     if gr_on is not None:
                         break
-            else:
+            elif tr_state is not None:
                 gr_on, gr_off = _get_group_on_off(tr_state.state)
 
-            if gr_on is not None:
-                self.group_on, self.group_off = gr_on, gr_off
-
-        # We cannot determine state of the group
-        if gr_on is None:
-            return
-
-        if tr_state is None or ((gr_state == gr_on and
-                                 tr_state.state == gr_off) or
-                                tr_state.state not in (gr_on, gr_off)):
-            if states is None:
-                states = self._tracking_states
-
-            if any(state.state == gr_on for state in states):
-                self._state = gr_on
-            else:
-                self._state = gr_off
-
-        elif tr_state.state in (gr_on, gr_off):
-            self._state = tr_state.state
-
-        if tr_state is None or self._assumed_state and \
-           not tr_state.attributes.get(ATTR_ASSUMED_STATE):
-            if states is None:
-                states = self._tracking_states
+            # We cannot determine state of the group
+            if gr_on is None:
+                return
 
-            self._assumed_state = any(
-                state.attributes.get(ATTR_ASSUMED_STATE) for state
-                in states)
+            self.group_on, self.group_off = gr_on, gr_off
 
-        elif tr_state.attributes.get(ATTR_ASSUMED_STATE):
-            self._assumed_state = True
+        self._state = gr_on if self._state_counts[gr_on] else gr_off
+        self._assumed_state = self._assumed_count > 0
@@ -5,17 +5,19 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/history/
 """
 import asyncio
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from datetime import timedelta
-from itertools import groupby
+from itertools import chain, groupby
 import voluptuous as vol
 
 from homeassistant.const import HTTP_BAD_REQUEST
+from homeassistant.core import POOL_DATABASE, State
 import homeassistant.helpers.config_validation as cv
 import homeassistant.util.dt as dt_util
 from homeassistant.components import recorder, script
 from homeassistant.components.frontend import register_built_in_panel
-from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.http import (
+    HomeAssistantView, json_list_chunks)
 from homeassistant.const import ATTR_HIDDEN
 
 DOMAIN = 'history'
@@ -44,6 +46,17 @@ CONFIG_SCHEMA = vol.Schema({
 SIGNIFICANT_DOMAINS = ('thermostat', 'climate')
 IGNORE_DOMAINS = ('zone', 'scene',)
 
+RESOLUTION_AUTO = 'auto'
+RESOLUTION_RAW = 'raw'
+RESOLUTIONS = {
+    '5min': 300,
+    'hour': 3600,
+}
+
+# Longest period served from raw states and 5 minute rollups in auto mode
+AUTO_RAW_MAX = timedelta(days=1)
+AUTO_5MIN_MAX = timedelta(days=7)
+
 
 def last_5_states(entity_id):
     """Return the last 5 states for entity_id."""
@@ -66,6 +79,63 @@ def get_significant_states(start_time, end_time=None, entity_id=None,
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
     """
+    query = _significant_states_query(start_time, end_time, entity_id,
+                                      filters)
+
+    states = (
+        state for state in recorder.execute(query)
+        if (_is_significant(state) and
+            not state.attributes.get(ATTR_HIDDEN, False)))
+
+    return states_to_json(states, start_time, entity_id, filters)
+
+
+def stream_significant_states(start_time, end_time=None, entity_id=None,
+                              filters=None):
+    """Generator that yields the significant states as JSON text.
+
+    The result has the same structure as get_significant_states, but rows
+    are read from the database and encoded one entity at a time.
+    """
+    entity_ids = [entity_id] if entity_id is not None else None
+
+    # Get the states at the start time
+    start_states = OrderedDict()
+    for state in get_states(start_time, entity_ids, filters=filters):
+        state.last_changed = start_time
+        state.last_updated = start_time
+        start_states[state.entity_id] = state
+
+    query = _significant_states_query(start_time, end_time, entity_id,
+                                      filters)
+
+    states = (
+        state for state in recorder.execute_stream(query)
+        if (_is_significant(state) and
+            not state.attributes.get(ATTR_HIDDEN, False)))
+
+    separator = ''
+    yield '['
+
+    for entity_id, group in groupby(states, lambda state: state.entity_id):
+        start_state = start_states.pop(entity_id, None)
+        if start_state is not None:
+            group = chain((start_state,), group)
+        yield separator
+        yield from json_list_chunks(group)
+        separator = ','
+
+    # Entities that did not change during the period
+    for start_state in start_states.values():
+        yield separator
+        yield from json_list_chunks((start_state,))
+        separator = ','
+
+    yield ']'
+
+
+def _significant_states_query(start_time, end_time, entity_id, filters):
+    """Return the query for the significant states during a period."""
     entity_ids = (entity_id.lower(), ) if entity_id is not None else None
     states = recorder.get_model('States')
     query = recorder.query('States').filter(
@@ -78,13 +148,7 @@ def get_significant_states(start_time, end_time=None, entity_id=None,
     if end_time is not None:
         query = query.filter(states.last_updated < end_time)
 
-    states = (
-        state for state in recorder.execute(
-            query.order_by(states.entity_id, states.last_updated))
-        if (_is_significant(state) and
-            not state.attributes.get(ATTR_HIDDEN, False)))
-
-    return states_to_json(states, start_time, entity_id, filters)
+    return query.order_by(states.entity_id, states.last_updated)
 
 
 def state_changes_during_period(start_time, end_time=None, entity_id=None):
@@ -106,6 +170,50 @@ def state_changes_during_period(start_time, end_time=None, entity_id=None):
     return states_to_json(states, start_time, entity_id)
 
 
+def get_rollups(start_time, end_time=None, entity_id=None, period=3600,
+                filters=None):
+    """Return the rolled up numeric states during UTC period.
+
+    Every rollup is returned as a state with the mean as value, the bucket
+    start as timestamps and the min, max, mean, last value and count as
+    attributes. The attributes of the state at start_time are merged in so
+    the unit of measurement and friendly name are available.
+    """
+    entity_ids = (entity_id.lower(), ) if entity_id is not None else None
+    rollups = recorder.get_model('StateRollups')
+    query = recorder.query('StateRollups').filter(
+        (rollups.period == period) &
+        (rollups.start >= start_time - timedelta(seconds=period)))
+    if filters:
+        query = filters.apply(query, entity_ids, 'StateRollups')
+    elif entity_ids is not None:
+        query = query.filter(rollups.entity_id.in_(entity_ids))
+
+    if end_time is not None:
+        query = query.filter(rollups.start < end_time)
+
+    start_states = {
+        state.entity_id: state for state
+        in get_states(start_time, entity_ids, filters=filters)}
+
+    result = defaultdict(list)
+
+    for rollup in recorder.execute(
+            query.order_by(rollups.entity_id, rollups.start)):
+        start_state = start_states.get(rollup.entity_id)
+        if start_state is None:
+            result[rollup.entity_id].append(rollup)
+            continue
+
+        attributes = dict(start_state.attributes)
+        attributes.update(rollup.attributes)
+        result[rollup.entity_id].append(State(
+            rollup.entity_id, rollup.state, attributes,
+            rollup.last_changed, rollup.last_updated))
+
+    return result
+
+
 def get_states(utc_point_in_time, entity_ids=None, run=None, filters=None):
     """Return the states at a specific point in time."""
     if run is None:
@@ -205,7 +313,7 @@ class Last5StatesView(HomeAssistantView):
     def get(self, request, entity_id):
         """Retrieve last 5 states of entity."""
         result = yield from self.hass.loop.run_in_executor(
-            None, last_5_states, entity_id)
+            self.hass.executors[POOL_DATABASE], last_5_states, entity_id)
         return self.json(result)
 
 
@@ -237,12 +345,33 @@ class HistoryPeriodView(HomeAssistantView):
         else:
             start_time = dt_util.utcnow() - one_day
 
-        end_time = start_time + one_day
+        end_time = request.GET.get('end_time')
+        if end_time:
+            end_time = dt_util.parse_datetime(end_time)
+            if end_time is None:
+                return self.json_message('Invalid end_time', HTTP_BAD_REQUEST)
+            end_time = dt_util.as_utc(end_time)
+        else:
+            end_time = start_time + one_day
+
         entity_id = request.GET.get('filter_entity_id')
 
-        result = yield from self.hass.loop.run_in_executor(
-            None, get_significant_states, start_time, end_time, entity_id,
-            self.filters)
+        resolution = request.GET.get('resolution', RESOLUTION_RAW)
+        if resolution == RESOLUTION_AUTO:
+            resolution = _auto_resolution(end_time - start_time)
+
+        if resolution == RESOLUTION_RAW:
+            response = yield from self.json_stream(
+                request, lambda: stream_significant_states(
+                    start_time, end_time, entity_id, self.filters),
+                self.hass.executors[POOL_DATABASE])
+            return response
+        elif resolution in RESOLUTIONS:
+            result = yield from self.hass.loop.run_in_executor(
+                self.hass.executors[POOL_DATABASE], get_rollups, start_time,
+                end_time, entity_id, RESOLUTIONS[resolution], self.filters)
+        else:
+            return self.json_message('Invalid resolution', HTTP_BAD_REQUEST)
 
         return self.json(result.values())
 
@@ -257,7 +386,7 @@ class Filters(object):
         self.included_entities = []
         self.included_domains = []
 
-    def apply(self, query, entity_ids=None):
+    def apply(self, query, entity_ids=None, model_name='States'):
         """Apply the include/exclude filter on domains and entities on query.
 
         Following rules apply:
@@ -268,7 +397,7 @@ class Filters(object):
         * if include and exclude is defined - select the entities specified in
           the include and filter out the ones from the exclude list.
         """
-        states = recorder.get_model('States')
+        states = recorder.get_model(model_name)
         # specific entities requested - do not in/exclude anything
         if entity_ids is not None:
             return query.filter(states.entity_id.in_(entity_ids))
@@ -306,6 +435,15 @@ class Filters(object):
         return query
 
 
+def _auto_resolution(span):
+    """Return the resolution that fits a period of the given length."""
+    if span <= AUTO_RAW_MAX:
+        return RESOLUTION_RAW
+    elif span <= AUTO_5MIN_MAX:
+        return '5min'
+    return 'hour'
+
+
 def _is_significant(state):
     """Test if state is significant for history charts.
 
@@ -6,13 +6,13 @@ https://home-assistant.io/components/http/
 """
 import asyncio
 import hmac
-import json
 import logging
 import mimetypes
 import os
 from pathlib import Path
 import re
 import ssl
+import threading
 from ipaddress import ip_address, ip_network
 
 import voluptuous as vol
@@ -22,8 +22,9 @@ from aiohttp.web_exceptions import (
     HTTPUnauthorized, HTTPMovedPermanently, HTTPNotModified)
 from aiohttp.web_urldispatcher import StaticRoute
 
-from homeassistant.core import is_callback
+from homeassistant.core import POOL_CPU, is_callback
 import homeassistant.remote as rem
+from homeassistant.util.async import run_coroutine_threadsafe
 from homeassistant import util
 from homeassistant.const import (
     SERVER_PORT, HTTP_HEADER_HA_AUTH,  # HTTP_HEADER_CACHE_CONTROL,
@@ -46,6 +47,14 @@ CONF_USE_X_FORWARDED_FOR = 'use_x_forwarded_for'
 CONF_TRUSTED_NETWORKS = 'trusted_networks'
 
 DATA_API_PASSWORD = 'api_password'
+DATA_STREAM_SLOTS = 'http_stream_slots'
+
+# Size in bytes at which streamed JSON is handed to the event loop
+STREAM_CHUNK_SIZE = 64 * 1024
+# Number of chunks that may wait to be written before the producer blocks
+STREAM_QUEUE_SIZE = 4
+# Queued by the producer of a stream that failed
+_STREAM_ERROR = object()
 NOTIFICATION_ID_LOGIN = 'http-login'
 
 # TLS configuation follows the best-practice guidelines specified here:
@@ -414,11 +423,115 @@ class HomeAssistantView(object):
     # pylint: disable=no-self-use
     def json(self, result, status_code=200):
         """Return a JSON response."""
-        msg = json.dumps(
-            result, sort_keys=True, cls=rem.JSONEncoder).encode('UTF-8')
+        msg = rem.json_dumps(result).encode('UTF-8')
         return web.Response(
             body=msg, content_type=CONTENT_TYPE_JSON, status=status_code)
 
+    @asyncio.coroutine
+    def async_json(self, result, status_code=200):
+        """Return a JSON response, encoded on the CPU pool.
+
+        For large results that would block the event loop while encoding.
+        """
+        msg = yield from self.hass.loop.run_in_executor(
+            self.hass.executors[POOL_CPU], rem.json_dumps, result)
+        return web.Response(
+            body=msg.encode('UTF-8'), content_type=CONTENT_TYPE_JSON,
+            status=status_code)
+
+    @asyncio.coroutine
+    def json_stream(self, request, produce, executor=None):
+        """Stream JSON text to the client while it is being produced.
+
+        produce is called in the executor, the default one unless given, and
+        should return an iterator of JSON text pieces. The pieces are
+        collected into chunks that are written as soon as they are ready, a
+        slow client pauses the producer instead of buffering the whole
+        result.
+
+        A producer keeps its worker busy for the whole stream. Streams wait
+        for a slot so one worker of the executor stays free for other jobs.
+        When the producer fails the connection is closed before the stream
+        is ended, so the client can tell the result is incomplete.
+        """
+        loop = self.hass.loop
+        queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE, loop=loop)
+        stop = threading.Event()
+
+        def put(chunk):
+            """Hand a chunk to the event loop, wait if the queue is full."""
+            run_coroutine_threadsafe(queue.put(chunk), loop).result()
+
+        def producer():
+            """Collect the produced pieces into chunks."""
+            pieces = []
+            size = 0
+            try:
+                for piece in produce():
+                    if stop.is_set():
+                        return
+                    pieces.append(piece)
+                    size += len(piece)
+                    if size >= STREAM_CHUNK_SIZE:
+                        put(''.join(pieces).encode('UTF-8'))
+                        pieces = []
+                        size = 0
+                put(''.join(pieces).encode('UTF-8'))
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error while streaming %s", request.path)
+                put(_STREAM_ERROR)
+            finally:
+                put(None)
+
+        slots = self._stream_slots(executor)
+        yield from slots.acquire()
+        try:
+            response = web.StreamResponse()
+            response.content_type = CONTENT_TYPE_JSON
+            yield from response.prepare(request)
+
+            loop.run_in_executor(executor, producer)
+            finished = failed = False
+            try:
+                while True:
+                    chunk = yield from queue.get()
+                    if chunk is None:
+                        finished = True
+                        break
+                    if chunk is _STREAM_ERROR:
+                        failed = True
+                        continue
+                    response.write(chunk)
+                    yield from response.drain()
+            finally:
+                if not finished:
+                    # Client went away, stop and unblock the producer
+                    stop.set()
+                    while (yield from queue.get()) is not None:
+                        pass
+        finally:
+            slots.release()
+
+        if failed:
+            request.transport.close()
+            return response
+
+        yield from response.write_eof()
+        return response
+
+    def _stream_slots(self, executor):
+        """Return the semaphore limiting the streams of an executor."""
+        if executor is None:
+            executor = self.hass.executor
+
+        slots = self.hass.data.get(DATA_STREAM_SLOTS)
+        if slots is None:
+            slots = self.hass.data[DATA_STREAM_SLOTS] = {}
+        if executor not in slots:
+            slots[executor] = asyncio.Semaphore(
+                max(1, executor.max_workers - 1), loop=self.hass.loop)
+        return slots[executor]
+
     def json_message(self, error, status_code=200):
         """Return a JSON message response."""
         return self.json({'message': error}, status_code)
@@ -454,6 +567,17 @@ class HomeAssistantView(object):
         #     self.app.router.add_route('*', url, self)
 
 
+def json_list_chunks(items):
+    """Generator that encodes items as a JSON list, one piece per item."""
+    yield '['
+    separator = ''
+    for item in items:
+        yield separator
+        yield rem.json_dumps(item)
+        separator = ','
+    yield ']'
+
+
 def request_handler_factory(view, handler):
     """Factory to wrap our handler classes.
 
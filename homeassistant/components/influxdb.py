@@ -6,28 +6,38 @@ https://home-assistant.io/components/influxdb/
 """
 import logging
 
+import requests
 import voluptuous as vol
 
 from homeassistant.const import (
     EVENT_STATE_CHANGED, STATE_UNAVAILABLE, STATE_UNKNOWN, CONF_HOST,
     CONF_PORT, CONF_SSL, CONF_VERIFY_SSL, CONF_USERNAME, CONF_BLACKLIST,
     CONF_PASSWORD, CONF_WHITELIST)
+from homeassistant.core import callback
 from homeassistant.helpers import state as state_helper
+from homeassistant.helpers.batching import BatchWriter
 import homeassistant.helpers.config_validation as cv
 
 REQUIREMENTS = ['influxdb==3.0.0']
 
 _LOGGER = logging.getLogger(__name__)
 
+CONF_BATCH_SIZE = 'batch_size'
 CONF_DB_NAME = 'database'
+CONF_FLUSH_INTERVAL = 'flush_interval'
 CONF_TAGS = 'tags'
 
+DATA_INFLUXDB = 'influxdb_writer'
+
+DEFAULT_BATCH_SIZE = 100
 DEFAULT_DATABASE = 'home_assistant'
+DEFAULT_FLUSH_INTERVAL = 5
 DEFAULT_HOST = 'localhost'
 DEFAULT_PORT = 8086
 DEFAULT_SSL = False
 DEFAULT_VERIFY_SSL = False
 DOMAIN = 'influxdb'
+SPILL_FILE = 'influxdb.spill'
 TIMEOUT = 5
 
 CONFIG_SCHEMA = vol.Schema({
@@ -35,8 +45,12 @@ CONFIG_SCHEMA = vol.Schema({
         vol.Optional(CONF_HOST, default=DEFAULT_HOST): cv.string,
         vol.Inclusive(CONF_USERNAME, 'authentication'): cv.string,
         vol.Inclusive(CONF_PASSWORD, 'authentication'): cv.string,
+        vol.Optional(CONF_BATCH_SIZE, default=DEFAULT_BATCH_SIZE):
+            vol.All(vol.Coerce(int), vol.Range(min=1)),
         vol.Optional(CONF_BLACKLIST, default=[]):
             vol.All(cv.ensure_list, [cv.entity_id]),
+        vol.Optional(CONF_FLUSH_INTERVAL, default=DEFAULT_FLUSH_INTERVAL):
+            vol.All(vol.Coerce(float), vol.Range(min=0)),
         vol.Optional(CONF_DB_NAME, default=DEFAULT_DATABASE): cv.string,
         vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
         vol.Optional(CONF_SSL, default=DEFAULT_SSL): cv.boolean,
@@ -78,8 +92,35 @@ def setup(hass, config):
                       "the database exists and is READ/WRITE.", exc)
         return False
 
+    def write_points(points):
+        """Write points, leaving out the ones the database refuses."""
+        try:
+            influx.write_points(points)
+        except exceptions.InfluxDBClientError as exc:
+            # A bad point, like a field type conflict, fails the whole
+            # request. Split the batch to find it and write the others.
+            if exc.code != 400:
+                raise
+            if len(points) == 1:
+                _LOGGER.error('Dropping point for %s: %s',
+                              points[0]['measurement'], exc)
+                return
+            middle = len(points) // 2
+            write_points(points[:middle])
+            write_points(points[middle:])
+
+    writer = hass.data[DATA_INFLUXDB] = BatchWriter(
+        hass, 'InfluxDBWriter', write_points,
+        retry_exceptions=(exceptions.InfluxDBServerError,
+                          requests.exceptions.RequestException),
+        batch_size=conf.get(CONF_BATCH_SIZE),
+        flush_interval=conf.get(CONF_FLUSH_INTERVAL),
+        spill_path=hass.config.path(SPILL_FILE))
+    writer.start()
+
+    @callback
     def influx_event_listener(event):
-        """Listen for new messages on the bus and sends them to Influx."""
+        """Listen for new messages on the bus and queue them for Influx."""
         state = event.data.get('new_state')
         if state is None or state.state in (
                 STATE_UNKNOWN, '', STATE_UNAVAILABLE) or \
@@ -98,30 +139,25 @@ def setup(hass, config):
         if measurement in (None, ''):
             measurement = state.entity_id
 
-        json_body = [
-            {
-                'measurement': measurement,
-                'tags': {
-                    'domain': state.domain,
-                    'entity_id': state.object_id,
-                },
-                'time': event.time_fired,
-                'fields': {
-                    'value': _state,
-                }
+        point = {
+            'measurement': measurement,
+            'tags': {
+                'domain': state.domain,
+                'entity_id': state.object_id,
+            },
+            'time': event.time_fired,
+            'fields': {
+                'value': _state,
             }
-        ]
+        }
 
         for key, value in state.attributes.items():
             if key != 'unit_of_measurement':
-                json_body[0]['fields'][key] = value
+                point['fields'][key] = value
 
-        json_body[0]['tags'].update(tags)
+        point['tags'].update(tags)
 
-        try:
-            influx.write_points(json_body)
-        except exceptions.InfluxDBClientError:
-            _LOGGER.exception('Error saving event "%s" to InfluxDB', json_body)
+        writer.put(point)
 
     hass.bus.listen(EVENT_STATE_CHANGED, influx_event_listener)
 
@@ -16,12 +16,14 @@ import homeassistant.helpers.config_validation as cv
 import homeassistant.util.dt as dt_util
 from homeassistant.components import recorder, sun
 from homeassistant.components.frontend import register_built_in_panel
-from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.http import (
+    HomeAssistantView, json_list_chunks)
 from homeassistant.const import (EVENT_HOMEASSISTANT_START,
                                  EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED,
                                  STATE_NOT_HOME, STATE_OFF, STATE_ON,
                                  ATTR_HIDDEN, HTTP_BAD_REQUEST)
-from homeassistant.core import State, split_entity_id, DOMAIN as HA_DOMAIN
+from homeassistant.core import (
+    POOL_DATABASE, State, split_entity_id, DOMAIN as HA_DOMAIN)
 from homeassistant.util.async import run_callback_threadsafe
 
 DOMAIN = "logbook"
@@ -138,17 +140,18 @@ class LogbookView(HomeAssistantView):
         end_day = start_day + timedelta(days=1)
 
         def get_results():
-            """Query DB for results."""
+            """Query DB for results and yield them as JSON."""
             events = recorder.get_model('Events')
             query = recorder.query('Events').filter(
                 (events.time_fired > start_day) &
-                (events.time_fired < end_day))
-            events = recorder.execute(query)
-            return _exclude_events(events, self.config)
+                (events.time_fired < end_day)).order_by(events.time_fired)
+            events = recorder.execute_stream(query)
+            yield from json_list_chunks(
+                humanify(_exclude_events(events, self.config)))
 
-        events = yield from self.hass.loop.run_in_executor(None, get_results)
-
-        return self.json(humanify(events))
+        response = yield from self.json_stream(
+            request, get_results, self.hass.executors[POOL_DATABASE])
+        return response
 
 
 class Entry(object):
@@ -285,7 +288,7 @@ def humanify(events):
 
 
 def _exclude_events(events, config):
-    """Get lists of excluded entities and platforms."""
+    """Generator that filters out excluded entities and platforms."""
     excluded_entities = []
     excluded_domains = []
     included_entities = []
@@ -299,7 +302,6 @@ def _exclude_events(events, config):
         included_entities = include[CONF_ENTITIES]
         included_domains = include[CONF_DOMAINS]
 
-    filtered_events = []
     for event in events:
         domain, entity_id = None, None
 
@@ -348,8 +350,7 @@ def _exclude_events(events, config):
             # check if logbook entry is excluded for this entity
             if entity_id in excluded_entities:
                 continue
-        filtered_events.append(event)
-    return filtered_events
+        yield event
 
 
 # pylint: disable=too-many-return-statements
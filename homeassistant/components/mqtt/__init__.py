@@ -30,6 +30,8 @@ MQTT_CLIENT = None
 SERVICE_PUBLISH = 'publish'
 EVENT_MQTT_MESSAGE_RECEIVED = 'mqtt_message_received'
 
+DATA_MQTT_SUBSCRIPTIONS = 'mqtt_subscriptions'
+
 REQUIREMENTS = ['paho-mqtt==1.2']
 
 CONF_EMBEDDED = 'embedded'
@@ -172,20 +174,31 @@ def publish_template(hass, topic, payload_template, qos=None, retain=None):
 
 def async_subscribe(hass, topic, callback, qos=DEFAULT_QOS):
     """Subscribe to an MQTT topic."""
-    @asyncio.coroutine
-    def mqtt_topic_subscriber(event):
-        """Match subscribed MQTT topic."""
-        if not _match_topic(topic, event.data[ATTR_TOPIC]):
-            return
+    subscriptions = hass.data.get(DATA_MQTT_SUBSCRIPTIONS)
+
+    if subscriptions is None:
+        subscriptions = hass.data[DATA_MQTT_SUBSCRIPTIONS] = TopicTrie()
+
+        @asyncio.coroutine
+        def mqtt_message_received(event):
+            """Call the subscribers of the topic of the message."""
+            msg_topic = event.data[ATTR_TOPIC]
 
-        hass.async_run_job(callback, event.data[ATTR_TOPIC],
-                           event.data[ATTR_PAYLOAD], event.data[ATTR_QOS])
+            for subscriber in subscriptions.match(msg_topic):
+                hass.async_run_job(subscriber, msg_topic,
+                                   event.data[ATTR_PAYLOAD],
+                                   event.data[ATTR_QOS])
 
-    async_remove = hass.bus.async_listen(EVENT_MQTT_MESSAGE_RECEIVED,
-                                         mqtt_topic_subscriber)
+        hass.bus.async_listen(EVENT_MQTT_MESSAGE_RECEIVED,
+                              mqtt_message_received)
 
-    # Future: track subscriber count and unsubscribe in remove
-    MQTT_CLIENT.subscribe(topic, qos)
+    if subscriptions.add(topic, callback) == 1:
+        MQTT_CLIENT.subscribe(topic, qos)
+
+    def async_remove():
+        """Remove the subscription, unsubscribe after the last one."""
+        if subscriptions.remove(topic, callback) == 0:
+            MQTT_CLIENT.unsubscribe(topic)
 
     return async_remove
 
@@ -375,6 +388,8 @@ class MQTT(object):
 
     def unsubscribe(self, topic):
         """Unsubscribe from topic."""
+        # Forget the topic right away so a new subscription is not ignored
+        self.topics.pop(topic, None)
         result, mid = self._mqttc.unsubscribe(topic)
         _raise_on_error(result)
         self.progress[mid] = topic
@@ -437,10 +452,7 @@ class MQTT(object):
 
     def _mqtt_on_unsubscribe(self, _mqttc, _userdata, mid, granted_qos):
         """Unsubscribe successful callback."""
-        topic = self.progress.pop(mid, None)
-        if topic is None:
-            return
-        self.topics.pop(topic, None)
+        self.progress.pop(mid, None)
 
     def _mqtt_on_disconnect(self, _mqttc, _userdata, result_code):
         """Disconnected callback."""
@@ -483,14 +495,86 @@ def _raise_on_error(result):
         raise HomeAssistantError('Error talking to MQTT: {}'.format(result))
 
 
-def _match_topic(subscription, topic):
-    """Test if topic matches subscription."""
-    if subscription.endswith('#'):
-        return (subscription[:-2] == topic or
-                topic.startswith(subscription[:-1]))
-
-    sub_parts = subscription.split('/')
-    topic_parts = topic.split('/')
-
-    return (len(sub_parts) == len(topic_parts) and
-            all(a == b for a, b in zip(sub_parts, topic_parts) if a != '+'))
+class TopicTrie(object):
+    """Subscriptions stored in a trie of topic levels.
+
+    Matching a topic walks the trie level by level, following the exact
+    level and the + and # wildcards, so the cost depends on the depth of
+    the topic and not on the number of subscriptions.
+    """
+
+    def __init__(self):
+        """Initialize the empty trie."""
+        self._root = _TopicNode()
+
+    def add(self, subscription, subscriber):
+        """Add a subscriber, return the subscriber count of the topic."""
+        node = self._root
+        for level in subscription.split('/'):
+            node = node.children.setdefault(level, _TopicNode())
+        node.subscribers.append(subscriber)
+        return len(node.subscribers)
+
+    def remove(self, subscription, subscriber):
+        """Remove a subscriber, return the subscriber count of the topic."""
+        path = [self._root]
+        levels = subscription.split('/')
+        for level in levels:
+            node = path[-1].children.get(level)
+            if node is None:
+                return 0
+            path.append(node)
+
+        node = path[-1]
+        try:
+            node.subscribers.remove(subscriber)
+        except ValueError:
+            return len(node.subscribers)
+        count = len(node.subscribers)
+
+        # Prune the nodes that no longer lead to a subscriber
+        for level, parent in zip(reversed(levels), reversed(path[:-1])):
+            child = parent.children[level]
+            if child.subscribers or child.children:
+                break
+            del parent.children[level]
+
+        return count
+
+    def match(self, topic):
+        """Return the subscribers of all subscriptions matching topic."""
+        matches = []
+        nodes = [self._root]
+
+        for level in topic.split('/'):
+            next_nodes = []
+            for node in nodes:
+                children = node.children
+                if '#' in children:
+                    matches.extend(children['#'].subscribers)
+                if level in children:
+                    next_nodes.append(children[level])
+                if '+' in children and level != '+':
+                    next_nodes.append(children['+'])
+            nodes = next_nodes
+            if not nodes:
+                return matches
+
+        for node in nodes:
+            matches.extend(node.subscribers)
+            # A subtree wildcard also matches its parent level
+            if '#' in node.children:
+                matches.extend(node.children['#'].subscribers)
+
+        return matches
+
+
+class _TopicNode(object):
+    """A level in the topic trie."""
+
+    __slots__ = ['children', 'subscribers']
+
+    def __init__(self):
+        """Initialize the node."""
+        self.children = {}
+        self.subscribers = []
@@ -15,7 +15,7 @@ from homeassistant.const import (
     ATTR_SERVICE_DATA, EVENT_CALL_SERVICE, EVENT_SERVICE_EXECUTED,
     EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL)
 from homeassistant.core import EventOrigin, State
-from homeassistant.remote import JSONEncoder
+from homeassistant.remote import json_dumps
 
 DOMAIN = "mqtt_eventstream"
 DEPENDENCIES = ['mqtt']
@@ -66,7 +66,7 @@ def setup(hass, config):
             return
 
         event_info = {'event_type': event.event_type, 'event_data': event.data}
-        msg = json.dumps(event_info, cls=JSONEncoder)
+        msg = json_dumps(event_info)
         mqtt.publish(hass, pub_topic, msg)
 
     # Only listen for local events if you are going to publish them.
@@ -4,6 +4,7 @@ Component that will help set the openalpr for video streams.
 For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/openalpr/
 """
+import asyncio
 from base64 import b64encode
 import logging
 import os
@@ -17,10 +18,13 @@ from homeassistant.const import (
     CONF_API_KEY, CONF_NAME, CONF_USERNAME, CONF_PASSWORD, ATTR_ENTITY_ID,
     EVENT_HOMEASSISTANT_STOP, STATE_UNKNOWN)
 from homeassistant.components.ffmpeg import (
-    get_binary, run_test, CONF_INPUT, CONF_EXTRA_ARGUMENTS)
+    async_get_mjpeg_relay, get_binary, run_test, CONF_INPUT,
+    CONF_EXTRA_ARGUMENTS)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.util.async import (
+    run_callback_threadsafe, run_coroutine_threadsafe)
 
 DOMAIN = 'openalpr'
 DEPENDENCIES = ['ffmpeg']
@@ -63,6 +67,7 @@ CONF_INTERVAL = 'interval'
 CONF_ENTITIES = 'entities'
 CONF_CONFIDENCE = 'confidence'
 CONF_ALPR_BINARY = 'alpr_binary'
+CONF_RELAY = 'relay'
 
 DEFAULT_NAME = 'OpenAlpr'
 DEFAULT_ENGINE = ENGINE_LOCAL
@@ -78,6 +83,7 @@ DEVICE_SCHEMA = vol.Schema({
     vol.Optional(CONF_RENDER, default=DEFAULT_RENDER):
         vol.In([RENDER_IMAGE, RENDER_FFMPEG]),
     vol.Optional(CONF_EXTRA_ARGUMENTS): cv.string,
+    vol.Optional(CONF_RELAY, default=False): cv.boolean,
     vol.Optional(CONF_USERNAME): cv.string,
     vol.Optional(CONF_PASSWORD): cv.string,
 })
@@ -156,13 +162,25 @@ def setup(hass, config):
                 _LOGGER.error("'%s' is not valid ffmpeg input", input_source)
                 continue
 
-            alpr_dev = OpenalprDeviceFFmpeg(
-                name=device.get(CONF_NAME),
-                interval=device.get(CONF_INTERVAL),
-                api=alpr_api,
-                input_source=input_source,
-                extra_arguments=device.get(CONF_EXTRA_ARGUMENTS),
-            )
+            if device.get(CONF_RELAY):
+                relay = run_callback_threadsafe(
+                    hass.loop, async_get_mjpeg_relay, hass, input_source,
+                    device.get(CONF_EXTRA_ARGUMENTS)).result()
+                alpr_dev = OpenalprDeviceRelay(
+                    hass,
+                    name=device.get(CONF_NAME),
+                    interval=device.get(CONF_INTERVAL),
+                    api=alpr_api,
+                    relay=relay,
+                )
+            else:
+                alpr_dev = OpenalprDeviceFFmpeg(
+                    name=device.get(CONF_NAME),
+                    interval=device.get(CONF_INTERVAL),
+                    api=alpr_api,
+                    input_source=input_source,
+                    extra_arguments=device.get(CONF_EXTRA_ARGUMENTS),
+                )
         else:
             alpr_dev = OpenalprDeviceImage(
                 name=device.get(CONF_NAME),
@@ -357,6 +375,85 @@ class OpenalprDeviceFFmpeg(OpenalprDevice):
         return self._interval == 0 or self._ffmpeg.is_running
 
 
+class OpenalprDeviceRelay(OpenalprDevice):
+    """Process the frames of an ffmpeg stream shared with the cameras."""
+
+    def __init__(self, hass, name, interval, api, relay):
+        """Init image processing."""
+        super().__init__(name, interval, api)
+        self.hass = hass
+        self._relay = relay
+        self._tap = None
+
+        self._start_tap()
+
+    def shutdown(self, event):
+        """Stop processing the stream."""
+        if self._tap is not None:
+            self.hass.loop.call_soon_threadsafe(self._tap.cancel)
+
+    def restart(self):
+        """Restart processing the stream."""
+        self.shutdown(None)
+        self._start_tap()
+
+    def scan(self):
+        """Immediately scan a image."""
+        image = run_coroutine_threadsafe(
+            self._async_grab(), self.hass.loop).result()
+        if image is not None:
+            self._process_image(image)
+
+    def _start_tap(self):
+        """Start processing a frame of the stream every interval."""
+        if self._interval == 0:
+            return
+
+        self._tap = run_callback_threadsafe(
+            self.hass.loop, self.hass.loop.create_task,
+            self._async_tap()).result()
+
+    @asyncio.coroutine
+    def _async_tap(self):
+        """Process the next new frame of the relay every interval."""
+        self._relay.async_subscribe()
+        sequence = None
+
+        try:
+            while True:
+                image = yield from self._relay.async_next_frame(sequence)
+                if image is None:
+                    return
+
+                sequence = self._relay.sequence
+                yield from self.hass.loop.run_in_executor(
+                    None, self._process_image, image)
+                yield from asyncio.sleep(self._interval, loop=self.hass.loop)
+        finally:
+            self._relay.async_unsubscribe()
+
+    @asyncio.coroutine
+    def _async_grab(self):
+        """Return the current frame of the relay."""
+        self._relay.async_subscribe()
+        try:
+            image = yield from self._relay.async_next_frame(None)
+        finally:
+            self._relay.async_unsubscribe()
+        return image
+
+    @property
+    def should_poll(self):
+        """Return False, frames are pushed by the relay."""
+        return False
+
+    @property
+    def available(self):
+        """Return True if entity is available."""
+        return self._interval == 0 or (
+            self._tap is not None and not self._tap.done())
+
+
 class OpenalprDeviceImage(OpenalprDevice):
     """Represent a openalpr device object for processing stream/images."""
 
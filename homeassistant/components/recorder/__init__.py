@@ -7,12 +7,14 @@ to query this database.
 For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/recorder/
 """
+from collections import OrderedDict
 import logging
+import math
 import queue
 import threading
 import time
 from datetime import timedelta, datetime
-from typing import Any, Union, Optional, List
+from typing import Any, Dict, Union, Optional, List, Tuple  # NOQA
 
 import voluptuous as vol
 
@@ -34,22 +36,49 @@ DEFAULT_DB_FILE = 'home-assistant_v2.db'
 
 CONF_DB_URL = 'db_url'
 CONF_PURGE_DAYS = 'purge_days'
+CONF_COMMIT_INTERVAL = 'commit_interval'
+CONF_COMMIT_BATCH_SIZE = 'commit_batch_size'
+
+DEFAULT_COMMIT_INTERVAL = 1
+DEFAULT_COMMIT_BATCH_SIZE = 500
+
+# Events waiting to be recorded, newer events are dropped beyond this
+MAX_QUEUE = 10000
 
 RETRIES = 3
 CONNECT_RETRY_WAIT = 10
 QUERY_RETRY_WAIT = 0.1
 
+# Number of rows fetched at a time when streaming query results
+STREAM_YIELD_PER = 1000
+
+# Length in seconds of the buckets numeric states are rolled up into
+ROLLUP_PERIODS = (300, 3600)
+
+# Number of shared attribute ids remembered to skip existence lookups
+ATTRIBUTES_CACHE_SIZE = 2048
+
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
         vol.Optional(CONF_PURGE_DAYS):
             vol.All(vol.Coerce(int), vol.Range(min=1)),
         vol.Optional(CONF_DB_URL): cv.string,
+        vol.Optional(CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL):
+            vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_COMMIT_BATCH_SIZE,
+                     default=DEFAULT_COMMIT_BATCH_SIZE):
+            vol.All(vol.Coerce(int), vol.Range(min=1)),
     })
 }, extra=vol.ALLOW_EXTRA)
 
 _INSTANCE = None  # type: Any
 _LOGGER = logging.getLogger(__name__)
 
+# Queued by block_till_done to commit the pending batch right away
+_FLUSH = object()
+# Queued by the purge timer, purging runs on the recorder thread
+_PURGE = object()
+
 # These classes will be populated during setup()
 # pylint: disable=invalid-name,no-member
 Session = None  # pylint: disable=no-member
@@ -76,6 +105,22 @@ def execute(q: QueryType) -> List[Any]:
     return []
 
 
+def execute_stream(q: QueryType, yield_per: int=STREAM_YIELD_PER):
+    """Query the database and yield the objects in HA native form.
+
+    Rows are fetched and converted while iterating, so memory use does not
+    depend on the size of the result. Unlike execute this does not retry,
+    the rows that were already yielded can not be taken back.
+    """
+    try:
+        for row in q.yield_per(yield_per):
+            native = row.to_native()
+            if native is not None:
+                yield native
+    finally:
+        Session.close()
+
+
 def run_information(point_in_time: Optional[datetime]=None):
     """Return information about current run.
 
@@ -103,14 +148,20 @@ def setup(hass: HomeAssistant, config: ConfigType) -> bool:
         _LOGGER.error("Only a single instance allowed")
         return False
 
-    purge_days = config.get(DOMAIN, {}).get(CONF_PURGE_DAYS)
+    conf = config.get(DOMAIN, {})
+    purge_days = conf.get(CONF_PURGE_DAYS)
 
-    db_url = config.get(DOMAIN, {}).get(CONF_DB_URL, None)
+    db_url = conf.get(CONF_DB_URL, None)
     if not db_url:
         db_url = DEFAULT_URL.format(
             hass_config_path=hass.config.path(DEFAULT_DB_FILE))
 
-    _INSTANCE = Recorder(hass, purge_days=purge_days, uri=db_url)
+    _INSTANCE = Recorder(
+        hass, purge_days=purge_days, uri=db_url,
+        commit_interval=conf.get(CONF_COMMIT_INTERVAL,
+                                 DEFAULT_COMMIT_INTERVAL),
+        commit_batch_size=conf.get(CONF_COMMIT_BATCH_SIZE,
+                                   DEFAULT_COMMIT_BATCH_SIZE))
 
     return True
 
@@ -134,6 +185,21 @@ def get_model(model_name: str) -> Any:
         return None
 
 
+def migrate_schema(engine: Any) -> None:
+    """Add columns that are missing in databases of older versions."""
+    from sqlalchemy import inspect
+
+    columns = [column['name'] for column
+               in inspect(engine).get_columns('states')]
+
+    if 'attributes_id' not in columns:
+        _LOGGER.warning("Adding attributes_id column to states table")
+        engine.execute(
+            "ALTER TABLE states ADD COLUMN attributes_id VARCHAR(40)")
+        engine.execute(
+            "CREATE INDEX ix_states_attributes_id ON states (attributes_id)")
+
+
 def log_error(e: Exception, retry_wait: Optional[float]=0,
               rollback: Optional[bool]=True,
               message: Optional[str]="Error during query: %s") -> None:
@@ -153,13 +219,23 @@ def log_error(e: Exception, retry_wait: Optional[float]=0,
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
-    def __init__(self, hass: HomeAssistant, purge_days: int, uri: str) -> None:
+    # pylint: disable=too-many-arguments, too-many-instance-attributes
+    def __init__(self, hass: HomeAssistant, purge_days: int, uri: str,
+                 commit_interval: float=DEFAULT_COMMIT_INTERVAL,
+                 commit_batch_size: int=DEFAULT_COMMIT_BATCH_SIZE) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self)
 
         self.hass = hass
         self.purge_days = purge_days
-        self.queue = queue.Queue()  # type: Any
+        self.commit_interval = commit_interval
+        self.commit_batch_size = commit_batch_size
+        self.last_commit_size = 0
+        self.last_commit_latency = None  # type: Optional[float]
+        self._attributes_ids = OrderedDict()  # type: OrderedDict
+        self._rollups = {}  # type: Dict[Tuple[str, int], Dict[str, Any]]
+        self.queue = queue.Queue(maxsize=MAX_QUEUE)  # type: Any
+        self.dropped_events = 0
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
         self.db_ready = threading.Event()
@@ -176,7 +252,6 @@ class Recorder(threading.Thread):
 
     def run(self):
         """Start processing events to save."""
-        from homeassistant.components.recorder.models import Events, States
         import sqlalchemy.exc
 
         while True:
@@ -191,42 +266,81 @@ class Recorder(threading.Thread):
         if self.purge_days is not None:
             def purge_ticker(event):
                 """Rerun purge every second day."""
-                self._purge_old_data()
+                self.queue.put(_PURGE)
                 track_point_in_utc_time(self.hass, purge_ticker,
                                         dt_util.utcnow() + timedelta(days=2))
             track_point_in_utc_time(self.hass, purge_ticker,
                                     dt_util.utcnow() + timedelta(minutes=5))
 
+        pending = []  # type: List[Any]
+        batch_start = 0
+
         while True:
-            event = self.queue.get()
+            timeout = None
+            if pending:
+                timeout = max(0, batch_start + self.commit_interval -
+                              time.monotonic())
+
+            try:
+                event = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                self._commit_events(pending)
+                pending = []
+                continue
 
             if event is None:
+                self._commit_events(pending)
                 self._close_run()
                 self._close_connection()
                 self.queue.task_done()
                 return
 
-            if event.event_type == EVENT_TIME_CHANGED:
+            if event is _FLUSH:
+                self._commit_events(pending)
+                pending = []
                 self.queue.task_done()
                 continue
 
-            dbevent = Events.from_event(event)
-            self._commit(dbevent)
+            if event is _PURGE:
+                self._commit_events(pending)
+                pending = []
+                self._purge_old_data()
+                self.queue.task_done()
+                continue
 
-            if event.event_type != EVENT_STATE_CHANGED:
+            if event.event_type == EVENT_TIME_CHANGED:
                 self.queue.task_done()
                 continue
 
-            dbstate = States.from_event(event)
-            dbstate.event_id = dbevent.event_id
-            self._commit(dbstate)
+            if not pending:
+                batch_start = time.monotonic()
+            pending.append(event)
 
-            self.queue.task_done()
+            if len(pending) >= self.commit_batch_size or \
+               time.monotonic() - batch_start >= self.commit_interval:
+                self._commit_events(pending)
+                pending = []
 
     @callback
     def event_listener(self, event):
-        """Listen for new events and put them in the process queue."""
-        self.queue.put(event)
+        """Listen for new events and put them in the process queue.
+
+        Blocking would block the event loop, events are dropped while the
+        queue is full.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            if not self.dropped_events:
+                _LOGGER.warning("Recorder queue is full, dropping events "
+                                "until the database catches up")
+            self.dropped_events += 1
+            return
+
+        if self.dropped_events:
+            _LOGGER.warning("Recorder dropped %d events",
+                            self.dropped_events)
+            self.dropped_events = 0
 
     def shutdown(self, event):
         """Tell the recorder to shut down."""
@@ -236,8 +350,15 @@ class Recorder(threading.Thread):
         self.queue.put(None)
         self.join()
 
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of events waiting to be recorded."""
+        return self.queue.qsize()
+
     def block_till_done(self):
-        """Block till all events processed."""
+        """Block till all events processed and committed."""
+        if self.is_alive():
+            self.queue.put(_FLUSH)
         self.queue.join()
 
     def block_till_db_ready(self):
@@ -263,6 +384,7 @@ class Recorder(threading.Thread):
             self.engine = create_engine(self.db_url, echo=False)
 
         models.Base.metadata.create_all(self.engine)
+        migrate_schema(self.engine)
         session_factory = sessionmaker(bind=self.engine)
         Session = scoped_session(session_factory)
         self.db_ready.set()
@@ -292,6 +414,165 @@ class Recorder(threading.Thread):
         )
         self._commit(self._run)
 
+    def _shared_attributes_id(self, session, shared_attrs, new_ids):
+        """Return the id of the shared attributes, adding them if new."""
+        from homeassistant.components.recorder.models import StateAttributes
+
+        attributes = StateAttributes.from_shared_attrs(shared_attrs)
+        attributes_id = attributes.attributes_id
+
+        if attributes_id in self._attributes_ids:
+            self._attributes_ids.move_to_end(attributes_id)
+            return attributes_id
+
+        if session.query(StateAttributes.attributes_id).filter_by(
+                attributes_id=attributes_id).first() is None:
+            session.add(attributes)
+
+        new_ids.append(attributes_id)
+        return attributes_id
+
+    def _update_rollups(self, session, state, rollups):
+        """Fold a numeric state into the buckets of every rollup period."""
+        if state is None:
+            return
+
+        try:
+            value = float(state.state)
+        except ValueError:
+            return
+
+        if math.isnan(value) or math.isinf(value):
+            return
+
+        timestamp = dt_util.as_timestamp(state.last_updated)
+
+        for period in ROLLUP_PERIODS:
+            start = dt_util.utc_from_timestamp(timestamp - timestamp % period)
+            key = (state.entity_id, period)
+
+            bucket = rollups.get(key)
+            if bucket is None and key in self._rollups:
+                bucket = dict(self._rollups[key])
+
+            if bucket is None or bucket['start'] != start:
+                if bucket is not None and bucket['dirty']:
+                    self._write_rollup(session, bucket)
+                bucket = self._load_rollup(session, state, period, start)
+
+            if bucket['count']:
+                bucket['min'] = min(bucket['min'], value)
+                bucket['max'] = max(bucket['max'], value)
+                bucket['mean'] += \
+                    (value - bucket['mean']) / (bucket['count'] + 1)
+            else:
+                bucket['min'] = bucket['max'] = bucket['mean'] = value
+
+            bucket['count'] += 1
+            bucket['last'] = value
+            bucket['dirty'] = True
+            rollups[key] = bucket
+
+    @staticmethod
+    def _load_rollup(session, state, period, start):
+        """Return the stored bucket of a rollup or a new empty one."""
+        from homeassistant.components.recorder.models import StateRollups
+
+        bucket = {
+            'rollup_id': None, 'entity_id': state.entity_id,
+            'domain': state.domain, 'period': period, 'start': start,
+            'min': None, 'max': None, 'mean': None, 'last': None,
+            'count': 0, 'dirty': False,
+        }
+
+        row = session.query(StateRollups).filter_by(
+            entity_id=state.entity_id, period=period, start=start).first()
+
+        if row is not None:
+            bucket.update(rollup_id=row.rollup_id, min=row.min, max=row.max,
+                          mean=row.mean, last=row.last, count=row.count)
+
+        return bucket
+
+    @staticmethod
+    def _write_rollup(session, bucket):
+        """Insert or update the row of a rollup bucket."""
+        from homeassistant.components.recorder.models import StateRollups
+
+        values = {key: bucket[key] for key in (
+            'entity_id', 'domain', 'period', 'start', 'min', 'max', 'mean',
+            'last', 'count')}
+
+        if bucket['rollup_id'] is None:
+            row = StateRollups(**values)
+            session.add(row)
+            session.flush()
+            bucket['rollup_id'] = row.rollup_id
+        else:
+            session.query(StateRollups).filter_by(
+                rollup_id=bucket['rollup_id']).update(
+                    values, synchronize_session=False)
+
+        bucket['dirty'] = False
+
+    def _commit_events(self, events):
+        """Write a batch of events and their states in one transaction."""
+        from homeassistant.components.recorder.models import Events, States
+
+        if not events:
+            return
+
+        new_ids = []
+        rollups = {}  # type: Dict[Tuple[str, int], Dict[str, Any]]
+
+        def _add_events(session):
+            """Add all events of the batch to the session."""
+            new_ids.clear()
+            rollups.clear()
+
+            for event in events:
+                dbevent = Events.from_event(event)
+                session.add(dbevent)
+
+                if event.event_type != EVENT_STATE_CHANGED:
+                    continue
+
+                # Flush to get the event_id, commit happens once per batch
+                session.flush()
+                dbstate = States.from_event(event)
+                dbstate.event_id = dbevent.event_id
+                dbstate.attributes_id = self._shared_attributes_id(
+                    session, dbstate.attributes, new_ids)
+                dbstate.attributes = None
+                session.add(dbstate)
+
+                self._update_rollups(
+                    session, event.data.get('new_state'), rollups)
+
+            for bucket in rollups.values():
+                if bucket['dirty']:
+                    self._write_rollup(session, bucket)
+
+        start = time.monotonic()
+        if self._commit(_add_events):
+            # Only remember attributes that are known to be stored
+            for attributes_id in new_ids:
+                self._attributes_ids[attributes_id] = True
+            while len(self._attributes_ids) > ATTRIBUTES_CACHE_SIZE:
+                self._attributes_ids.popitem(last=False)
+            self._rollups.update(rollups)
+        else:
+            _LOGGER.error("Unable to record %d events", len(events))
+
+        self.last_commit_size = len(events)
+        self.last_commit_latency = time.monotonic() - start
+        _LOGGER.debug("Committed %d events in %.3f seconds, %d queued",
+                      self.last_commit_size, self.last_commit_latency,
+                      self.queue_depth)
+
+        for _ in events:
+            self.queue.task_done()
+
     def _close_run(self):
         """Save end time for current run."""
         self._run.end = dt_util.utcnow()
@@ -299,8 +580,13 @@ class Recorder(threading.Thread):
         self._run = None
 
     def _purge_old_data(self):
-        """Purge events and states older than purge_days ago."""
-        from homeassistant.components.recorder.models import Events, States
+        """Purge events and states older than purge_days ago.
+
+        Runs on the recorder thread, it resets the cache of stored
+        attributes that the commits rely on.
+        """
+        from homeassistant.components.recorder.models import (
+            Events, States, StateAttributes, StateRollups)
 
         if not self.purge_days or self.purge_days < 1:
             _LOGGER.debug("purge_days set to %s, will not purge any old data.",
@@ -327,6 +613,29 @@ class Recorder(threading.Thread):
         if self._commit(_purge_events):
             _LOGGER.info("Purged events created before %s", purge_before)
 
+        def _purge_rollups(session):
+            deleted_rows = session.query(StateRollups) \
+                                  .filter(StateRollups.start < purge_before) \
+                                  .delete(synchronize_session=False)
+            _LOGGER.debug("Deleted %s rollups", deleted_rows)
+
+        if self._commit(_purge_rollups):
+            _LOGGER.info("Purged rollups starting before %s", purge_before)
+
+        def _purge_attributes(session):
+            in_use = session.query(States.attributes_id).filter(
+                States.attributes_id.isnot(None)).distinct()
+            deleted_rows = session.query(StateAttributes) \
+                                  .filter(~StateAttributes.attributes_id
+                                          .in_(in_use)) \
+                                  .delete(synchronize_session=False)
+            _LOGGER.debug("Deleted %s state attributes", deleted_rows)
+
+        if self._commit(_purge_attributes):
+            _LOGGER.info("Purged unused state attributes")
+            # Cached ids may point at purged rows
+            self._attributes_ids = OrderedDict()
+
         Session.expire_all()
 
         # Execute sqlite vacuum command to free up space on disk
@@ -349,6 +658,10 @@ class Recorder(threading.Thread):
                 return True
             except sqlalchemy.exc.OperationalError as e:
                 log_error(e, retry_wait=QUERY_RETRY_WAIT, rollback=True)
+            except Exception as e:  # pylint: disable=broad-except
+                # Keep the recorder thread alive, a retry will not help
+                log_error(e, rollback=True)
+                return False
         return False
 
 
@@ -1,16 +1,18 @@
 """Models for SQLAlchemy."""
 
+import hashlib
 import json
 from datetime import datetime
 import logging
 
-from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Index, Integer,
-                        String, Text, distinct)
+from sqlalchemy import (Boolean, Column, DateTime, Float, ForeignKey, Index,
+                        Integer, String, Text, distinct)
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 
 import homeassistant.util.dt as dt_util
 from homeassistant.core import Event, EventOrigin, State, split_entity_id
-from homeassistant.remote import JSONEncoder
+from homeassistant.remote import JSONEncoder, json_dumps
 
 # SQLAlchemy Schema
 # pylint: disable=invalid-name
@@ -34,7 +36,7 @@ class Events(Base):  # type: ignore
     def from_event(event):
         """Create an event database object from a native event."""
         return Events(event_type=event.event_type,
-                      event_data=json.dumps(event.data, cls=JSONEncoder),
+                      event_data=json_dumps(event.data),
                       origin=str(event.origin),
                       time_fired=event.time_fired)
 
@@ -53,6 +55,39 @@ class Events(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):   # type: ignore
+    """Attributes shared by states, stored once per distinct content."""
+
+    __tablename__ = 'state_attributes'
+    attributes_id = Column(String(40), primary_key=True)
+    shared_attrs = Column(Text)
+    created = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return the content address of an attributes JSON string."""
+        return hashlib.sha1(shared_attrs.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def from_shared_attrs(shared_attrs):
+        """Create a shared attributes object from an attributes JSON string."""
+        return StateAttributes(
+            attributes_id=StateAttributes.hash_shared_attrs(shared_attrs),
+            shared_attrs=shared_attrs)
+
+    def to_native(self):
+        """Return the attributes as a dictionary.
+
+        The decoded dictionary is cached, all states loaded in the same
+        session that share these attributes decode the JSON only once.
+        """
+        native = getattr(self, '_native', None)
+        if native is None:
+            # pylint: disable=attribute-defined-outside-init
+            native = self._native = json.loads(self.shared_attrs)
+        return native
+
+
 class States(Base):   # type: ignore
     """State change history."""
 
@@ -62,6 +97,8 @@ class States(Base):   # type: ignore
     entity_id = Column(String(255))
     state = Column(String(255))
     attributes = Column(Text)
+    attributes_id = Column(
+        String(40), ForeignKey('state_attributes.attributes_id'), index=True)
     event_id = Column(Integer, ForeignKey('events.event_id'))
     last_changed = Column(DateTime(timezone=True), default=datetime.utcnow)
     last_updated = Column(DateTime(timezone=True), default=datetime.utcnow)
@@ -72,6 +109,9 @@ class States(Base):   # type: ignore
                       Index('states__significant_changes',
                             'domain', 'last_updated', 'entity_id'), )
 
+    # Shared attributes are always needed to build the native state
+    state_attributes = relationship(StateAttributes, lazy='joined')
+
     @staticmethod
     def from_event(event):
         """Create object from a state_changed event."""
@@ -91,7 +131,7 @@ class States(Base):   # type: ignore
             dbstate.domain = state.domain
             dbstate.state = state.state
             dbstate.attributes = json.dumps(dict(state.attributes),
-                                            cls=JSONEncoder)
+                                            cls=JSONEncoder, sort_keys=True)
             dbstate.last_changed = state.last_changed
             dbstate.last_updated = state.last_updated
 
@@ -100,9 +140,15 @@ class States(Base):   # type: ignore
     def to_native(self):
         """Convert to an HA state object."""
         try:
+            if self.attributes is not None:
+                attributes = json.loads(self.attributes)
+            elif self.state_attributes is not None:
+                attributes = self.state_attributes.to_native()
+            else:
+                attributes = {}
+
             return State(
-                self.entity_id, self.state,
-                json.loads(self.attributes),
+                self.entity_id, self.state, attributes,
                 _process_timestamp(self.last_changed),
                 _process_timestamp(self.last_updated)
             )
@@ -112,6 +158,38 @@ class States(Base):   # type: ignore
             return None
 
 
+class StateRollups(Base):   # type: ignore
+    """Aggregated numeric states of an entity per time bucket."""
+
+    __tablename__ = 'state_rollups'
+    rollup_id = Column(Integer, primary_key=True)
+    domain = Column(String(64))
+    entity_id = Column(String(255))
+    period = Column(Integer)
+    start = Column(DateTime(timezone=True))
+    min = Column(Float)
+    max = Column(Float)
+    mean = Column(Float)
+    last = Column(Float)
+    count = Column(Integer)
+    created = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+    __table_args__ = (Index('state_rollups__period_start',
+                            'period', 'start', 'entity_id'), )
+
+    def to_native(self):
+        """Convert to an HA state object with the mean as state."""
+        start = _process_timestamp(self.start)
+        return State(
+            self.entity_id, self.mean, {
+                'min': self.min,
+                'max': self.max,
+                'mean': self.mean,
+                'last': self.last,
+                'count': self.count,
+            }, start, start)
+
+
 class RecorderRuns(Base):   # type: ignore
     """Representation of recorder run."""
 
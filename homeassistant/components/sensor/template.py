@@ -16,7 +16,9 @@ from homeassistant.const import (
     ATTR_ENTITY_ID, CONF_SENSORS)
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import (
+    async_track_render_info, async_track_state_change)
+from homeassistant.helpers.template import RenderInfo
 import homeassistant.helpers.config_validation as cv
 
 _LOGGER = logging.getLogger(__name__)
@@ -41,8 +43,7 @@ def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
 
     for device, device_config in config[CONF_SENSORS].items():
         state_template = device_config[CONF_VALUE_TEMPLATE]
-        entity_ids = (device_config.get(ATTR_ENTITY_ID) or
-                      state_template.extract_entities())
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
         friendly_name = device_config.get(ATTR_FRIENDLY_NAME, device)
         unit_of_measurement = device_config.get(ATTR_UNIT_OF_MEASUREMENT)
 
@@ -78,14 +79,22 @@ class SensorTemplate(Entity):
         self._unit_of_measurement = unit_of_measurement
         self._template = state_template
         self._state = None
+        self._track_render_info = entity_ids is None
+        self._render_info = None
+        self._async_unsub_render_info = None
 
         @callback
         def template_sensor_state_listener(entity, old_state, new_state):
             """Called when the target device changes state."""
             hass.async_add_job(self.async_update_ha_state, True)
 
-        async_track_state_change(
-            hass, entity_ids, template_sensor_state_listener)
+        self._state_listener = template_sensor_state_listener
+
+        # Without configured entities the states accessed by the last
+        # render are tracked, see async_update.
+        if entity_ids is not None:
+            async_track_state_change(
+                hass, entity_ids, template_sensor_state_listener)
 
     @property
     def name(self):
@@ -110,8 +119,9 @@ class SensorTemplate(Entity):
     @asyncio.coroutine
     def async_update(self):
         """Update the state from the template."""
+        render_info = RenderInfo()
         try:
-            self._state = self._template.async_render()
+            self._state = self._template.async_render_tracked(render_info)
         except TemplateError as ex:
             if ex.args and ex.args[0].startswith(
                     "UndefinedError: 'None' has no attribute"):
@@ -120,3 +130,17 @@ class SensorTemplate(Entity):
                 return
             self._state = None
             _LOGGER.error(ex)
+        finally:
+            self._async_track_render_info(render_info)
+
+    @callback
+    def _async_track_render_info(self, render_info):
+        """Listen to changes of the states the last render accessed."""
+        if not self._track_render_info or render_info == self._render_info:
+            return
+
+        if self._async_unsub_render_info is not None:
+            self._async_unsub_render_info()
+        self._render_info = render_info
+        self._async_unsub_render_info = async_track_render_info(
+            self.hass, render_info, self._state_listener)
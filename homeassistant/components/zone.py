@@ -10,12 +10,13 @@ import logging
 import voluptuous as vol
 
 from homeassistant.const import (
-    ATTR_HIDDEN, ATTR_LATITUDE, ATTR_LONGITUDE, CONF_NAME, CONF_LATITUDE,
-    CONF_LONGITUDE, CONF_ICON)
+    ATTR_ENTITY_ID, ATTR_HIDDEN, ATTR_LATITUDE, ATTR_LONGITUDE, CONF_NAME,
+    CONF_LATITUDE, CONF_LONGITUDE, CONF_ICON, EVENT_STATE_CHANGED)
+from homeassistant.core import callback, split_entity_id
 from homeassistant.helpers import config_per_platform
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
 from homeassistant.util.async import run_callback_threadsafe
-from homeassistant.util.location import distance
+from homeassistant.util.location import GridIndex, distance
 import homeassistant.helpers.config_validation as cv
 
 _LOGGER = logging.getLogger(__name__)
@@ -31,6 +32,8 @@ DEFAULT_PASSIVE = False
 DEFAULT_RADIUS = 100
 DOMAIN = 'zone'
 
+DATA_ZONE_INDEX = 'zone_index'
+
 ENTITY_ID_FORMAT = 'zone.{}'
 ENTITY_ID_HOME = ENTITY_ID_FORMAT.format('home')
 
@@ -62,15 +65,17 @@ def async_active_zone(hass, latitude, longitude, radius=0):
 
     This method must be run in the event loop.
     """
+    index = _async_zone_index(hass)
+
     # Sort entity IDs so that we are deterministic if equal distance to 2 zones
     zones = (hass.states.get(entity_id) for entity_id
-             in sorted(hass.states.async_entity_ids(DOMAIN)))
+             in sorted(index.candidates(latitude, longitude, radius)))
 
     min_dist = None
     closest = None
 
     for zone in zones:
-        if zone.attributes.get(ATTR_PASSIVE):
+        if zone is None or zone.attributes.get(ATTR_PASSIVE):
             continue
 
         zone_dist = distance(
@@ -90,6 +95,42 @@ def async_active_zone(hass, latitude, longitude, radius=0):
     return closest
 
 
+def _async_zone_index(hass):
+    """Return the index of active zones, kept in sync with their states.
+
+    This method must be run in the event loop.
+    """
+    index = hass.data.get(DATA_ZONE_INDEX)
+    if index is not None:
+        return index
+
+    index = hass.data[DATA_ZONE_INDEX] = GridIndex()
+
+    def index_zone(entity_id, zone):
+        """Add, move or remove a zone in the index."""
+        if zone is None or zone.attributes.get(ATTR_PASSIVE) or \
+                ATTR_LATITUDE not in zone.attributes or \
+                ATTR_LONGITUDE not in zone.attributes:
+            index.remove(entity_id)
+            return
+        index.add(entity_id, zone.attributes[ATTR_LATITUDE],
+                  zone.attributes[ATTR_LONGITUDE],
+                  zone.attributes.get(ATTR_RADIUS))
+
+    @callback
+    def zone_changed(event):
+        """Update the index when a zone changes."""
+        entity_id = event.data.get(ATTR_ENTITY_ID)
+        if entity_id is not None and split_entity_id(entity_id)[0] == DOMAIN:
+            index_zone(entity_id, event.data.get('new_state'))
+
+    for entity_id in hass.states.async_entity_ids(DOMAIN):
+        index_zone(entity_id, hass.states.get(entity_id))
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, zone_changed)
+    return index
+
+
 def in_zone(zone, latitude, longitude, radius=0):
     """Test if given latitude, longitude is in given zone.
 
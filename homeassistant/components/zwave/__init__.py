@@ -208,6 +208,63 @@ def _object_id(value):
     return object_id
 
 
+def discovery_lookup_factory(discovery_components):
+    """Build a lookup of the components to set up for a node value.
+
+    Components are indexed by command class. The components found for a
+    combination of device classes, command class, type and genre are
+    remembered, so the discovery list is only matched once for each
+    combination that shows up on the network.
+    """
+    by_command_class = {}
+    for order, entry in enumerate(discovery_components):
+        for command_class in entry[3]:
+            by_command_class.setdefault(command_class, []).append(
+                (order, entry))
+    match_any = by_command_class.get(None, [])
+    found = {}
+
+    def discovery_lookup(node, value):
+        """Return the components to set up for a value of a node."""
+        key = (node.generic, node.specific, value.command_class, value.type,
+               value.genre)
+
+        components = found.get(key)
+        if components is not None:
+            return components
+
+        generic, specific, command_class, value_type, value_genre = key
+        candidates = match_any
+        if command_class is not None:
+            candidates = sorted(
+                by_command_class.get(command_class, []) + match_any,
+                key=lambda candidate: candidate[0])
+
+        components = []
+        for _, (component, generic_device_class, specific_device_class,
+                _, entry_type, entry_genre) in candidates:
+            if generic not in generic_device_class and \
+               None not in generic_device_class:
+                continue
+            if specific not in specific_device_class and \
+               None not in specific_device_class:
+                continue
+            if entry_type != value_type and entry_type is not None:
+                continue
+            if entry_genre != value_genre and entry_genre is not None:
+                continue
+            components.append(component)
+
+        _LOGGER.debug("Generic=%s Specific=%s Command_class=%s "
+                      "Value type=%s Genre=%s matches %s", generic, specific,
+                      command_class, value_type, value_genre, components)
+
+        components = found[key] = tuple(components)
+        return components
+
+    return discovery_lookup
+
+
 def nice_print_node(node):
     """Print a nice formatted node to the output (debug method)."""
     node_dict = _obj_to_dict(node)
@@ -277,6 +334,7 @@ def setup(hass, config):
     options.lock()
 
     NETWORK = ZWaveNetwork(options, autostart=False)
+    discovery_lookup = discovery_lookup_factory(DISCOVERY_COMPONENTS)
 
     if use_debug:
         def log_all(signal, value=None):
@@ -297,42 +355,7 @@ def setup(hass, config):
 
     def value_added(node, value):
         """Called when a value is added to a node on the network."""
-        for (component,
-             generic_device_class,
-             specific_device_class,
-             command_class,
-             value_type,
-             value_genre) in DISCOVERY_COMPONENTS:
-
-            _LOGGER.debug("Component=%s Node_id=%s query start",
-                          component, node.node_id)
-            if node.generic not in generic_device_class and \
-               None not in generic_device_class:
-                _LOGGER.debug("node.generic %s not None and in "
-                              "generic_device_class %s",
-                              node.generic, generic_device_class)
-                continue
-            if node.specific not in specific_device_class and \
-               None not in specific_device_class:
-                _LOGGER.debug("node.specific %s is not None and in "
-                              "specific_device_class %s", node.specific,
-                              specific_device_class)
-                continue
-            if value.command_class not in command_class and \
-               None not in command_class:
-                _LOGGER.debug("value.command_class %s is not None "
-                              "and in command_class %s",
-                              value.command_class, command_class)
-                continue
-            if value_type != value.type and value_type is not None:
-                _LOGGER.debug("value.type %s != value_type %s",
-                              value.type, value_type)
-                continue
-            if value_genre != value.genre and value_genre is not None:
-                _LOGGER.debug("value.genre %s != value_genre %s",
-                              value.genre, value_genre)
-                continue
-
+        for component in discovery_lookup(node, value):
             # Configure node
             _LOGGER.debug("Adding Node_id=%s Generic_command_class=%s, "
                           "Specific_command_class=%s, "
@@ -13,13 +13,14 @@ import voluptuous as vol
 from homeassistant.const import (
     CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME, CONF_UNIT_SYSTEM,
     CONF_TIME_ZONE, CONF_CUSTOMIZE, CONF_ELEVATION, CONF_UNIT_SYSTEM_METRIC,
-    CONF_UNIT_SYSTEM_IMPERIAL, CONF_TEMPERATURE_UNIT, TEMP_CELSIUS,
-    __version__)
-from homeassistant.core import valid_entity_id
+    CONF_UNIT_SYSTEM_IMPERIAL, CONF_TEMPERATURE_UNIT, CONF_EXECUTOR_POOLS,
+    TEMP_CELSIUS, __version__)
+from homeassistant.core import EXECUTOR_POOLS, valid_entity_id
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.util.yaml import load_yaml
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.entity import set_customize
+from homeassistant.helpers.entity import (
+    set_customize, CUSTOMIZE_THROTTLE_INTERVAL, CUSTOMIZE_THROTTLE_DEADBAND)
 from homeassistant.util import dt as date_util, location as loc_util
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
 
@@ -79,6 +80,9 @@ sensor:
 """
 
 
+_THROTTLE_OPTION = vol.All(vol.Coerce(float), vol.Range(min=0))
+
+
 def _valid_customize(value):
     """Config validator for customize."""
     if not isinstance(value, dict):
@@ -91,6 +95,11 @@ def _valid_customize(value):
         if not isinstance(val, dict):
             raise vol.Invalid('Value of {} is not a dictionary'.format(key))
 
+        for option in (CUSTOMIZE_THROTTLE_INTERVAL,
+                       CUSTOMIZE_THROTTLE_DEADBAND):
+            if option in val:
+                val[option] = _THROTTLE_OPTION(val[option])
+
     return value
 
 
@@ -104,6 +113,9 @@ CORE_CONFIG_SCHEMA = vol.Schema({
     CONF_TIME_ZONE: cv.time_zone,
     vol.Required(CONF_CUSTOMIZE,
                  default=MappingProxyType({})): _valid_customize,
+    vol.Optional(CONF_EXECUTOR_POOLS, default={}): {
+        vol.In(EXECUTOR_POOLS): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    },
 })
 
 
@@ -289,6 +301,9 @@ def async_process_ha_core_config(hass, config):
 
     set_customize(config.get(CONF_CUSTOMIZE) or {})
 
+    for name, max_workers in config[CONF_EXECUTOR_POOLS].items():
+        hass.executors[name].set_max_workers(max_workers)
+
     if CONF_UNIT_SYSTEM in config:
         if config[CONF_UNIT_SYSTEM] == CONF_UNIT_SYSTEM_IMPERIAL:
             hac.units = IMPERIAL_SYSTEM
@@ -86,6 +86,7 @@ CONF_EMAIL = 'email'
 CONF_ENTITY_ID = 'entity_id'
 CONF_ENTITY_NAMESPACE = 'entity_namespace'
 CONF_EVENT = 'event'
+CONF_EXECUTOR_POOLS = 'executor_pools'
 CONF_FILE_PATH = 'file_path'
 CONF_FILENAME = 'filename'
 CONF_FRIENDLY_NAME = 'friendly_name'
@@ -330,9 +331,11 @@ URL_API_STATES = '/api/states'
 URL_API_STATES_ENTITY = '/api/states/{}'
 URL_API_EVENTS = '/api/events'
 URL_API_EVENTS_EVENT = '/api/events/{}'
+URL_API_EVENTS_BULK = '/api/events_bulk'
 URL_API_SERVICES = '/api/services'
 URL_API_SERVICES_SERVICE = '/api/services/{}/{}'
 URL_API_EVENT_FORWARD = '/api/event_forwarding'
+URL_API_EXECUTORS = '/api/executors'
 URL_API_COMPONENTS = '/api/components'
 URL_API_ERROR_LOG = '/api/error_log'
 URL_API_LOG_OUT = '/api/log_out'
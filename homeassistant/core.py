@@ -6,7 +6,6 @@ of entities and react to changes.
 """
 # pylint: disable=unused-import, too-many-lines
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 import enum
 import logging
 import os
@@ -35,6 +34,7 @@ from homeassistant.util.async import (
     run_coroutine_threadsafe, run_callback_threadsafe)
 import homeassistant.util as util
 import homeassistant.util.dt as dt_util
+from homeassistant.util.executor import InstrumentedExecutor
 import homeassistant.util.location as location
 from homeassistant.util.unit_system import UnitSystem, METRIC_SYSTEM  # NOQA
 
@@ -58,6 +58,25 @@ ENTITY_ID_PATTERN = re.compile(r"^(\w+)\.(\w+)$")
 # Size of a executor pool
 EXECUTOR_POOL_SIZE = 15
 
+# Named executor pools
+POOL_DEFAULT = 'default'
+POOL_DEVICE = 'device'
+POOL_DATABASE = 'database'
+POOL_CPU = 'cpu'
+POOL_SETUP = 'setup'
+
+# Default number of workers per executor pool. The default pool runs
+# add_job jobs and platform setups, sync component setups wait on those so
+# they run on the setup pool. Device updates, database queries and CPU bound
+# work like encoding large API responses each have their own pool.
+EXECUTOR_POOLS = {
+    POOL_DEFAULT: 5,
+    POOL_DEVICE: 10,
+    POOL_DATABASE: 4,
+    POOL_CPU: os.cpu_count() or 2,
+    POOL_SETUP: 10,
+}
+
 # Time for cleanup internal pending tasks
 TIME_INTERVAL_TASKS_CLEANUP = 10
 
@@ -109,7 +128,10 @@ class HomeAssistant(object):
         else:
             self.loop = loop or asyncio.get_event_loop()
 
-        self.executor = ThreadPoolExecutor(max_workers=5)
+        self.executors = {
+            name: InstrumentedExecutor(name, max_workers)
+            for name, max_workers in EXECUTOR_POOLS.items()}
+        self.executor = self.executors[POOL_DEFAULT]
         self.loop.set_default_executor(self.executor)
         self.loop.set_exception_handler(self._async_exception_handler)
         self._pending_tasks = []
@@ -296,7 +318,8 @@ class HomeAssistant(object):
         if self._pending_sheduler is not None:
             self._pending_sheduler.cancel()
         yield from self.async_block_till_done()
-        self.executor.shutdown()
+        for executor in self.executors.values():
+            executor.shutdown()
         if self._websession is not None:
             yield from self._websession.close()
         self.state = CoreState.not_running
@@ -394,6 +417,8 @@ class EventBus(object):
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners = {}
+        self._state_listeners = {}
+        self._state_listener_count = 0
         self._hass = hass
 
     @callback
@@ -402,8 +427,15 @@ class EventBus(object):
 
         This method must be run in the event loop.
         """
-        return {key: len(self._listeners[key])
-                for key in self._listeners}
+        listeners = {key: len(self._listeners[key])
+                     for key in self._listeners}
+
+        if self._state_listener_count:
+            listeners[EVENT_STATE_CHANGED] = \
+                listeners.get(EVENT_STATE_CHANGED, 0) + \
+                self._state_listener_count
+
+        return listeners
 
     @property
     def listeners(self):
@@ -434,6 +466,11 @@ class EventBus(object):
         get = self._listeners.get
         listeners = get(MATCH_ALL, []) + get(event_type, [])
 
+        if event_type == EVENT_STATE_CHANGED and self._state_listeners and \
+                event_data:
+            listeners += self._state_listeners.get(
+                event_data.get('entity_id'), [])
+
         event = Event(event_type, event_data, origin)
 
         if event_type != EVENT_TIME_CHANGED:
@@ -481,6 +518,32 @@ class EventBus(object):
 
         return remove_listener
 
+    @callback
+    def async_listen_state_changed(self, entity_ids, listener):
+        """Listen for state changed events of specific entities.
+
+        The listeners are indexed by entity_id, so firing a state change
+        only calls the listeners of that entity and not every state changed
+        listener.
+
+        This method must be run in the event loop.
+        """
+        entity_ids = tuple(set(entity_ids))
+
+        for entity_id in entity_ids:
+            if entity_id in self._state_listeners:
+                self._state_listeners[entity_id].append(listener)
+            else:
+                self._state_listeners[entity_id] = [listener]
+
+        self._state_listener_count += 1
+
+        def remove_listener():
+            """Remove the listener."""
+            self._async_remove_state_listener(entity_ids, listener)
+
+        return remove_listener
+
     def listen_once(self, event_type, listener):
         """Listen once for event of a specific type.
 
@@ -546,6 +609,26 @@ class EventBus(object):
             _LOGGER.warning('Unable to remove unknown listener %s',
                             listener)
 
+    @callback
+    def _async_remove_state_listener(self, entity_ids, listener):
+        """Remove a state changed listener of specific entities.
+
+        This method must be run in the event loop.
+        """
+        try:
+            for entity_id in entity_ids:
+                self._state_listeners[entity_id].remove(listener)
+
+                # delete entity_id list if empty
+                if not self._state_listeners[entity_id]:
+                    self._state_listeners.pop(entity_id)
+        except (KeyError, ValueError):
+            _LOGGER.warning('Unable to remove unknown listener %s',
+                            listener)
+            return
+
+        self._state_listener_count -= 1
+
 
 class State(object):
     """Object to represent a state within the state machine.
@@ -558,7 +641,8 @@ class State(object):
     """
 
     __slots__ = ['entity_id', 'state', 'attributes',
-                 'last_changed', 'last_updated']
+                 'last_changed', 'last_updated', 'domain', 'object_id',
+                 '_json', '_attributes_json']
 
     def __init__(self, entity_id, state, attributes=None, last_changed=None,
                  last_updated=None):
@@ -569,21 +653,16 @@ class State(object):
                 "Format should be <domain>.<object_id>").format(entity_id))
 
         self.entity_id = entity_id.lower()
+        self.domain, self.object_id = split_entity_id(self.entity_id)
         self.state = str(state)
         self.attributes = MappingProxyType(attributes or {})
         self.last_updated = last_updated or dt_util.utcnow()
 
         self.last_changed = last_changed or self.last_updated
 
-    @property
-    def domain(self):
-        """Domain of this state."""
-        return split_entity_id(self.entity_id)[0]
-
-    @property
-    def object_id(self):
-        """Object id of this state."""
-        return split_entity_id(self.entity_id)[1]
+        # JSON text of the state, filled in by homeassistant.remote
+        self._json = None
+        self._attributes_json = None
 
     @property
     def name(self):
@@ -654,6 +733,10 @@ class StateMachine(object):
     def __init__(self, bus, loop):
         """Initialize state machine."""
         self._states = {}
+        # States per domain and the sorted entity ids, rebuilt on demand
+        # after an entity was added or removed.
+        self._domains = {}
+        self._sorted = {}
         self._bus = bus
         self._loop = loop
 
@@ -673,10 +756,7 @@ class StateMachine(object):
         if domain_filter is None:
             return list(self._states.keys())
 
-        domain_filter = domain_filter.lower()
-
-        return [state.entity_id for state in self._states.values()
-                if state.domain == domain_filter]
+        return list(self._domains.get(domain_filter.lower(), ()))
 
     def all(self):
         """Create a list of all states."""
@@ -690,6 +770,26 @@ class StateMachine(object):
         """
         return list(self._states.values())
 
+    @callback
+    def async_sorted(self, domain_filter=None):
+        """Create a list of states sorted by entity_id.
+
+        This method must be run in the event loop.
+        """
+        if domain_filter is None:
+            states = self._states
+        else:
+            domain_filter = domain_filter.lower()
+            states = self._domains.get(domain_filter)
+            if states is None:
+                return []
+
+        entity_ids = self._sorted.get(domain_filter)
+        if entity_ids is None:
+            entity_ids = self._sorted[domain_filter] = sorted(states)
+
+        return [states[entity_id] for entity_id in entity_ids]
+
     def get(self, entity_id):
         """Retrieve state of entity_id or None if not found.
 
@@ -738,6 +838,13 @@ class StateMachine(object):
         if old_state is None:
             return False
 
+        domain_states = self._domains[old_state.domain]
+        del domain_states[entity_id]
+        if not domain_states:
+            del self._domains[old_state.domain]
+        self._sorted.pop(None, None)
+        self._sorted.pop(old_state.domain, None)
+
         event_data = {
             'entity_id': entity_id,
             'old_state': old_state,
@@ -792,6 +899,10 @@ class StateMachine(object):
 
         state = State(entity_id, new_state, attributes, last_changed)
         self._states[entity_id] = state
+        self._domains.setdefault(state.domain, {})[entity_id] = state
+        if not is_existing:
+            self._sorted.pop(None, None)
+            self._sorted.pop(state.domain, None)
 
         event_data = {
             'entity_id': entity_id,
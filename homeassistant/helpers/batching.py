@@ -0,0 +1,206 @@
+"""Helpers to buffer data and write it out in batches from a worker thread."""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.remote import JSONEncoder
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 5
+DEFAULT_MAX_QUEUE = 10000
+
+BACKOFF_MIN = 2
+BACKOFF_MAX = 300
+MAX_SPILL_SIZE = 10 * 1024 * 1024
+
+# Queued by block_till_done to write out what is pending right away
+_FLUSH = object()
+
+
+class BatchWriter(threading.Thread):
+    """Collect items in a bounded queue and write them out in batches.
+
+    ``write_batch`` is called from the worker with a list of items and
+    should raise one of ``retry_exceptions`` when the receiving end could
+    not be reached. Failed batches are appended to ``spill_path`` as JSON
+    lines and written again before the next batch once the receiving end
+    is back. Without a spill file they are held in memory instead, up to
+    ``max_queue`` items.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
+    def __init__(self, hass, name, write_batch, retry_exceptions=(),
+                 batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 max_queue=DEFAULT_MAX_QUEUE, spill_path=None):
+        """Initialize the batch writer."""
+        super().__init__(name=name, daemon=True)
+        self._write_batch = write_batch
+        self._retry_exceptions = tuple(retry_exceptions)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._spill_lock = threading.Lock()
+        self._held = []
+        self._backoff = 0
+        self._retry_at = None
+        self.dropped = 0
+
+        hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, self.shutdown)
+
+    def put(self, item):
+        """Queue an item to be written.
+
+        Never blocks nor touches the disk so it is safe to call from inside
+        the event loop. Items are dropped when the queue is full.
+        """
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            if not self.dropped:
+                _LOGGER.warning('%s: queue is full, dropping items',
+                                self.name)
+            self.dropped += 1
+
+    def shutdown(self, event):
+        """Write out what is pending and stop the worker."""
+        if not self.is_alive():
+            return
+        self.queue.put(None)
+        self.join()
+
+    def block_till_done(self):
+        """Block till all queued items have been handled."""
+        if self.is_alive():
+            self.queue.put(_FLUSH)
+        self.queue.join()
+
+    def run(self):
+        """Collect items and write them out by size or interval."""
+        pending = []
+        taken = 0
+        last_flush = time.monotonic()
+
+        while True:
+            timeout = max(0, last_flush + self.flush_interval -
+                          time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+                taken += 1
+            except queue.Empty:
+                item = _FLUSH
+
+            if item is not None and item is not _FLUSH:
+                pending.append(item)
+                if len(pending) < self.batch_size and \
+                        time.monotonic() - last_flush < self.flush_interval:
+                    continue
+
+            if pending:
+                self._flush(pending)
+                pending = []
+            last_flush = time.monotonic()
+
+            # Only mark items done once written so block_till_done waits
+            # for the write and not just for the hand over.
+            for _ in range(taken):
+                self.queue.task_done()
+            taken = 0
+
+            if item is None:
+                return
+
+    def _flush(self, batch):
+        """Write a batch, spilling it if the receiving end is unreachable."""
+        if self._retry_at is not None and time.monotonic() < self._retry_at:
+            self._spill(batch)
+            return
+
+        try:
+            self._replay_spill()
+            self._write_batch(batch)
+        except self._retry_exceptions as err:
+            self._backoff = min(max(self._backoff * 2, BACKOFF_MIN),
+                                BACKOFF_MAX)
+            self._retry_at = time.monotonic() + self._backoff
+            _LOGGER.error('%s: unable to write %d items, retrying in %ds: %s',
+                          self.name, len(batch), self._backoff, err)
+            self._spill(batch)
+        except Exception:  # pylint: disable=broad-except
+            # Keep the worker alive, a batch that fails this way will not
+            # do any better on the next attempt.
+            _LOGGER.exception('%s: error writing %d items',
+                              self.name, len(batch))
+        else:
+            self._backoff = 0
+            self._retry_at = None
+
+    def _spill(self, items):
+        """Append items to the spill file or hold them without one."""
+        if self.spill_path is None:
+            room = self.queue.maxsize - len(self._held)
+            if len(items) > room:
+                _LOGGER.warning('%s: too many items waiting to be written, '
+                                'dropping %d items', self.name,
+                                len(items) - room)
+                self.dropped += len(items) - room
+                items = items[:room]
+            self._held.extend(items)
+            return
+
+        with self._spill_lock:
+            try:
+                if os.path.isfile(self.spill_path) and \
+                        os.path.getsize(self.spill_path) >= MAX_SPILL_SIZE:
+                    _LOGGER.warning('%s: spill file %s is full, dropping %d '
+                                    'items', self.name, self.spill_path,
+                                    len(items))
+                    self.dropped += len(items)
+                    return
+
+                with open(self.spill_path, 'a') as spill:
+                    for item in items:
+                        spill.write(json.dumps(item, cls=JSONEncoder))
+                        spill.write('\n')
+            except (OSError, TypeError, ValueError):
+                _LOGGER.exception('%s: unable to spill %d items to %s',
+                                  self.name, len(items), self.spill_path)
+                self.dropped += len(items)
+
+    def _replay_spill(self):
+        """Write out the spilled or held items in batches.
+
+        Items that could not be written are spilled or held again.
+        """
+        if self.spill_path is None:
+            items, self._held = self._held, []
+            if not items:
+                return
+        else:
+            with self._spill_lock:
+                if not os.path.isfile(self.spill_path):
+                    return
+                with open(self.spill_path) as spill:
+                    items = [json.loads(line) for line in spill
+                             if line.strip()]
+                os.remove(self.spill_path)
+
+        _LOGGER.info('%s: writing %d spilled items', self.name, len(items))
+
+        for start in range(0, len(items), self.batch_size):
+            batch = items[start:start + self.batch_size]
+            try:
+                self._write_batch(batch)
+            except self._retry_exceptions:
+                self._spill(items[start:])
+                raise
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception('%s: error writing %d spilled items',
+                                  self.name, len(batch))
@@ -2,6 +2,7 @@
 import asyncio
 import logging
 import functools as ft
+from datetime import timedelta
 from timeit import default_timer as timer
 
 from typing import Any, Optional, List, Dict
@@ -11,15 +12,25 @@ from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT, DEVICE_DEFAULT_NAME, STATE_OFF, STATE_ON,
     STATE_UNAVAILABLE, STATE_UNKNOWN, TEMP_CELSIUS, TEMP_FAHRENHEIT,
     ATTR_ENTITY_PICTURE)
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, POOL_DEVICE, callback
 from homeassistant.exceptions import NoEntitySpecifiedError
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.util import ensure_unique_string, slugify
+import homeassistant.util.dt as dt_util
 from homeassistant.util.async import (
     run_coroutine_threadsafe, run_callback_threadsafe)
 
 # Entity attributes that we will overwrite
 _OVERWRITE = {}  # type: Dict[str, Any]
 
+# Customize options that coalesce the state writes of an entity. They are
+# not added to the state attributes.
+CUSTOMIZE_THROTTLE_INTERVAL = 'throttle_interval'
+CUSTOMIZE_THROTTLE_DEADBAND = 'throttle_deadband'
+
+# Seconds after which a change held back by the deadband is written anyway
+DEADBAND_FLUSH_INTERVAL = 60
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -79,6 +90,9 @@ class Entity(object):
     # Owning hass instance. Will be set by EntityComponent
     hass = None  # type: Optional[HomeAssistant]
 
+    # Coalesces state writes when throttling is customized
+    _throttle = None
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -87,6 +101,11 @@ class Entity(object):
         """
         return True
 
+    @property
+    def scan_interval(self) -> Optional[int]:
+        """Return the seconds between polls, None for the platform default."""
+        return None
+
     @property
     def unique_id(self) -> str:
         """Return an unique ID."""
@@ -208,9 +227,10 @@ class Entity(object):
                 # pylint: disable=no-member
                 yield from self.async_update()
             else:
-                # PS: Run this in our own thread pool once we have
-                #     future support?
-                yield from self.hass.loop.run_in_executor(None, self.update)
+                # Device I/O gets its own pool so slow devices do not
+                # starve the rest of the executor jobs.
+                yield from self.hass.loop.run_in_executor(
+                    self.hass.executors[POOL_DEVICE], self.update)
 
         start = timer()
 
@@ -251,6 +271,8 @@ class Entity(object):
 
         # Overwrite properties that have been set in the config file.
         attr.update(_OVERWRITE.get(self.entity_id, {}))
+        interval = attr.pop(CUSTOMIZE_THROTTLE_INTERVAL, None)
+        deadband = attr.pop(CUSTOMIZE_THROTTLE_DEADBAND, None)
 
         # Remove hidden property if false so it won't show up.
         if not attr.get(ATTR_HIDDEN, True):
@@ -267,8 +289,15 @@ class Entity(object):
             # Could not convert state to float
             pass
 
-        self.hass.states.async_set(
-            self.entity_id, state, attr, self.force_update)
+        if self._throttle is None:
+            if not interval and not deadband:
+                self.hass.states.async_set(
+                    self.entity_id, state, attr, self.force_update)
+                return
+            self._throttle = _StateThrottle(self)
+
+        self._throttle.async_write(
+            state, attr, self.force_update, interval, deadband)
 
     def schedule_update_ha_state(self, force_refresh=False):
         """Shedule a update ha state change task.
@@ -294,6 +323,8 @@ class Entity(object):
 
         This method must be run in the event loop.
         """
+        if self._throttle is not None:
+            self._throttle.async_cancel()
         self.hass.states.async_remove(self.entity_id)
 
     def _attr_setter(self, name, typ, attr, attrs):
@@ -321,6 +352,106 @@ class Entity(object):
         return "<Entity {}: {}>".format(self.name, self.state)
 
 
+class _StateThrottle(object):
+    """Coalesce the state writes of a rapidly updating entity.
+
+    Writes less than the throttle interval apart and numeric changes within
+    the deadband are held back. The last value held back is written once
+    the interval has passed so the final state is never lost.
+    """
+
+    def __init__(self, entity):
+        """Initialize the throttle."""
+        self.entity = entity
+        self.written = None
+        self.written_at = None
+        self.pending = None
+        self._flush_at = None
+        self._async_unsub_flush = None
+
+    @callback
+    def async_write(self, state, attr, force_update, interval, deadband):
+        """Write the state now or hold it back till the next flush."""
+        now = dt_util.utcnow()
+
+        if not interval and not deadband:
+            self._async_set(state, attr, force_update, now)
+            return
+
+        if (state, attr) == self.written:
+            # Back at what was written last, nothing left to flush
+            self.pending = None
+            return
+
+        if self.written_at is not None:
+            interval = timedelta(seconds=interval or 0)
+            flush_at = None
+
+            if now - self.written_at < interval:
+                flush_at = self.written_at + interval
+            elif self._within_deadband(state, attr, deadband):
+                flush_at = self.written_at + max(
+                    interval, timedelta(seconds=DEADBAND_FLUSH_INTERVAL))
+
+            if flush_at is not None:
+                self.pending = (state, attr, force_update)
+                self._async_schedule_flush(flush_at)
+                return
+
+        self._async_set(state, attr, force_update, now)
+
+    @callback
+    def async_cancel(self):
+        """Drop the held back state and stop the flush."""
+        self.pending = None
+        if self._async_unsub_flush is not None:
+            self._async_unsub_flush()
+            self._async_unsub_flush = None
+            self._flush_at = None
+
+    def _within_deadband(self, state, attr, deadband):
+        """Return if a numeric state changed less than the deadband."""
+        if not deadband or attr != self.written[1]:
+            return False
+
+        try:
+            return abs(float(state) - float(self.written[0])) < deadband
+        except ValueError:
+            return False
+
+    @callback
+    def _async_schedule_flush(self, flush_at):
+        """Make sure the held back state is written at flush_at."""
+        if self._flush_at is not None and self._flush_at <= flush_at:
+            return
+
+        if self._async_unsub_flush is not None:
+            self._async_unsub_flush()
+
+        self._flush_at = flush_at
+        self._async_unsub_flush = async_track_point_in_utc_time(
+            self.entity.hass, self._async_flush, flush_at)
+
+    @callback
+    def _async_flush(self, now):
+        """Write the state that was held back."""
+        self._async_unsub_flush = None
+        self._flush_at = None
+
+        if self.pending is not None:
+            state, attr, force_update = self.pending
+            self._async_set(state, attr, force_update, now)
+
+    @callback
+    def _async_set(self, state, attr, force_update, now):
+        """Write the state to the state machine."""
+        self.async_cancel()
+        self.written = (state, attr)
+        self.written_at = now
+        self.entity.hass.states.async_set(
+            self.entity.entity_id, state, attr, force_update)
+
+
 class ToggleEntity(Entity):
     """An abstract class for entities that can be turned on and off."""
 
@@ -1,5 +1,8 @@
 """Helpers for components that manage entities."""
 import asyncio
+from datetime import timedelta
+import random
+from timeit import default_timer as timer
 
 from homeassistant import config as conf_util
 from homeassistant.bootstrap import (
@@ -12,13 +15,19 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.loader import get_component
 from homeassistant.helpers import config_per_platform, discovery
 from homeassistant.helpers.entity import async_generate_entity_id
-from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.service import extract_entity_ids
 from homeassistant.util.async import (
     run_callback_threadsafe, run_coroutine_threadsafe)
+import homeassistant.util.dt as dt_util
 
 DEFAULT_SCAN_INTERVAL = 15
 
+# Slow or unavailable entities are polled up to this many times less often
+MAX_POLL_BACKOFF = 8
+# Updates that take longer than this part of the scan interval are slow
+SLOW_POLL_RATIO = 0.5
+
 
 class EntityComponent(object):
     """Helper class that will help a component manage its entities."""
@@ -289,8 +298,12 @@ class EntityPlatform(object):
         self.scan_interval = scan_interval
         self.entity_namespace = entity_namespace
         self.platform_entities = []
-        self._async_unsub_polling = None
-        self._process_updates = False
+        # Keyed by entity_id, entities are not hashable
+        self._async_unsub_polls = {}
+        self._poll_backoff = {}
+        # Sync entities of a platform often share a client that is not
+        # thread safe, their updates run one after another.
+        self._sync_update_lock = asyncio.Lock(loop=component.hass.loop)
 
     def add_entities(self, new_entities, update_before_add=False):
         """Add entities for a single platform."""
@@ -319,14 +332,13 @@ class EntityPlatform(object):
         yield from asyncio.wait(tasks, loop=self.component.hass.loop)
         yield from self.component.async_update_group()
 
-        if self._async_unsub_polling is not None or \
-           not any(entity.should_poll for entity
-                   in self.platform_entities):
-            return
-
-        self._async_unsub_polling = async_track_utc_time_change(
-            self.component.hass, self._update_entity_states,
-            second=range(0, 60, self.scan_interval))
+        # Spread the first polls over the interval so entities and
+        # platforms with the same interval do not all update at once.
+        for entity in self.platform_entities:
+            if entity.should_poll and \
+                    entity.entity_id not in self._async_unsub_polls:
+                self._async_schedule_poll(
+                    entity, random.uniform(0, self._poll_interval(entity)))
 
     @asyncio.coroutine
     def _async_process_entity(self, new_entity, update_before_add):
@@ -350,42 +362,77 @@ class EntityPlatform(object):
 
         yield from asyncio.wait(tasks, loop=self.component.hass.loop)
 
-        if self._async_unsub_polling is not None:
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
+        for async_unsub_poll in self._async_unsub_polls.values():
+            async_unsub_poll()
+        self._async_unsub_polls.clear()
+        self._poll_backoff.clear()
+
+    def _poll_interval(self, entity):
+        """Return the seconds between polls of an entity."""
+        return entity.scan_interval or self.scan_interval
+
+    @callback
+    def _async_schedule_poll(self, entity, delay, now=None):
+        """Schedule the next poll of an entity.
+
+        This method must be run in the event loop.
+        """
+        @callback
+        def async_poll(now):
+            """Start the update of the entity."""
+            self.component.hass.async_add_job(
+                self._async_poll_entity(entity, now))
+
+        async_unsub_poll = async_track_point_in_utc_time(
+            self.component.hass, async_poll,
+            (now or dt_util.utcnow()) + timedelta(seconds=delay))
+        self._async_unsub_polls[entity.entity_id] = async_unsub_poll
 
     @asyncio.coroutine
-    def _update_entity_states(self, now):
-        """Update the states of all the polling entities.
+    def _async_poll_entity(self, entity, now):
+        """Update an entity and schedule its next poll.
 
-        To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
+        Entities that fail, are unavailable or take longer than half their
+        interval to update are polled less often, up to MAX_POLL_BACKOFF
+        times their interval. Async entities update in parallel, sync
+        entities of the platform one at a time.
 
         This method must be run in the event loop.
         """
-        if self._process_updates:
-            return
-        self._process_updates = True
+        interval = self._poll_interval(entity)
+        backoff = self._poll_backoff.get(entity.entity_id, 1)
 
+        if entity.should_poll:
+            if hasattr(entity, 'async_update'):
+                failed, duration = yield from self._async_update_entity(entity)
+            else:
+                with (yield from self._sync_update_lock):
+                    failed, duration = \
+                        yield from self._async_update_entity(entity)
+
+            if failed or duration > interval * SLOW_POLL_RATIO:
+                backoff = min(backoff * 2, MAX_POLL_BACKOFF)
+            else:
+                backoff = 1
+            self._poll_backoff[entity.entity_id] = backoff
+
+        # The platform was reset while updating
+        if entity.entity_id in self._async_unsub_polls:
+            self._async_schedule_poll(entity, interval * backoff, now)
+
+    @asyncio.coroutine
+    def _async_update_entity(self, entity):
+        """Update an entity, return if it failed and how long it took.
+
+        This method must be run in the event loop.
+        """
+        start = timer()
         try:
-            tasks = []
-            to_update = []
-
-            for entity in self.platform_entities:
-                if not entity.should_poll:
-                    continue
-
-                update_coro = entity.async_update_ha_state(True)
-                if hasattr(entity, 'async_update'):
-                    tasks.append(
-                        self.component.hass.loop.create_task(update_coro))
-                else:
-                    to_update.append(update_coro)
-
-            for update_coro in to_update:
-                yield from update_coro
-
-            if tasks:
-                yield from asyncio.wait(tasks, loop=self.component.hass.loop)
-        finally:
-            self._process_updates = False
+            yield from entity.async_update_ha_state(True)
+            failed = not entity.available
+        except Exception:  # pylint: disable=broad-except
+            self.component.logger.exception(
+                'Error while updating %s', entity.entity_id)
+            failed = True
+
+        return failed, timer() - start
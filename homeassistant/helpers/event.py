@@ -1,5 +1,7 @@
 """Helpers for listening to events."""
 import functools as ft
+import heapq
+import itertools
 from datetime import timedelta
 
 from ..core import HomeAssistant, callback
@@ -8,6 +10,11 @@ from ..const import (
 from ..util import dt as dt_util
 from ..util.async import run_callback_threadsafe
 
+DATA_TIME_TRACKER = 'event_helper_time_tracker'
+
+# Cancelled points in time that may linger in the heap before compacting it
+MIN_CANCELLED_COMPACT = 100
+
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
 
@@ -59,10 +66,6 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
     @callback
     def state_change_listener(event):
         """The listener that listens for specific state changes."""
-        if entity_ids != MATCH_ALL and \
-           event.data.get('entity_id') not in entity_ids:
-            return
-
         if event.data.get('old_state') is not None:
             old_state = event.data['old_state'].state
         else:
@@ -78,12 +81,45 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
                                event.data.get('old_state'),
                                event.data.get('new_state'))
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+    if entity_ids == MATCH_ALL:
+        return hass.bus.async_listen(
+            EVENT_STATE_CHANGED, state_change_listener)
+
+    return hass.bus.async_listen_state_changed(
+        entity_ids, state_change_listener)
 
 
 track_state_change = threaded_listener_factory(async_track_state_change)
 
 
+@callback
+def async_track_render_info(hass, render_info, action):
+    """Track state changes of the states a template accessed.
+
+    render_info is a template.RenderInfo filled by async_render_tracked.
+    Entities are tracked through the entity index of the bus, domains and
+    iterating all states need a listener on every state change.
+
+    Returns a function that can be called to remove the listener.
+
+    Must be run within the event loop.
+    """
+    if not render_info.all_states and not render_info.domains:
+        return async_track_state_change(
+            hass, render_info.entities, action)
+
+    @callback
+    def state_change_listener(event):
+        """Pass on state changes the template depends on."""
+        entity_id = event.data.get('entity_id')
+        if render_info.matches(entity_id):
+            hass.async_run_job(action, entity_id,
+                               event.data.get('old_state'),
+                               event.data.get('new_state'))
+
+    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+
+
 def async_track_point_in_time(hass, action, point_in_time):
     """Add a listener that fires once after a spefic point in time."""
     utc_point_in_time = dt_util.as_utc(point_in_time)
@@ -105,28 +141,8 @@ def async_track_point_in_utc_time(hass, action, point_in_time):
     # Ensure point_in_time is UTC
     point_in_time = dt_util.as_utc(point_in_time)
 
-    @callback
-    def point_in_time_listener(event):
-        """Listen for matching time_changed events."""
-        now = event.data[ATTR_NOW]
-
-        if now < point_in_time or hasattr(point_in_time_listener, 'run'):
-            return
-
-        # Set variable so that we will never run twice.
-        # Because the event bus might have to wait till a thread comes
-        # available to execute this listener it might occur that the
-        # listener gets lined up twice to be executed. This will make
-        # sure the second time it does nothing.
-        point_in_time_listener.run = True
-        async_unsub()
-
-        hass.async_run_job(action, now)
-
-    async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED,
-                                        point_in_time_listener)
-
-    return async_unsub
+    return _async_get_time_tracker(hass).async_add_point_in_time(
+        action, point_in_time)
 
 
 track_point_in_utc_time = threaded_listener_factory(
@@ -222,10 +238,8 @@ def async_track_utc_time_change(hass, action, year=None, month=None, day=None,
     hour, minute, second = pmp(hour), pmp(minute), pmp(second)
 
     @callback
-    def pattern_time_change_listener(event):
+    def pattern_time_change_listener(now):
         """Listen for matching time_changed events."""
-        now = event.data[ATTR_NOW]
-
         if local:
             now = dt_util.as_local(now)
         mat = _matcher
@@ -240,8 +254,8 @@ def async_track_utc_time_change(hass, action, year=None, month=None, day=None,
 
             hass.async_run_job(action, now)
 
-    return hass.bus.async_listen(EVENT_TIME_CHANGED,
-                                 pattern_time_change_listener)
+    return _async_get_time_tracker(hass).async_add_time_pattern(
+        second, pattern_time_change_listener)
 
 
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
@@ -257,6 +271,126 @@ def async_track_time_change(hass, action, year=None, month=None, day=None,
 track_time_change = threaded_listener_factory(async_track_time_change)
 
 
+@callback
+def _async_get_time_tracker(hass):
+    """Return the time tracker of hass, create it if needed."""
+    tracker = hass.data.get(DATA_TIME_TRACKER)
+
+    if tracker is None:
+        tracker = hass.data[DATA_TIME_TRACKER] = _TimeTracker(hass)
+
+    return tracker
+
+
+class _TimeTracker(object):
+    """Dispatch time changed events to the time listeners that are due.
+
+    Points in time are kept in a heap, so a time changed event only looks
+    at the points that have passed. Time pattern listeners are indexed by
+    the seconds they match, so only the listeners that can match the
+    current second are checked. Time changed events stay the clock of
+    the tracker, firing one moves all time helpers forward.
+    """
+
+    def __init__(self, hass):
+        """Initialize the time tracker."""
+        self._hass = hass
+        self._points = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._by_second = {}
+        self._any_second = []
+
+        hass.bus.async_listen(EVENT_TIME_CHANGED, self._async_time_changed)
+
+    @callback
+    def async_add_point_in_time(self, action, point_in_time):
+        """Run action once the time passed point_in_time.
+
+        Returns a function to cancel the action.
+        """
+        entry = [point_in_time, next(self._counter), action]
+        heapq.heappush(self._points, entry)
+
+        @callback
+        def cancel():
+            """Cancel the action if it did not run yet."""
+            if entry[2] is None:
+                return
+            entry[2] = None
+            self._cancelled += 1
+
+            if self._cancelled > MIN_CANCELLED_COMPACT and \
+               self._cancelled > len(self._points) // 2:
+                self._points = [item for item in self._points
+                                if item[2] is not None]
+                heapq.heapify(self._points)
+                self._cancelled = 0
+
+        return cancel
+
+    @callback
+    def async_add_time_pattern(self, second, listener):
+        """Call listener with the time on the matching seconds.
+
+        Returns a function to remove the listener.
+        """
+        if isinstance(second, tuple):
+            keys = set(second)
+            for key in keys:
+                self._by_second.setdefault(key, []).append(listener)
+        else:
+            keys = None
+            self._any_second.append(listener)
+
+        @callback
+        def remove():
+            """Remove the listener."""
+            try:
+                if keys is None:
+                    self._any_second.remove(listener)
+                    return
+                for key in keys:
+                    self._by_second[key].remove(listener)
+                    if not self._by_second[key]:
+                        self._by_second.pop(key)
+            except (KeyError, ValueError):
+                # Listener was already removed
+                pass
+
+        return remove
+
+    @callback
+    def _async_time_changed(self, event):
+        """Run the points in time that passed and the matching patterns."""
+        now = event.data[ATTR_NOW]
+        last = next(self._counter)
+        added = []
+
+        # Actions may cancel other points in time and compact the heap
+        while self._points and self._points[0][0] <= now:
+            entry = heapq.heappop(self._points)
+            action = entry[2]
+            if action is None:
+                self._cancelled -= 1
+                continue
+            if entry[1] > last:
+                # Added by an action, it runs on the next time changed event
+                # like a listener added while an event is being fired.
+                added.append(entry)
+                continue
+            entry[2] = None
+            self._hass.async_run_job(action, now)
+
+        for entry in added:
+            if entry[2] is not None:
+                heapq.heappush(self._points, entry)
+
+        for listener in self._by_second.get(now.second, []) + \
+                self._any_second:
+            listener(now)
+
+
 def _process_state_match(parameter):
     """Wrap parameter in a tuple if it is not one and returns it."""
     if parameter is None or parameter == MATCH_ALL:
@@ -23,14 +23,31 @@ def closest(latitude: float, longitude: float,
 
     Async friendly.
     """
-    with_location = [state for state in states if has_location(state)]
-
-    if not with_location:
-        return None
-
-    return min(
-        with_location,
-        key=lambda state: loc_util.distance(
-            latitude, longitude, state.attributes.get(ATTR_LATITUDE),
-            state.attributes.get(ATTR_LONGITUDE))
-    )
+    # Calculate the exact distance in order of the cheap lower bound, stop
+    # once no state that is left can be closer.
+    candidates = sorted(
+        (loc_util.distance_lower_bound(
+            latitude, longitude, state.attributes[ATTR_LATITUDE],
+            state.attributes[ATTR_LONGITUDE]), order, state)
+        for order, state in enumerate(states) if has_location(state))
+
+    closest_state = None
+    closest_order = None
+    closest_dist = None
+
+    for lower_bound, order, state in candidates:
+        if closest_dist is not None and lower_bound > closest_dist:
+            break
+
+        dist = loc_util.distance(
+            latitude, longitude, state.attributes[ATTR_LATITUDE],
+            state.attributes[ATTR_LONGITUDE])
+
+        # Ties go to the state that came first, like min() does
+        if closest_dist is None or dist < closest_dist or \
+                (dist == closest_dist and order < closest_order):
+            closest_state = state
+            closest_order = order
+            closest_dist = dist
+
+    return closest_state
@@ -1,15 +1,18 @@
 """Template helper methods for rendering strings with HA data."""
+from collections import OrderedDict
 from datetime import datetime
 import json
 import logging
 import re
+import threading
 
 import jinja2
+from jinja2 import meta, nodes
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 
 from homeassistant.const import (
     STATE_UNKNOWN, ATTR_LATITUDE, ATTR_LONGITUDE, MATCH_ALL)
-from homeassistant.core import State
+from homeassistant.core import State, split_entity_id
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import location as loc_helper
 from homeassistant.loader import get_component
@@ -20,6 +23,40 @@ _LOGGER = logging.getLogger(__name__)
 _SENTINEL = object()
 DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+DATA_RENDER_INFO = 'template_render_info'
+DATA_TEMPLATE_GLOBALS = 'template_globals'
+
+# Number of compiled templates and render results to keep
+COMPILE_CACHE_SIZE = 1024
+RENDER_CACHE_SIZE = 1024
+
+# Templates only using these render the same for the same value. Anything
+# else, like the random filter or the local time zone, may not.
+_PURE_VARIABLES = frozenset(
+    ('value', 'value_json', 'float', 'as_timestamp', 'strptime', 'range',
+     'dict'))
+_PURE_FILTERS = frozenset((
+    'abs', 'attr', 'batch', 'capitalize', 'center', 'count', 'd', 'default',
+    'dictsort', 'e', 'escape', 'filesizeformat', 'first', 'float',
+    'forceescape', 'format', 'groupby', 'indent', 'int', 'join', 'last',
+    'length', 'list', 'lower', 'map', 'max', 'min', 'pprint', 'reject',
+    'rejectattr', 'replace', 'reverse', 'round', 'safe', 'select',
+    'selectattr', 'slice', 'sort', 'string', 'striptags', 'sum', 'title',
+    'tojson', 'trim', 'truncate', 'unique', 'upper', 'urlencode', 'urlize',
+    'wordcount', 'wordwrap', 'xmlattr', 'multiply', 'timestamp_utc',
+    'is_defined'))
+
+# Templates are rendered from the event loop and from executor threads
+_CACHE_LOCK = threading.Lock()
+_COMPILE_CACHE = OrderedDict()
+_RENDER_CACHE = OrderedDict()
+CACHE_STATS = {
+    'compile_hits': 0,
+    'compile_misses': 0,
+    'render_hits': 0,
+    'render_misses': 0,
+}
+
 _RE_NONE_ENTITIES = re.compile(r"distance\(|closest\(", re.I | re.M)
 _RE_GET_ENTITIES = re.compile(
     r"(?:(?:states\.|(?:is_state|is_state_attr|states)\(.)([\w]+\.[\w]+))",
@@ -50,6 +87,129 @@ def extract_entities(template):
     return MATCH_ALL
 
 
+def cache_stats():
+    """Return the hit and miss counters of the template caches."""
+    return dict(CACHE_STATS)
+
+
+def _compile(template):
+    """Compile template source, sharing the code between templates.
+
+    Returns the code and if the template only depends on the value it is
+    rendered with.
+    """
+    with _CACHE_LOCK:
+        try:
+            code, pure = _COMPILE_CACHE[template]
+        except KeyError:
+            CACHE_STATS['compile_misses'] += 1
+        else:
+            CACHE_STATS['compile_hits'] += 1
+            _COMPILE_CACHE.move_to_end(template)
+            return code, pure
+
+    try:
+        source = ENV.parse(template)
+        code = ENV.compile(source)
+    except jinja2.exceptions.TemplateSyntaxError as err:
+        raise TemplateError(err)
+
+    pure = _is_pure(source)
+
+    with _CACHE_LOCK:
+        _COMPILE_CACHE[template] = code, pure
+        if len(_COMPILE_CACHE) > COMPILE_CACHE_SIZE:
+            _COMPILE_CACHE.popitem(last=False)
+
+    return code, pure
+
+
+def _is_pure(source):
+    """Return if a parsed template only uses pure variables and filters."""
+    names = meta.find_undeclared_variables(source)
+    # Newer versions of Jinja do not count globals as undeclared
+    names.update(node.name for node in source.find_all(nodes.Name)
+                 if node.name in ENV.globals)
+    if not names <= _PURE_VARIABLES:
+        return False
+
+    for node in source.find_all(nodes.Filter):
+        if node.name not in _PURE_FILTERS:
+            return False
+
+        # Map applies the filter it is given by name to every item
+        if node.name == 'map' and node.args and (
+                not isinstance(node.args[0], nodes.Const) or
+                node.args[0].value not in _PURE_FILTERS):
+            return False
+
+    return True
+
+
+def _hass_globals(hass):
+    """Return the template globals bound to a hass instance."""
+    global_vars = hass.data.get(DATA_TEMPLATE_GLOBALS)
+    if global_vars is not None:
+        return global_vars
+
+    location_methods = LocationMethods(hass)
+
+    def is_state(entity_id, state):
+        """Test if entity exists and is specified state."""
+        _record_access(hass, entity_id)
+        return hass.states.is_state(entity_id, state)
+
+    def is_state_attr(entity_id, name, value):
+        """Test if entity exists and has a state attribute set to value."""
+        _record_access(hass, entity_id)
+        return hass.states.is_state_attr(entity_id, name, value)
+
+    global_vars = hass.data[DATA_TEMPLATE_GLOBALS] = ENV.make_globals({
+        'closest': location_methods.closest,
+        'distance': location_methods.distance,
+        'is_state': is_state,
+        'is_state_attr': is_state_attr,
+        'states': AllStates(hass),
+    })
+
+    return global_vars
+
+
+def _record_access(hass, entity_id=None, domain=None, all_states=False):
+    """Record access to states during Template.async_render_tracked."""
+    render_info = hass.data.get(DATA_RENDER_INFO)
+    if render_info is None:
+        return
+    if entity_id is not None:
+        render_info.entities.add(entity_id.lower())
+    if domain is not None:
+        render_info.domains.add(domain.lower())
+    if all_states:
+        render_info.all_states = True
+
+
+class RenderInfo(object):
+    """Hold the states a template accessed while it was rendered."""
+
+    def __init__(self):
+        """Initialize the render info."""
+        self.all_states = False
+        self.domains = set()
+        self.entities = set()
+
+    def matches(self, entity_id):
+        """Return if a change of entity_id can change the render result."""
+        return (self.all_states or entity_id in self.entities or
+                split_entity_id(entity_id)[0] in self.domains)
+
+    def __eq__(self, other):
+        """Compare the accessed states with another render info."""
+        return (self.__class__ == other.__class__ and
+                self.all_states == other.all_states and
+                self.domains == other.domains and
+                self.entities == other.entities)
+
+
 class Template(object):
     """Class to hold a template and manage caching and rendering."""
 
@@ -60,6 +220,7 @@ class Template(object):
 
         self.template = template
         self._compiled_code = None
+        self._pure = False
         self._compiled = None
         self.hass = hass
 
@@ -68,10 +229,7 @@ class Template(object):
         if self._compiled_code is not None:
             return
 
-        try:
-            self._compiled_code = ENV.compile(self.template)
-        except jinja2.exceptions.TemplateSyntaxError as err:
-            raise TemplateError(err)
+        self._compiled_code, self._pure = _compile(self.template)
 
     def extract_entities(self):
         """Extract all entities for state_changed listener."""
@@ -100,6 +258,22 @@ class Template(object):
         except jinja2.TemplateError as err:
             raise TemplateError(err)
 
+    def async_render_tracked(self, render_info, variables=None, **kwargs):
+        """Render given template and record the states it accessed.
+
+        The entities and domains are added to render_info, also when the
+        rendering fails.
+
+        This method must be run in the event loop.
+        """
+        self._ensure_compiled()
+        previous = self.hass.data.get(DATA_RENDER_INFO)
+        self.hass.data[DATA_RENDER_INFO] = render_info
+        try:
+            return self.async_render(variables, **kwargs)
+        finally:
+            self.hass.data[DATA_RENDER_INFO] = previous
+
     def render_with_possible_json_value(self, value, error_value=_SENTINEL):
         """Render template with value exposed.
 
@@ -120,6 +294,23 @@ class Template(object):
         """
         self._ensure_compiled()
 
+        # Templates that only use the value render the same every time
+        cache_key = None
+        if self._pure:
+            cache_key = (self.template, value)
+            with _CACHE_LOCK:
+                try:
+                    result = _RENDER_CACHE[cache_key]
+                except KeyError:
+                    CACHE_STATS['render_misses'] += 1
+                except TypeError:
+                    # Value can not be hashed
+                    cache_key = None
+                else:
+                    CACHE_STATS['render_hits'] += 1
+                    _RENDER_CACHE.move_to_end(cache_key)
+                    return result
+
         variables = {
             'value': value
         }
@@ -129,12 +320,20 @@ class Template(object):
             pass
 
         try:
-            return self._compiled.render(variables).strip()
+            result = self._compiled.render(variables).strip()
         except jinja2.TemplateError as ex:
             _LOGGER.error('Error parsing value: %s (value: %s, template: %s)',
                           ex, value, self.template)
             return value if error_value is _SENTINEL else error_value
 
+        if cache_key is not None:
+            with _CACHE_LOCK:
+                _RENDER_CACHE[cache_key] = result
+                if len(_RENDER_CACHE) > RENDER_CACHE_SIZE:
+                    _RENDER_CACHE.popitem(last=False)
+
+        return result
+
     def _ensure_compiled(self):
         """Bind a template to a specific hass instance."""
         if self._compiled is not None:
@@ -144,18 +343,8 @@ class Template(object):
 
         assert self.hass is not None, 'hass variable not set on template'
 
-        location_methods = LocationMethods(self.hass)
-
-        global_vars = ENV.make_globals({
-            'closest': location_methods.closest,
-            'distance': location_methods.distance,
-            'is_state': self.hass.states.is_state,
-            'is_state_attr': self.hass.states.is_state_attr,
-            'states': AllStates(self.hass),
-        })
-
         self._compiled = jinja2.Template.from_code(
-            ENV, self._compiled_code, global_vars, None)
+            ENV, self._compiled_code, _hass_globals(self.hass), None)
 
         return self._compiled
 
@@ -179,11 +368,12 @@ class AllStates(object):
 
     def __iter__(self):
         """Return all states."""
-        return iter(sorted(self._hass.states.async_all(),
-                           key=lambda state: state.entity_id))
+        _record_access(self._hass, all_states=True)
+        return iter(self._hass.states.async_sorted())
 
     def __call__(self, entity_id):
         """Return the states."""
+        _record_access(self._hass, entity_id)
         state = self._hass.states.get(entity_id)
         return STATE_UNKNOWN if state is None else state.state
 
@@ -198,14 +388,14 @@ class DomainStates(object):
 
     def __getattr__(self, name):
         """Return the states."""
-        return self._hass.states.get('{}.{}'.format(self._domain, name))
+        entity_id = '{}.{}'.format(self._domain, name)
+        _record_access(self._hass, entity_id)
+        return self._hass.states.get(entity_id)
 
     def __iter__(self):
         """Return the iteration over all the states."""
-        return iter(sorted(
-            (state for state in self._hass.states.async_all()
-             if state.domain == self._domain),
-            key=lambda state: state.entity_id))
+        _record_access(self._hass, domain=self._domain)
+        return iter(self._hass.states.async_sorted(self._domain))
 
 
 class LocationMethods(object):
@@ -273,8 +463,12 @@ class LocationMethods(object):
 
             group = get_component('group')
 
+            entity_ids = group.expand_entity_ids(self._hass, [gr_entity_id])
+            for entity_id in [gr_entity_id] + entity_ids:
+                _record_access(self._hass, entity_id)
+
             states = [self._hass.states.get(entity_id) for entity_id
-                      in group.expand_entity_ids(self._hass, [gr_entity_id])]
+                      in entity_ids]
 
         return loc_helper.closest(latitude, longitude, states)
 
@@ -331,6 +525,7 @@ class LocationMethods(object):
         if isinstance(entity_id_or_state, State):
             return entity_id_or_state
         elif isinstance(entity_id_or_state, str):
+            _record_access(self._hass, entity_id_or_state)
             return self._hass.states.get(entity_id_or_state)
         return None
 
@@ -8,27 +8,31 @@ For more details about the Python API, please refer to the documentation at
 https://home-assistant.io/developers/python_api/
 """
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import enum
+from functools import partial
+from types import MappingProxyType
 import json
 import logging
 import time
-import threading
 import urllib.parse
 
 from typing import Optional
 
+import aiohttp
+import async_timeout
 import requests
 
 import homeassistant.bootstrap as bootstrap
 import homeassistant.core as ha
 from homeassistant.const import (
     HTTP_HEADER_HA_AUTH, SERVER_PORT, URL_API, URL_API_EVENT_FORWARD,
-    URL_API_EVENTS, URL_API_EVENTS_EVENT, URL_API_SERVICES, URL_API_CONFIG,
+    URL_API_EVENTS, URL_API_EVENTS_BULK, URL_API_EVENTS_EVENT,
+    URL_API_SERVICES, URL_API_CONFIG,
     URL_API_SERVICES_SERVICE, URL_API_STATES, URL_API_STATES_ENTITY,
     HTTP_HEADER_CONTENT_TYPE, CONTENT_TYPE_JSON)
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.executor import InstrumentedExecutor
 
 METHOD_GET = "get"
 METHOD_POST = "post"
@@ -36,6 +40,10 @@ METHOD_DELETE = "delete"
 
 _LOGGER = logging.getLogger(__name__)
 
+FORWARD_BATCH_SIZE = 100
+FORWARD_MAX_QUEUE = 1000
+FORWARD_TIMEOUT = 5
+
 
 class APIStatus(enum.Enum):
     """Represent API status."""
@@ -124,7 +132,10 @@ class HomeAssistant(ha.HomeAssistant):
         self.remote_api = remote_api
 
         self.loop = loop or asyncio.get_event_loop()
-        self.executor = ThreadPoolExecutor(max_workers=5)
+        self.executors = {
+            name: InstrumentedExecutor(name, max_workers)
+            for name, max_workers in ha.EXECUTOR_POOLS.items()}
+        self.executor = self.executors[ha.POOL_DEFAULT]
         self.loop.set_default_executor(self.executor)
         self.loop.set_exception_handler(self._async_exception_handler)
         self._pending_tasks = []
@@ -206,7 +217,12 @@ class EventBus(ha.EventBus):
 
 
 class EventForwarder(object):
-    """Listens for events and forwards to specified APIs."""
+    """Listens for events and forwards to specified APIs.
+
+    Every target gets its own bounded queue and task that posts the queued
+    events in batches to the bulk endpoint of the target. Events are
+    dropped for a target that can not keep up.
+    """
 
     def __init__(self, hass, restrict_origin=None):
         """Initalize the event forwarder."""
@@ -216,9 +232,11 @@ class EventForwarder(object):
         # We use a tuple (host, port) as key to ensure
         # that we do not forward to the same host twice
         self._targets = {}
+        self._queues = {}
+        self._tasks = {}
 
-        self._lock = threading.Lock()
         self._async_unsub_listener = None
+        self._async_unsub_stop = None
 
     @ha.callback
     def async_connect(self, api):
@@ -230,9 +248,21 @@ class EventForwarder(object):
             self._async_unsub_listener = self.hass.bus.async_listen(
                 ha.MATCH_ALL, self._event_listener)
 
+        if self._async_unsub_stop is None:
+            self._async_unsub_stop = self.hass.bus.async_listen_once(
+                ha.EVENT_HOMEASSISTANT_STOP, self._async_stop)
+
         key = (api.host, api.port)
 
+        if key in self._tasks:
+            self._tasks.pop(key).cancel()
+
         self._targets[key] = api
+        self._queues[key] = asyncio.Queue(
+            maxsize=FORWARD_MAX_QUEUE, loop=self.hass.loop)
+        task = self._tasks[key] = self.hass.loop.create_task(
+            self._async_forward(api, self._queues[key]))
+        task.add_done_callback(partial(self._async_forward_done, key))
 
     @ha.callback
     def async_disconnect(self, api):
@@ -241,23 +271,122 @@ class EventForwarder(object):
 
         did_remove = self._targets.pop(key, None) is None
 
+        if key in self._tasks:
+            self._tasks.pop(key).cancel()
+            self._queues.pop(key)
+
         if len(self._targets) == 0:
             # Remove event listener if no forwarding targets present
             self._async_unsub_listener()
             self._async_unsub_listener = None
 
+            if self._async_unsub_stop is not None:
+                self._async_unsub_stop()
+                self._async_unsub_stop = None
+
         return did_remove
 
+    @ha.callback
     def _event_listener(self, event):
-        """Listen and forward all events."""
-        with self._lock:
-            # We don't forward time events or, if enabled, non-local events
-            if event.event_type == ha.EVENT_TIME_CHANGED or \
-               (self.restrict_origin and event.origin != self.restrict_origin):
-                return
+        """Listen and queue all events for the targets."""
+        # We don't forward time events or, if enabled, non-local events
+        if event.event_type == ha.EVENT_TIME_CHANGED or \
+           (self.restrict_origin and event.origin != self.restrict_origin):
+            return
+
+        for key, queue in self._queues.items():
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                _LOGGER.warning('Forwarding queue of %s:%d is full, '
+                                'dropping event %s', key[0], key[1],
+                                event.event_type)
+
+    @ha.callback
+    def _async_stop(self, event):
+        """Stop forwarding when Home Assistant stops."""
+        self._async_unsub_stop = None
+        for key in list(self._targets):
+            self.async_disconnect(self._targets[key])
+
+    @ha.callback
+    def _async_forward_done(self, key, task):
+        """Log when a forwarding task ends other than being cancelled."""
+        if task.cancelled():
+            return
+        if self._tasks.get(key) is task:
+            self._tasks.pop(key)
+            self._queues.pop(key)
+        _LOGGER.error('Stopped forwarding events to %s:%d: %s',
+                      key[0], key[1], task.exception())
+
+    @asyncio.coroutine
+    def _async_forward(self, api, queue):
+        """Post the queued events to a target in batches.
+
+        Targets without the bulk endpoint get the events posted one by one.
+        """
+        bulk = True
 
-            for api in self._targets.values():
-                fire_event(api, event.event_type, event.data)
+        while True:
+            batch = [(yield from queue.get())]
+            while len(batch) < FORWARD_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            try:
+                if bulk:
+                    status, text = yield from self._async_post(
+                        api, URL_API_EVENTS_BULK, [
+                            {'event_type': event.event_type,
+                             'event_data': event.data}
+                            for event in batch])
+                    if status == 404:
+                        _LOGGER.warning('%s does not accept events in bulk, '
+                                        'forwarding them one by one',
+                                        api.host)
+                        bulk = False
+                    elif status != 200:
+                        _LOGGER.error('Error forwarding events: %d - %s',
+                                      status, text)
+
+                if not bulk:
+                    for event in batch:
+                        status, text = yield from self._async_post(
+                            api, URL_API_EVENTS_EVENT.format(
+                                event.event_type), event.data)
+                        if status != 200:
+                            _LOGGER.error('Error forwarding event %s: '
+                                          '%d - %s', event.event_type,
+                                          status, text)
+
+            except (asyncio.TimeoutError, aiohttp.errors.ClientError,
+                    aiohttp.errors.DisconnectedError) as err:
+                _LOGGER.error('Error forwarding %d events to %s: %s',
+                              len(batch), api.host, err)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception('Unexpected error forwarding %d events '
+                                  'to %s', len(batch), api.host)
+
+    @asyncio.coroutine
+    def _async_post(self, api, path, data):
+        """Post data as JSON to a target and return the status and body."""
+        url = urllib.parse.urljoin(api.base_url, path)
+        data = json_dumps(data)
+
+        with async_timeout.timeout(FORWARD_TIMEOUT, loop=self.hass.loop):
+            # pylint: disable=protected-access
+            req = yield from self.hass.websession.post(
+                url, data=data, headers=api._headers)
+            try:
+                text = yield from req.text()
+            finally:
+                yield from req.release()
+
+        return req.status, text
 
 
 class StateMachine(ha.StateMachine):
@@ -322,6 +451,89 @@ class JSONEncoder(json.JSONEncoder):
                 return json.JSONEncoder.default(self, obj)
 
 
+# Containers that may hold states or events further down
+_JSON_NESTED = (ha.State, ha.Event, list, tuple, dict, MappingProxyType)
+
+
+def json_dumps(obj, sort_keys=False):
+    """Encode obj to JSON text.
+
+    States are encoded once, the text is kept on the State and reused each
+    time the state is encoded again. Sorting the keys takes the slower
+    path through JSONEncoder.
+    """
+    if sort_keys:
+        return json.dumps(obj, sort_keys=True, cls=JSONEncoder)
+    return _encode(obj)
+
+
+def state_attributes_json(state):
+    """Return the attributes of a State as JSON text."""
+    # pylint: disable=protected-access
+    if state._attributes_json is None:
+        state._attributes_json = json.dumps(
+            dict(state.attributes), cls=JSONEncoder)
+    return state._attributes_json
+
+
+def _encode(obj):
+    """Encode obj to JSON text, splicing in the JSON of states."""
+    if isinstance(obj, ha.State):
+        return _encode_state(obj)
+
+    elif isinstance(obj, ha.Event):
+        return _encode_event(obj)
+
+    elif isinstance(obj, datetime):
+        return _encode_datetime(obj)
+
+    elif isinstance(obj, (list, tuple)):
+        if any(isinstance(item, _JSON_NESTED) for item in obj):
+            return '[{}]'.format(', '.join(_encode(item) for item in obj))
+
+    elif isinstance(obj, (dict, MappingProxyType)):
+        if all(isinstance(key, str) for key in obj) and \
+                any(isinstance(value, _JSON_NESTED)
+                    for value in obj.values()):
+            return '{{{}}}'.format(', '.join(
+                '{}: {}'.format(json.dumps(key), _encode(value))
+                for key, value in obj.items()))
+        obj = dict(obj)
+
+    return json.dumps(obj, cls=JSONEncoder)
+
+
+def _encode_state(state):
+    """Return the JSON text of a State, encoding it only once."""
+    # pylint: disable=protected-access
+    if state._json is None:
+        state._json = (
+            '{{"entity_id": {}, "state": {}, "attributes": {}, '
+            '"last_changed": {}, "last_updated": {}}}').format(
+                json.dumps(state.entity_id), json.dumps(state.state),
+                state_attributes_json(state),
+                _encode_datetime(state.last_changed),
+                _encode_datetime(state.last_updated))
+    return state._json
+
+
+def _encode_event(event):
+    """Return the JSON text of an Event."""
+    return ('{{"event_type": {}, "data": {}, "origin": {}, '
+            '"time_fired": {}}}').format(
+                json.dumps(event.event_type), _encode(event.data),
+                json.dumps(str(event.origin)),
+                _encode_datetime(event.time_fired))
+
+
+def _encode_datetime(value):
+    """Return the JSON text of a datetime.
+
+    ISO formatted dates never need escaping.
+    """
+    return '"{}"'.format(value.isoformat())
+
+
 def validate_api(api):
     """Make a call to validate API."""
     try:
@@ -0,0 +1,293 @@
+"""Script to run benchmarks."""
+import argparse
+import asyncio
+import json
+import logging
+import random
+from datetime import timedelta
+from types import SimpleNamespace
+from timeit import default_timer as timer
+from typing import Callable, Dict  # NOQA
+
+from homeassistant import core, remote
+from homeassistant.components import zone, zwave
+from homeassistant.components.zwave import const as zwave_const
+from homeassistant.const import (
+    ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED)
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time, async_track_state_change,
+    async_track_utc_time_change)
+import homeassistant.util.dt as dt_util
+
+BENCHMARKS = {}  # type: Dict[str, Callable]
+
+
+def run(args):
+    """Handle benchmark commandline script."""
+    # Disable logging
+    logging.getLogger('homeassistant.core').setLevel(logging.CRITICAL)
+
+    parser = argparse.ArgumentParser(
+        description=("Run a Home Assistant benchmark."))
+    parser.add_argument('name', choices=BENCHMARKS)
+    parser.add_argument('--script', choices=['benchmark'])
+
+    args = parser.parse_args()
+
+    bench = BENCHMARKS[args.name]
+
+    print('Using event loop:', asyncio.get_event_loop_policy().__module__)
+
+    loop = asyncio.new_event_loop()
+    hass = core.HomeAssistant(loop)
+    runtime = loop.run_until_complete(bench(hass))
+    print('Benchmark {} done in {:.2f}s'.format(bench.__name__, runtime))
+    loop.run_until_complete(hass.async_stop())
+    loop.close()
+
+    return 0
+
+
+def benchmark(func):
+    """Decorator to mark a benchmark."""
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+@benchmark
+@asyncio.coroutine
+def state_changed_dispatch(hass):
+    """Measure dispatch cost of a state change against listener count.
+
+    Every listener tracks its own entity, like automations and template
+    sensors do. Only one of them should be called per state change, the
+    time per event should not grow with the number of listeners.
+    """
+    events_to_fire = 10000
+    start = timer()
+
+    for listener_count in (10, 100, 1000, 5000):
+        count = 0
+
+        @core.callback
+        def listener(entity_id, old_state, new_state):
+            """Count the handled state changes."""
+            nonlocal count
+            count += 1
+
+        unsubs = [
+            async_track_state_change(
+                hass, 'light.kitchen_{}'.format(index), listener)
+            for index in range(listener_count)]
+
+        event_data = {
+            'entity_id': 'light.kitchen_0',
+            'old_state': core.State('light.kitchen_0', 'off'),
+            'new_state': core.State('light.kitchen_0', 'on'),
+        }
+
+        round_start = timer()
+        for _ in range(events_to_fire):
+            hass.bus.async_fire(EVENT_STATE_CHANGED, event_data)
+        yield from hass.async_block_till_done()
+        runtime = timer() - round_start
+
+        assert count == events_to_fire
+
+        print('{:>5} listeners: {:.2f} us per state change'.format(
+            listener_count, runtime / events_to_fire * 1000000))
+
+        for unsub in unsubs:
+            unsub()
+
+    return timer() - start
+
+
+@benchmark
+@asyncio.coroutine
+def time_changed_dispatch(hass):
+    """Measure the cost of a time changed event against timer count.
+
+    Registers pending points in time and per minute polling patterns that
+    are not due, the time per event should not grow with their number.
+    """
+    events_to_fire = 1000
+    start = timer()
+    now = dt_util.utcnow().replace(second=30, microsecond=0)
+
+    @core.callback
+    def action(now):
+        """Do nothing, the timers should not be due."""
+        pass
+
+    for timer_count in (10, 100, 1000, 10000):
+        unsubs = []
+        for index in range(timer_count):
+            unsubs.append(async_track_point_in_utc_time(
+                hass, action, now + timedelta(days=1, seconds=index)))
+            unsubs.append(async_track_utc_time_change(
+                hass, action, second=index % 30))
+
+        round_start = timer()
+        for _ in range(events_to_fire):
+            hass.bus.async_fire(EVENT_TIME_CHANGED, {ATTR_NOW: now})
+        yield from hass.async_block_till_done()
+        runtime = timer() - round_start
+
+        print('{:>5} timers: {:.2f} us per time changed event'.format(
+            timer_count, runtime / events_to_fire * 1000000))
+
+        for unsub in unsubs:
+            unsub()
+
+    return timer() - start
+
+
+@benchmark
+@asyncio.coroutine
+def zone_lookup(hass):
+    """Measure the cost of finding the active zone against zone count.
+
+    Zones are spread over a region, each lookup is done like a device
+    tracker update would. The time per update should not grow much with
+    the number of zones.
+    """
+    lookups = 10000
+    start = timer()
+    rand = random.Random(0)
+
+    for zone_count in (10, 100, 1000, 5000):
+        for index in range(zone_count):
+            hass.states.async_set('zone.zone_{}'.format(index), zone.STATE, {
+                'latitude': 52 + rand.uniform(-1, 1),
+                'longitude': 5 + rand.uniform(-1, 1),
+                'radius': rand.choice((50, 100, 500, 2000)),
+            })
+        yield from hass.async_block_till_done()
+
+        points = [(52 + rand.uniform(-1, 1), 5 + rand.uniform(-1, 1))
+                  for _ in range(lookups)]
+
+        round_start = timer()
+        for latitude, longitude in points:
+            zone.async_active_zone(hass, latitude, longitude, 20)
+        runtime = timer() - round_start
+
+        print('{:>5} zones: {:.0f} updates per second'.format(
+            zone_count, lookups / runtime))
+
+        for index in range(zone_count):
+            hass.states.async_remove('zone.zone_{}'.format(index))
+        yield from hass.async_block_till_done()
+
+    return timer() - start
+
+
+@benchmark
+@asyncio.coroutine
+def zwave_discovery(hass):
+    """Measure how long Z-Wave takes to find the components of its values.
+
+    Simulates the values that a network of 150 nodes reports during
+    startup and looks up the components to set up for each of them.
+    """
+    rand = random.Random(0)
+    node_types = [
+        (zwave_const.GENERIC_TYPE_SWITCH_BINARY, 1),
+        (zwave_const.GENERIC_TYPE_SWITCH_MULTILEVEL,
+         zwave_const.SPECIFIC_TYPE_POWER_SWITCH_MULTILEVEL),
+        (zwave_const.GENERIC_TYPE_SENSOR_BINARY, 1),
+        (zwave_const.GENERIC_TYPE_SENSOR_MULTILEVEL, 1),
+        (zwave_const.GENERIC_TYPE_THERMOSTAT, 6),
+        (zwave_const.GENERIC_TYPE_ENTRY_CONTROL,
+         zwave_const.SPECIFIC_TYPE_SECURE_KEYPAD_DOOR_LOCK),
+    ]
+    value_types = [
+        (zwave_const.COMMAND_CLASS_SWITCH_BINARY, zwave_const.TYPE_BOOL),
+        (zwave_const.COMMAND_CLASS_SWITCH_MULTILEVEL, zwave_const.TYPE_BYTE),
+        (zwave_const.COMMAND_CLASS_SENSOR_BINARY, zwave_const.TYPE_BOOL),
+        (zwave_const.COMMAND_CLASS_SENSOR_MULTILEVEL, 'Decimal'),
+        (zwave_const.COMMAND_CLASS_METER, 'Decimal'),
+        (zwave_const.COMMAND_CLASS_THERMOSTAT_SETPOINT, 'Decimal'),
+        (zwave_const.COMMAND_CLASS_DOOR_LOCK, zwave_const.TYPE_BOOL),
+        (zwave_const.COMMAND_CLASS_CONFIGURATION, 'Int'),
+        (zwave_const.COMMAND_CLASS_BATTERY, zwave_const.TYPE_BYTE),
+    ]
+    genres = [zwave_const.GENRE_USER, zwave_const.GENRE_SYSTEM, 'Config']
+
+    network = SimpleNamespace(nodes={})
+    for node_id in range(1, 151):
+        generic, specific = rand.choice(node_types)
+        node = SimpleNamespace(node_id=node_id, generic=generic,
+                               specific=specific, values={})
+        for value_id in range(rand.randint(20, 200)):
+            command_class, value_type = rand.choice(value_types)
+            node.values[value_id] = SimpleNamespace(
+                value_id=value_id, command_class=command_class,
+                type=value_type, genre=rand.choice(genres))
+        network.nodes[node_id] = node
+
+    value_count = sum(len(node.values) for node in network.nodes.values())
+    start = timer()
+
+    discovery_lookup = zwave.discovery_lookup_factory(
+        zwave.DISCOVERY_COMPONENTS)
+    found = 0
+    for node in network.nodes.values():
+        for value in node.values.values():
+            found += len(discovery_lookup(node, value))
+
+    runtime = timer() - start
+    print('{} nodes, {} values, {} components: {:.2f} us per value'.format(
+        len(network.nodes), value_count, found,
+        runtime / value_count * 1000000))
+
+    return runtime
+
+
+@benchmark
+@asyncio.coroutine
+def json_encode(hass):
+    """Measure encoding a dump of all states to JSON.
+
+    Compares JSONEncoder with json_dumps on 1000 states like the ones the
+    states API returns, both for states seen for the first time and for
+    states that were encoded before.
+    """
+    rand = random.Random(0)
+    now = dt_util.utcnow()
+    states = []
+    for index in range(1000):
+        states.append(core.State(
+            'sensor.sensor_{}'.format(index),
+            str(rand.uniform(-20, 40)),
+            {
+                'friendly_name': 'Sensor {}'.format(index),
+                'unit_of_measurement': '\u00b0C',
+                'icon': 'mdi:thermometer',
+                'battery_level': rand.randint(0, 100),
+                'last_seen': now - timedelta(seconds=rand.randint(0, 3600)),
+            },
+            now - timedelta(seconds=rand.randint(0, 86400)), now))
+    rounds = 20
+
+    start = timer()
+    for _ in range(rounds):
+        json.dumps(states, sort_keys=True, cls=remote.JSONEncoder)
+    encoder = timer() - start
+
+    start = timer()
+    remote.json_dumps(states)
+    first = timer() - start
+
+    start = timer()
+    for _ in range(rounds):
+        remote.json_dumps(states)
+    cached = timer() - start
+
+    print('JSONEncoder: {:.2f} ms, json_dumps first: {:.2f} ms, '
+          'json_dumps cached: {:.2f} ms per dump'.format(
+              encoder / rounds * 1000, first * 1000,
+              cached / rounds * 1000))
+
+    return encoder + first + cached
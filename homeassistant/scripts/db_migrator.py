@@ -1,6 +1,7 @@
 """Script to convert an old-format home-assistant.db to a new format one."""
 
 import argparse
+import json
 import os.path
 import sqlite3
 import sys
@@ -11,7 +12,8 @@ from typing import Optional, List
 import homeassistant.config as config_util
 import homeassistant.util.dt as dt_util
 # pylint: disable=unused-import
-from homeassistant.components.recorder import REQUIREMENTS  # NOQA
+from homeassistant.components.recorder import (  # NOQA
+    REQUIREMENTS, migrate_schema)
 
 
 def ts_to_dt(timestamp: Optional[float]) -> Optional[datetime]:
@@ -46,6 +48,43 @@ def print_progress(iteration: int, total: int, prefix: str='', suffix: str='',
         print("\n")
 
 
+def migrate_state_attributes(session) -> None:
+    """Move inline state attributes into the shared state_attributes table."""
+    # pylint: disable=invalid-name
+    from homeassistant.components.recorder import models
+
+    query = session.query(models.States).filter(
+        models.States.attributes.isnot(None))
+    num_rows = query.count()
+    print("Moving attributes of {} states".format(num_rows))
+
+    if not num_rows:
+        return
+
+    known_ids = set(row[0] for row in session.query(
+        models.StateAttributes.attributes_id))
+    n = 0
+    while True:
+        states = query.order_by(models.States.state_id).limit(1000).all()
+        if not states:
+            break
+        for state in states:
+            n += 1
+            # Normalize the JSON so equal attributes share one row
+            shared_attrs = json.dumps(json.loads(state.attributes),
+                                      sort_keys=True)
+            attributes_id = models.StateAttributes.hash_shared_attrs(
+                shared_attrs)
+            if attributes_id not in known_ids:
+                known_ids.add(attributes_id)
+                session.add(models.StateAttributes(
+                    attributes_id=attributes_id, shared_attrs=shared_attrs))
+            state.attributes_id = attributes_id
+            state.attributes = None
+        session.commit()
+        print_progress(n, num_rows)
+
+
 def run(script_args: List) -> int:
     """The actual script body."""
     # pylint: disable=invalid-name
@@ -70,6 +109,12 @@ def run(script_args: List) -> int:
         type=str,
         help="Connect to URI and import (implies --append)"
              "eg: mysql://localhost/homeassistant")
+    parser.add_argument(
+        '--attributes',
+        action='store_true',
+        default=False,
+        help="Only move the state attributes of an existing new format "
+             "database into the shared state_attributes table")
     parser.add_argument(
         '--script',
         choices=['db_migrator'])
@@ -88,6 +133,15 @@ def run(script_args: List) -> int:
     src_db = '{}/home-assistant.db'.format(config_dir)
     dst_db = '{}/home-assistant_v2.db'.format(config_dir)
 
+    if args.attributes:
+        uri = args.uri or "sqlite:///{}".format(dst_db)
+        engine = create_engine(uri, echo=False)
+        models.Base.metadata.create_all(engine)
+        migrate_schema(engine)
+        session = sessionmaker(bind=engine)()
+        migrate_state_attributes(session)
+        return 0
+
     if not os.path.exists(src_db):
         print("Fatal Error: Old format database '{}' does not exist".format(
             src_db))
@@ -104,6 +158,7 @@ def run(script_args: List) -> int:
 
     engine = create_engine(uri, echo=False)
     models.Base.metadata.create_all(engine)
+    migrate_schema(engine)
     session_factory = sessionmaker(bind=engine)
     session = session_factory()
 
@@ -187,4 +242,6 @@ def run(script_args: List) -> int:
     print_progress(n, num_rows)
     session.commit()
     c.close()
+
+    migrate_state_attributes(session)
     return 0
@@ -0,0 +1,94 @@
+"""Executor pools that keep track of their queue, workers and latency."""
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30)
+
+
+class InstrumentedExecutor(ThreadPoolExecutor):
+    """A named ThreadPoolExecutor that collects statistics on its jobs.
+
+    Tracks how many jobs wait for a worker, how many are running and a
+    histogram of how long jobs waited and ran.
+    """
+
+    def __init__(self, name, max_workers):
+        """Initialize the executor."""
+        super().__init__(max_workers=max_workers)
+        self.name = name
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._wait_latency = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._run_latency = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    @property
+    def max_workers(self):
+        """Return the maximum number of worker threads."""
+        return self._max_workers
+
+    def set_max_workers(self, max_workers):
+        """Change the maximum number of worker threads.
+
+        Workers are started on demand, lowering the maximum will not stop
+        workers that are already running.
+        """
+        self._max_workers = max_workers
+
+    def submit(self, fn, *args, **kwargs):
+        """Submit a job and keep track of it."""
+        submitted = time.monotonic()
+        stats_lock = self._stats_lock
+
+        def run_job():
+            """Run the job and record its latency."""
+            started = time.monotonic()
+            with stats_lock:
+                self._queued -= 1
+                self._active += 1
+                self._wait_latency[
+                    bisect_left(LATENCY_BUCKETS, started - submitted)] += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                finished = time.monotonic()
+                with stats_lock:
+                    self._active -= 1
+                    self._completed += 1
+                    self._run_latency[
+                        bisect_left(LATENCY_BUCKETS, finished - started)] += 1
+
+        def job_done(future):
+            """Stop counting jobs that were cancelled before they ran."""
+            if future.cancelled():
+                with stats_lock:
+                    self._queued -= 1
+
+        with stats_lock:
+            self._queued += 1
+        try:
+            future = super().submit(run_job)
+        except RuntimeError:
+            with stats_lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(job_done)
+        return future
+
+    def stats(self):
+        """Return a dictionary with the statistics of this executor."""
+        labels = [str(bucket) for bucket in LATENCY_BUCKETS] + ['inf']
+        with self._stats_lock:
+            return {
+                'name': self.name,
+                'max_workers': self._max_workers,
+                'queued': self._queued,
+                'active': self._active,
+                'completed': self._completed,
+                'wait_latency': dict(zip(labels, self._wait_latency)),
+                'run_latency': dict(zip(labels, self._run_latency)),
+            }
@@ -27,6 +27,15 @@ MILES_PER_KILOMETER = 0.621371
 MAX_ITERATIONS = 200
 CONVERGENCE_THRESHOLD = 1e-12
 
+# Radius in meters of a sphere that is nowhere more curved than the
+# ellipsoid. Distances on it are a cheap lower bound of the real distance.
+LOWER_BOUND_RADIUS = 6300000
+
+# Size in degrees of the cells of a GridIndex
+GRID_CELL_SIZE = 0.05
+# Circles that overlap more cells are checked on every query instead
+MAX_GRID_CELLS = 400
+
 LocationInfo = collections.namedtuple(
     "LocationInfo",
     ['ip', 'country_code', 'country_name', 'region_code', 'region_name',
@@ -58,6 +67,103 @@ def distance(lat1, lon1, lat2, lon2):
     return vincenty((lat1, lon1), (lat2, lon2)) * 1000
 
 
+def distance_lower_bound(lat1, lon1, lat2, lon2):
+    """Calculate a lower bound of the distance in meters between two points.
+
+    A lot cheaper than distance, use it to skip points that can't be closer
+    than one that is already known.
+
+    Async friendly.
+    """
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    hav = (math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) *
+           math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * LOWER_BOUND_RADIUS * math.asin(min(1, math.sqrt(hav)))
+
+
+class GridIndex(object):
+    """Index circles on the earth by the grid cells they overlap.
+
+    Candidates returned for a query only might overlap it, the distance
+    still has to be checked for them.
+
+    Async friendly.
+    """
+
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        """Initialize the index."""
+        self.cell_size = cell_size
+        self._cells = collections.defaultdict(set)
+        self._items = {}
+        self._wide = set()
+
+    def __len__(self):
+        """Return the number of indexed circles."""
+        return len(self._items)
+
+    def __contains__(self, key):
+        """Return if a circle is indexed under key."""
+        return key in self._items
+
+    def add(self, key, latitude, longitude, radius=0):
+        """Add a circle or move it if key is already indexed."""
+        self.remove(key)
+        cells = self._cells_for(latitude, longitude, radius)
+        if cells is None:
+            self._wide.add(key)
+        else:
+            for cell in cells:
+                self._cells[cell].add(key)
+        self._items[key] = cells
+
+    def remove(self, key):
+        """Remove a circle if it is indexed."""
+        if key not in self._items:
+            return
+        cells = self._items.pop(key)
+        if cells is None:
+            self._wide.discard(key)
+            return
+        for cell in cells:
+            keys = self._cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self._cells[cell]
+
+    def candidates(self, latitude, longitude, radius=0):
+        """Return the keys of the circles that might overlap the given one."""
+        cells = self._cells_for(latitude, longitude, radius)
+        if cells is None:
+            return set(self._items)
+        found = set(self._wide)
+        for cell in cells:
+            keys = self._cells.get(cell)
+            if keys:
+                found.update(keys)
+        return found
+
+    def _cells_for(self, latitude, longitude, radius):
+        """Return the cells a circle overlaps, None if there are too many."""
+        angle = (radius or 0) / LOWER_BOUND_RADIUS
+        delta_lat = math.degrees(angle)
+        # Circles around a pole overlap all longitudes
+        if abs(latitude) + delta_lat >= 90:
+            return None
+        delta_lon = math.degrees(math.asin(min(
+            1, math.sin(angle) / math.cos(math.radians(latitude)))))
+        if not -180 <= longitude - delta_lon <= longitude + delta_lon <= 180:
+            return None
+
+        size = self.cell_size
+        lat_cells = range(math.floor((latitude - delta_lat) / size),
+                          math.floor((latitude + delta_lat) / size) + 1)
+        lon_cells = range(math.floor((longitude - delta_lon) / size),
+                          math.floor((longitude + delta_lon) / size) + 1)
+        if len(lat_cells) * len(lon_cells) > MAX_GRID_CELLS:
+            return None
+        return [(lat, lon) for lat in lat_cells for lon in lon_cells]
+
+
 def elevation(latitude, longitude):
     """Return elevation for given latitude and longitude."""
     try:
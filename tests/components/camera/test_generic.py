@@ -99,3 +99,31 @@ def test_limit_refetch(aioclient_mock, hass, test_client):
     assert resp.status == 200
     body = yield from resp.text()
     assert body == 'hello planet'
+
+
+@asyncio.coroutine
+def test_frame_max_age(aioclient_mock, hass, test_client):
+    """Test that snapshots reuse a recently fetched frame."""
+    aioclient_mock.get('http://example.com', text='hello world')
+
+    def setup_platform():
+        """Setup the platform."""
+        assert setup_component(hass, 'camera', {
+            'camera': {
+                'name': 'config_test',
+                'platform': 'generic',
+                'still_image_url': 'http://example.com',
+                'frame_max_age': 60,
+            }})
+
+    yield from hass.loop.run_in_executor(None, setup_platform)
+
+    client = yield from test_client(hass.http.app)
+
+    for _ in range(2):
+        resp = yield from client.get('/api/camera_proxy/camera.config_test')
+        assert resp.status == 200
+        body = yield from resp.text()
+        assert body == 'hello world'
+
+    assert aioclient_mock.call_count == 1
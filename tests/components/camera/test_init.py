@@ -0,0 +1,188 @@
+"""The tests for the camera component."""
+import asyncio
+
+from homeassistant.components import camera
+
+
+class FakeCamera(object):
+    """Camera that counts how often an image was fetched."""
+
+    def __init__(self, hass, images):
+        """Initialize the fake camera."""
+        self.hass = hass
+        self.entity_id = 'camera.fake'
+        self.images = list(images)
+        self.fetches = 0
+
+    @asyncio.coroutine
+    def async_camera_image(self):
+        """Return the next image."""
+        self.fetches += 1
+        yield from asyncio.sleep(0, loop=self.hass.loop)
+        return self.images.pop(0) if self.images else None
+
+
+@asyncio.coroutine
+def test_frame_broker_shares_fetches(hass):
+    """Test that concurrent snapshots share one fetch."""
+    fake = FakeCamera(hass, [b'frame'])
+    broker = camera.FrameBroker(hass, fake)
+
+    frames = yield from asyncio.gather(
+        broker.async_get_frame(), broker.async_get_frame(), loop=hass.loop)
+
+    assert frames == [b'frame', b'frame']
+    assert fake.fetches == 1
+    assert broker.sequence == 1
+
+
+@asyncio.coroutine
+def test_frame_broker_fan_out(hass):
+    """Test that all viewers get the frames of one poll."""
+    fake = FakeCamera(hass, [b'one', b'two'])
+    broker = camera.FrameBroker(hass, fake)
+
+    broker.async_subscribe()
+    broker.async_subscribe()
+
+    frames = yield from asyncio.gather(
+        broker.async_next_frame(None), broker.async_next_frame(None),
+        loop=hass.loop)
+    assert frames == [b'one', b'one']
+
+    frames = yield from asyncio.gather(
+        broker.async_next_frame(1), broker.async_next_frame(1),
+        loop=hass.loop)
+    assert frames == [b'two', b'two']
+
+    # The camera stopped delivering images, streams end
+    frame = yield from broker.async_next_frame(2)
+    assert frame is None
+    assert fake.fetches == 3
+
+    broker.async_unsubscribe()
+    broker.async_unsubscribe()
+
+
+@asyncio.coroutine
+def test_frame_broker_forgets_frame_when_idle(hass):
+    """Test a viewer coming back after an idle period gets a new frame."""
+    fake = FakeCamera(hass, [b'one', b'two'])
+    broker = camera.FrameBroker(hass, fake)
+
+    broker.async_subscribe()
+    frame = yield from broker.async_next_frame(None)
+    assert frame == b'one'
+    broker.async_unsubscribe()
+
+    assert broker.frame is None
+    assert broker.fetched_at is None
+
+    broker.async_subscribe()
+    frame = yield from broker.async_next_frame(None)
+    assert frame == b'two'
+    broker.async_unsubscribe()
+
+
+def test_mjpeg_parser():
+    """Test frames are cut out of a stream read in odd chunks."""
+    frames = [b'\xff\xd8one\xff\xd9', b'\xff\xd8two\xff\xd9']
+    stream = b''.join(
+        b'--boundary\r\nContent-Type: image/jpeg\r\n\r\n' + frame + b'\r\n'
+        for frame in frames) + b'--boundary--\r\n'
+    parser = camera.MjpegParser()
+
+    parsed = []
+    for pos in range(0, len(stream), 5):
+        parsed.extend(parser.feed(stream[pos:pos + 5]))
+
+    assert parsed == frames
+
+
+def test_mjpeg_parser_content_length():
+    """Test frames with an embedded thumbnail are cut by their length."""
+    frames = [b'\xff\xd8exif\xff\xd8thumb\xff\xd9one\xff\xd9',
+              b'\xff\xd8two\xff\xd9']
+    stream = b''.join(
+        b'--boundary\r\nContent-Type: image/jpeg\r\n'
+        b'Content-Length: ' + str(len(frame)).encode() + b'\r\n\r\n' +
+        frame + b'\r\n' for frame in frames)
+    parser = camera.MjpegParser()
+
+    parsed = []
+    for pos in range(0, len(stream), 7):
+        parsed.extend(parser.feed(stream[pos:pos + 7]))
+
+    assert parsed == frames
+
+
+def test_mjpeg_parser_boundary():
+    """Test frames without a length are cut at the next boundary."""
+    frame = b'\xff\xd8exif\xff\xd8thumb\xff\xd9one\xff\xd9'
+    part = b'--myboundary\r\nContent-Type: image/jpeg\r\n\r\n'
+    parser = camera.MjpegParser()
+
+    # The frame is only known to be complete once the next part starts
+    assert parser.feed(part + frame[:12]) == []
+    assert parser.feed(frame[12:] + b'\r\n') == []
+    assert parser.feed(part) == [frame]
+
+
+@asyncio.coroutine
+def test_relay_opens_stream_once(hass):
+    """Test that all viewers share one upstream stream."""
+    chunks = [b'--b\r\n\xff\xd8one\xff',
+              b'\xd9\r\n--b\r\n\xff\xd8two\xff\xd9', b'\r\n--b\r\n']
+    opened = []
+    closed = []
+    # Frame two only ends once the viewers got frame one, the stream only
+    # ends once they wait for frame three.
+    resume = asyncio.Event(loop=hass.loop)
+    stop = asyncio.Event(loop=hass.loop)
+
+    @asyncio.coroutine
+    def read(size):
+        """Return the next chunk of the stream."""
+        yield from asyncio.sleep(0, loop=hass.loop)
+        if len(chunks) == 1:
+            yield from resume.wait()
+        elif not chunks:
+            yield from stop.wait()
+        return chunks.pop(0) if chunks else b''
+
+    @asyncio.coroutine
+    def close():
+        """Close the stream."""
+        closed.append(1)
+
+    @asyncio.coroutine
+    def async_open():
+        """Open the upstream stream."""
+        opened.append(1)
+        return read, close
+
+    relay = camera.async_get_relay(hass, 'http://example.com', async_open)
+    assert camera.async_get_relay(hass, 'http://example.com', None) is relay
+
+    relay.async_subscribe()
+    relay.async_subscribe()
+
+    frames = yield from asyncio.gather(
+        relay.async_next_frame(None), relay.async_next_frame(None),
+        loop=hass.loop)
+    assert frames == [b'\xff\xd8one\xff\xd9', b'\xff\xd8one\xff\xd9']
+
+    resume.set()
+    frame = yield from relay.async_next_frame(1)
+    assert frame == b'\xff\xd8two\xff\xd9'
+
+    stop.set()
+    frame = yield from relay.async_next_frame(2)
+    assert frame is None
+
+    relay.async_unsubscribe()
+    relay.async_unsubscribe()
+    yield from hass.async_block_till_done()
+
+    assert len(opened) == 1
+    assert len(closed) == 1
@@ -1,11 +1,13 @@
 """The tests for the device tracker component."""
 # pylint: disable=protected-access
+import asyncio
 import json
 import logging
 import unittest
 from unittest.mock import call, patch
 from datetime import datetime, timedelta
 import os
+import sqlite3
 
 from homeassistant.core import callback
 from homeassistant.bootstrap import setup_component
@@ -43,10 +45,13 @@ class TestComponentsDeviceTracker(unittest.TestCase):
     # pylint: disable=invalid-name
     def tearDown(self):
         """Stop everything that was started."""
-        try:
-            os.remove(self.yaml_devices)
-        except FileNotFoundError:
-            pass
+        db_devices = self.hass.config.path(device_tracker.DB_DEVICES)
+        for path in (self.yaml_devices, self.yaml_devices + '.imported',
+                     db_devices, db_devices + device_tracker.SPILL_SUFFIX):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
 
         self.hass.stop()
 
@@ -160,6 +165,82 @@ class TestComponentsDeviceTracker(unittest.TestCase):
         assert config[0].dev_id == 'dev1'
         assert config[0].track
 
+    def test_device_store_imports_yaml(self):
+        """Test known devices are imported into the device store."""
+        get_component('device_tracker.test').SCANNER.reset()
+        device = device_tracker.Device(
+            self.hass, timedelta(seconds=180), True, 'test',
+            'AB:CD:EF:GH:IJ', 'Test name', picture='http://test.picture',
+            hide_if_away=True)
+        device_tracker.update_config(self.yaml_devices, 'test', device)
+
+        self.assertTrue(setup_component(self.hass, device_tracker.DOMAIN, {
+            device_tracker.DOMAIN: {CONF_PLATFORM: 'test',
+                                    device_tracker.CONF_DEVICE_STORE: True}}))
+
+        self.assertFalse(os.path.isfile(self.yaml_devices))
+        self.assertTrue(os.path.isfile(self.yaml_devices + '.imported'))
+
+        store = self.hass.data[device_tracker.DATA_DEVICE_STORE]
+        self.assertEqual(
+            [('test', 'AB:CD:EF:GH:IJ', 'Test name', 'http://test.picture',
+              1, 1, None)], store.load())
+
+        devices = run_coroutine_threadsafe(
+            store.async_load(self.yaml_devices, timedelta(seconds=180)),
+            self.hass.loop).result()
+        self.assertEqual(1, len(devices))
+        self.assertEqual('test', devices[0].dev_id)
+        self.assertEqual(device.mac, devices[0].mac)
+        self.assertEqual(device.config_picture, devices[0].config_picture)
+        self.assertEqual(device.away_hide, devices[0].away_hide)
+
+    def test_device_store_writes_new_devices(self):
+        """Test new devices are written to the store instead of YAML."""
+        get_component('device_tracker.test').SCANNER.reset()
+        self.assertTrue(setup_component(self.hass, device_tracker.DOMAIN, {
+            device_tracker.DOMAIN: {CONF_PLATFORM: 'test',
+                                    device_tracker.CONF_DEVICE_STORE: True}}))
+
+        device_tracker.see(self.hass, 'mac_1', host_name='hello')
+        device_tracker.see(self.hass, 'mac_2', host_name='hello')
+        self.hass.block_till_done()
+
+        store = self.hass.data[device_tracker.DATA_DEVICE_STORE]
+        store.writer.block_till_done()
+
+        self.assertFalse(os.path.isfile(self.yaml_devices))
+        self.assertEqual(
+            [('hello', 'MAC_1'), ('hello_2', 'MAC_2')],
+            sorted(row[:2] for row in store.load()))
+
+    def test_device_store_retries_locked_database(self):
+        """Test rows that failed to be written are spilled and kept."""
+        get_component('device_tracker.test').SCANNER.reset()
+        self.assertTrue(setup_component(self.hass, device_tracker.DOMAIN, {
+            device_tracker.DOMAIN: {CONF_PLATFORM: 'test',
+                                    device_tracker.CONF_DEVICE_STORE: True}}))
+        store = self.hass.data[device_tracker.DATA_DEVICE_STORE]
+        write = store.writer._write_batch
+
+        with patch.object(store.writer, '_write_batch',
+                          side_effect=sqlite3.OperationalError('locked')):
+            device_tracker.see(self.hass, 'mac_1', host_name='hello')
+            self.hass.block_till_done()
+            store.writer.block_till_done()
+
+        self.assertTrue(os.path.isfile(store.writer.spill_path))
+
+        store.writer._write_batch = write
+        store.writer._retry_at = None
+        device_tracker.see(self.hass, 'mac_2', host_name='hello')
+        self.hass.block_till_done()
+        store.writer.block_till_done()
+
+        self.assertEqual(
+            [('hello', 'MAC_1'), ('hello_2', 'MAC_2')],
+            sorted(row[:2] for row in store.load()))
+
     def test_gravatar(self):
         """Test the Gravatar generation."""
         dev_id = 'test'
@@ -222,6 +303,41 @@ class TestComponentsDeviceTracker(unittest.TestCase):
         self.assertEqual(STATE_NOT_HOME,
                          self.hass.states.get('device_tracker.dev1').state)
 
+    def test_scan_only_sees_arrivals(self):
+        """Test devices that stay home are not updated on every scan."""
+        scanner = get_component('device_tracker.test').SCANNER
+        scanner.reset()
+        scanner.come_home('DEV1')
+
+        register_time = datetime(2015, 9, 15, 23, tzinfo=dt_util.UTC)
+        scan_time = datetime(2015, 9, 15, 23, 0, 12, tzinfo=dt_util.UTC)
+
+        with patch('homeassistant.components.device_tracker.dt_util.utcnow',
+                   return_value=register_time):
+            self.assertTrue(setup_component(self.hass, device_tracker.DOMAIN,
+                                            TEST_PLATFORM))
+
+        self.assertEqual(STATE_HOME,
+                         self.hass.states.get('device_tracker.dev1').state)
+
+        scanner.come_home('DEV2')
+        updated = []
+
+        @asyncio.coroutine
+        def mock_update_ha_state(entity, force_refresh=False):
+            """Keep track of the updated devices."""
+            updated.append(entity.entity_id)
+
+        with patch('homeassistant.components.device_tracker.dt_util.utcnow',
+                   return_value=scan_time), \
+                patch.object(device_tracker.Device, 'async_update_ha_state',
+                             mock_update_ha_state):
+            fire_time_changed(self.hass, scan_time)
+            self.hass.block_till_done()
+
+        self.assertEqual(['device_tracker.dev2'], updated)
+        scanner.reset()
+
     def test_entity_attributes(self):
         """Test the entity attributes."""
         dev_id = 'test_entity'
@@ -213,6 +213,59 @@ class TestMQTT(unittest.TestCase):
         self.hass.block_till_done()
         self.assertEqual(0, len(self.calls))
 
+    def test_subscribe_topic_shared_subscription(self):
+        """Test the broker subscription is shared by subscribers."""
+        unsub = mqtt.subscribe(self.hass, 'test-topic/+', self.record_calls)
+        unsub2 = mqtt.subscribe(self.hass, 'test-topic/+', self.record_calls)
+        mqtt.subscribe(self.hass, 'test-topic/#', self.record_calls)
+
+        self.assertEqual(
+            [mock.call('test-topic/+', 0), mock.call('test-topic/#', 0)],
+            mqtt.MQTT_CLIENT.subscribe.mock_calls)
+
+        fire_mqtt_message(self.hass, 'test-topic/bier', 'test-payload')
+        self.hass.block_till_done()
+        self.assertEqual(3, len(self.calls))
+
+        unsub()
+        self.assertFalse(mqtt.MQTT_CLIENT.unsubscribe.called)
+
+        unsub2()
+        mqtt.MQTT_CLIENT.unsubscribe.assert_called_once_with('test-topic/+')
+
+        fire_mqtt_message(self.hass, 'test-topic/bier', 'test-payload')
+        self.hass.block_till_done()
+        self.assertEqual(4, len(self.calls))
+
+
+class TestTopicTrie(unittest.TestCase):
+    """Test the topic trie used to match subscriptions."""
+
+    def test_match(self):
+        """Test matching topics with wildcards."""
+        trie = mqtt.TopicTrie()
+        for subscription in ('a/b/c', 'a/+/c', 'a/#', '#', '+/b', 'b/+'):
+            trie.add(subscription, subscription)
+
+        self.assertEqual(
+            ['#', 'a/#', 'a/b/c', 'a/+/c'], trie.match('a/b/c'))
+        self.assertEqual(['#', 'a/#', '+/b'], trie.match('a/b'))
+        self.assertEqual(['#', 'a/#'], trie.match('a'))
+        self.assertEqual(['#'], trie.match('b'))
+        self.assertEqual(['#', 'b/+'], trie.match('b/'))
+
+    def test_remove(self):
+        """Test removing subscribers returns the remaining count."""
+        trie = mqtt.TopicTrie()
+        self.assertEqual(1, trie.add('a/+', 'first'))
+        self.assertEqual(2, trie.add('a/+', 'second'))
+
+        self.assertEqual(1, trie.remove('a/+', 'first'))
+        self.assertEqual(['second'], trie.match('a/b'))
+        self.assertEqual(0, trie.remove('a/+', 'second'))
+        self.assertEqual([], trie.match('a/b'))
+        self.assertEqual(0, trie.remove('a/+', 'second'))
+
 
 class TestMQTTCallbacks(unittest.TestCase):
     """Test the MQTT callbacks."""
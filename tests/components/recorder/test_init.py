@@ -1,14 +1,18 @@
 """The tests for the Recorder component."""
 # pylint: disable=protected-access
 import json
+import queue
 from datetime import datetime, timedelta
+import threading
 import unittest
+from unittest.mock import patch
 
-from homeassistant.core import callback
+from homeassistant.core import callback, State
 from homeassistant.const import MATCH_ALL
 from homeassistant.components import recorder
 from homeassistant.bootstrap import setup_component
-from tests.common import get_test_home_assistant
+import homeassistant.util.dt as dt_util
+from tests.common import get_test_home_assistant, mock_state_change_event
 
 
 class TestRecorder(unittest.TestCase):
@@ -100,10 +104,85 @@ class TestRecorder(unittest.TestCase):
         states = recorder.execute(db_states)
 
         assert db_states[0].event_id is not None
+        assert db_states[0].attributes is None
+        assert db_states[0].attributes_id is not None
 
         self.assertEqual(1, len(states))
         self.assertEqual(self.hass.states.get(entity_id), states[0])
 
+    def test_saving_states_in_one_batch(self):
+        """Test that state changes are committed together."""
+        recorder._INSTANCE.commit_interval = 60
+
+        for value in range(5):
+            self.hass.states.set('test.batch', value)
+
+        self.hass.block_till_done()
+        recorder._INSTANCE.block_till_done()
+
+        states = recorder.execute(
+            recorder.query('States').filter_by(entity_id='test.batch'))
+
+        self.assertEqual(5, len(states))
+        self.assertEqual(5, recorder._INSTANCE.last_commit_size)
+        self.assertEqual(0, recorder._INSTANCE.queue_depth)
+        self.assertEqual('4', states[-1].state)
+
+    def test_saving_shared_attributes(self):
+        """Test that equal attributes are stored only once."""
+        attributes = {'test_attr': 5, 'test_attr_10': 'nice'}
+
+        self.hass.states.set('test.recorder', 'on', attributes)
+        self.hass.states.set('test.recorder', 'off', attributes)
+        self.hass.states.set('test.recorder2', 'on', attributes)
+
+        self.hass.block_till_done()
+        recorder._INSTANCE.block_till_done()
+
+        states = recorder.execute(recorder.query('States'))
+
+        self.assertEqual(3, len(states))
+        self.assertEqual(1, recorder.query('StateAttributes').count())
+        for state in states:
+            self.assertEqual(attributes, state.attributes)
+
+    def test_saving_rollups(self):
+        """Test that numeric states are rolled up per period."""
+        start = datetime(2016, 11, 1, 12, 0, tzinfo=dt_util.UTC)
+
+        for minutes, value in ((0, 10), (1, 20), (2, 'unknown'), (6, 30)):
+            point = start + timedelta(minutes=minutes)
+            mock_state_change_event(
+                self.hass, State('sensor.power', value, {}, point, point))
+
+        self.hass.block_till_done()
+        recorder._INSTANCE.block_till_done()
+
+        rollups = recorder.get_model('StateRollups')
+        five_min = recorder.query('StateRollups').filter_by(
+            period=300).order_by(rollups.start).all()
+        hour = recorder.query('StateRollups').filter_by(period=3600).one()
+
+        self.assertEqual(2, len(five_min))
+        self.assertEqual((10, 20, 15, 20, 2), (
+            five_min[0].min, five_min[0].max, five_min[0].mean,
+            five_min[0].last, five_min[0].count))
+        self.assertEqual((10, 30, 20, 30, 3), (
+            hour.min, hour.max, hour.mean, hour.last, hour.count))
+
+        # Values of a later batch are folded into the stored buckets
+        point = start + timedelta(minutes=7)
+        mock_state_change_event(
+            self.hass, State('sensor.power', 50, {}, point, point))
+        self.hass.block_till_done()
+        recorder._INSTANCE.block_till_done()
+
+        # The rows read above are cached by the session of this thread
+        recorder.Session.expire_all()
+        hour = recorder.query('StateRollups').filter_by(period=3600).one()
+        self.assertEqual((10, 50, 27.5, 50, 4), (
+            hour.min, hour.max, hour.mean, hour.last, hour.count))
+
     def test_saving_event(self):
         """Test saving and restoring an event."""
         event_type = 'EVENT_TEST'
@@ -142,6 +221,41 @@ class TestRecorder(unittest.TestCase):
         assert event.time_fired.replace(microsecond=0) == \
             db_event.time_fired.replace(microsecond=0)
 
+    def test_recording_survives_failed_batch(self):
+        """Test the recorder keeps recording after a batch fails."""
+        from homeassistant.components.recorder.models import Events
+
+        with patch.object(Events, 'from_event',
+                          side_effect=TypeError('not serializable')):
+            self.hass.bus.fire('EVENT_TEST_FAIL')
+            self.hass.block_till_done()
+            recorder._INSTANCE.block_till_done()
+
+        self.hass.bus.fire('EVENT_TEST_OK')
+        self.hass.block_till_done()
+        recorder._INSTANCE.block_till_done()
+
+        self.assertTrue(recorder._INSTANCE.is_alive())
+        self.assertEqual(['EVENT_TEST_OK'], [
+            event.event_type for event in recorder.execute(
+                recorder.query('Events').filter(
+                    recorder.get_model('Events').event_type.like(
+                        'EVENT_TEST%')))])
+
+    def test_drop_events_when_queue_full(self):
+        """Test events are dropped instead of blocking when queue is full."""
+        with patch.object(recorder._INSTANCE.queue, 'put_nowait',
+                          side_effect=queue.Full):
+            self.hass.bus.fire('EVENT_TEST_DROPPED')
+            self.hass.block_till_done()
+
+        self.assertEqual(1, recorder._INSTANCE.dropped_events)
+
+        self.hass.bus.fire('EVENT_TEST_RECORDED')
+        self.hass.block_till_done()
+
+        self.assertEqual(0, recorder._INSTANCE.dropped_events)
+
     def test_purge_old_states(self):
         """Test deleting old states."""
         self._add_test_states()
@@ -170,6 +284,18 @@ class TestRecorder(unittest.TestCase):
         # now we should only have 3 events left
         self.assertEqual(events.count(), 3)
 
+    def test_purge_runs_on_recorder_thread(self):
+        """Test the purge timer leaves the purge to the recorder thread."""
+        threads = []
+
+        with patch.object(recorder._INSTANCE, '_purge_old_data',
+                          side_effect=lambda: threads.append(
+                              threading.current_thread())):
+            recorder._INSTANCE.queue.put(recorder._PURGE)
+            recorder._INSTANCE.block_till_done()
+
+        self.assertEqual([recorder._INSTANCE], threads)
+
     def test_purge_disabled(self):
         """Test leaving purge_days disabled."""
         self._add_test_states()
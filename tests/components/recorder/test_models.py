@@ -9,7 +9,7 @@ import homeassistant.core as ha
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.util import dt
 from homeassistant.components.recorder.models import (
-    Base, Events, States, RecorderRuns)
+    Base, Events, States, StateAttributes, RecorderRuns)
 
 ENGINE = None
 SESSION = None
@@ -79,6 +79,30 @@ class TestStates(unittest.TestCase):
         assert db_state.last_updated == event.time_fired
 
 
+class TestStateAttributes(unittest.TestCase):
+    """Test StateAttributes model."""
+
+    # pylint: disable=no-self-use
+
+    def test_content_addressed(self):
+        """Test equal attributes get the same id."""
+        first = StateAttributes.from_shared_attrs('{"unit": "W"}')
+        second = StateAttributes.from_shared_attrs('{"unit": "W"}')
+        other = StateAttributes.from_shared_attrs('{"unit": "kW"}')
+
+        assert first.attributes_id == second.attributes_id
+        assert first.attributes_id != other.attributes_id
+
+    def test_state_with_shared_attributes(self):
+        """Test converting a db state with shared attributes."""
+        db_state = States(
+            entity_id='sensor.power', state='10',
+            state_attributes=StateAttributes.from_shared_attrs(
+                '{"unit": "W"}'))
+
+        assert db_state.to_native().attributes == {'unit': 'W'}
+
+
 class TestRecorderRuns(unittest.TestCase):
     """Test recorder run model."""
 
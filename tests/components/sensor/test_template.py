@@ -1,5 +1,8 @@
 """The test for the Template sensor platform."""
+from unittest.mock import patch
+
 from homeassistant.bootstrap import setup_component
+from homeassistant.helpers.template import Template
 
 from tests.common import get_test_home_assistant, assert_setup_component
 
@@ -41,6 +44,40 @@ class TestTemplateSensor:
         state = self.hass.states.get('sensor.test_template_sensor')
         assert state.state == 'It Works.'
 
+    def test_template_tracks_accessed_states(self):
+        """Test template re-renders only for the states it accessed."""
+        with assert_setup_component(1):
+            assert setup_component(self.hass, 'sensor', {
+                'sensor': {
+                    'platform': 'template',
+                    'sensors': {
+                        'test_template_sensor': {
+                            'value_template':
+                                "{% for state in states.light %}"
+                                "{{ state.state }}{% endfor %}"
+                        }
+                    }
+                }
+            })
+
+        self.hass.states.set('light.kitchen', 'on')
+        self.hass.block_till_done()
+        state = self.hass.states.get('sensor.test_template_sensor')
+        assert state.state == 'on'
+
+        with patch.object(Template, 'async_render_tracked', autospec=True,
+                          side_effect=Template.async_render_tracked) as render:
+            self.hass.states.set('switch.other', 'on')
+            self.hass.block_till_done()
+            assert render.call_count == 0
+
+            self.hass.states.set('light.hallway', 'off')
+            self.hass.block_till_done()
+            assert render.call_count == 1
+
+        state = self.hass.states.get('sensor.test_template_sensor')
+        assert state.state == 'offon'
+
     def test_template_syntax_error(self):
         """Test templating syntax error."""
         with assert_setup_component(0):
@@ -3,6 +3,7 @@
 import asyncio
 from contextlib import closing
 import json
+import time
 import unittest
 from unittest.mock import Mock, patch
 
@@ -10,8 +11,12 @@ from aiohttp import web
 import requests
 
 from homeassistant import bootstrap, const
+import homeassistant.remote as rem
 import homeassistant.core as ha
+import homeassistant.components.api as api
 import homeassistant.components.http as http
+from homeassistant.util.async import (
+    run_callback_threadsafe, run_coroutine_threadsafe)
 
 from tests.common import get_test_instance_port, get_test_home_assistant
 
@@ -231,6 +236,79 @@ class TestAPI(unittest.TestCase):
         self.assertEqual(400, req.status_code)
         self.assertEqual(0, len(test_value))
 
+    def test_api_fire_events_bulk(self):
+        """Test firing a batch of events in order."""
+        test_value = []
+
+        @ha.callback
+        def listener(event):
+            """Record the fired events."""
+            test_value.append(event.data.get('order'))
+
+        hass.bus.listen("test_event_bulk", listener)
+
+        req = requests.post(
+            _url(const.URL_API_EVENTS_BULK),
+            data=json.dumps([
+                {'event_type': 'test_event_bulk', 'event_data': {'order': 1}},
+                {'event_type': 'test_event_bulk', 'event_data': {'order': 2}},
+                {'event_type': 'test_event_bulk'},
+            ]),
+            headers=HA_HEADERS)
+
+        hass.block_till_done()
+
+        self.assertEqual(200, req.status_code)
+        self.assertEqual([1, 2, None], test_value)
+
+        req = requests.post(
+            _url(const.URL_API_EVENTS_BULK),
+            data=json.dumps([{'event_data': {}}]),
+            headers=HA_HEADERS)
+
+        self.assertEqual(400, req.status_code)
+
+    def test_event_forwarder(self):
+        """Test the event forwarder posts events to the bulk endpoint."""
+        forwarded = []
+
+        @ha.callback
+        def listener(event):
+            """Record the events that came in through the API."""
+            if event.origin == ha.EventOrigin.remote:
+                forwarded.append(event.data['order'])
+
+        hass.bus.listen('test_event_forwarded', listener)
+
+        forwarder = rem.EventForwarder(hass, ha.EventOrigin.local)
+        target = rem.API('127.0.0.1', API_PASSWORD, SERVER_PORT)
+        run_callback_threadsafe(
+            hass.loop, forwarder.async_connect, target).result()
+
+        hass.bus.fire('test_event_forwarded', {'order': 1})
+        hass.bus.fire('test_event_forwarded', {'order': 2})
+
+        for _ in range(30):
+            hass.block_till_done()
+            if len(forwarded) == 2:
+                break
+            time.sleep(0.1)
+
+        run_callback_threadsafe(
+            hass.loop, forwarder.async_disconnect, target).result()
+
+        # Stopping the server would wait for the connections the forwarder
+        # keeps alive to it.
+        @asyncio.coroutine
+        def close_websession():
+            """Close the session the forwarder posted with."""
+            yield from hass.websession.close()
+            hass._websession = None
+
+        run_coroutine_threadsafe(close_websession(), hass.loop).result()
+
+        self.assertEqual([1, 2], forwarded)
+
     def test_api_get_config(self):
         """Test the return of the configuration."""
         req = requests.get(_url(const.URL_API_CONFIG),
@@ -243,6 +321,15 @@ class TestAPI(unittest.TestCase):
                            headers=HA_HEADERS)
         self.assertEqual(hass.config.components, req.json())
 
+    def test_api_get_executors(self):
+        """Test the return of the executor pool statistics."""
+        req = requests.get(_url(const.URL_API_EXECUTORS),
+                           headers=HA_HEADERS)
+        data = req.json()
+        self.assertEqual(sorted(hass.executors), sorted(data))
+        self.assertEqual(5, data['default']['max_workers'])
+        self.assertIn('run_latency', data['default'])
+
     def test_api_get_error_log(self):
         """Test the return of the error log."""
         test_string = 'Test String°'
@@ -429,11 +516,12 @@ class TestAPI(unittest.TestCase):
 
     def test_stream(self):
         """Test the stream."""
-        listen_count = self._listen_count()
+        client_count = len(hass.data[api.DATA_STREAM_HUB])
         with closing(requests.get(_url(const.URL_API_STREAM), timeout=3,
                                   stream=True, headers=HA_HEADERS)) as req:
             stream = req.iter_content(1)
-            self.assertEqual(listen_count + 1, self._listen_count())
+            self.assertEqual(
+                client_count + 1, len(hass.data[api.DATA_STREAM_HUB]))
 
             hass.bus.fire('test_event')
 
@@ -443,13 +531,14 @@ class TestAPI(unittest.TestCase):
 
     def test_stream_with_restricted(self):
         """Test the stream with restrictions."""
-        listen_count = self._listen_count()
+        client_count = len(hass.data[api.DATA_STREAM_HUB])
         url = _url('{}?restrict=test_event1,test_event3'.format(
             const.URL_API_STREAM))
         with closing(requests.get(url, stream=True, timeout=3,
                                   headers=HA_HEADERS)) as req:
             stream = req.iter_content(1)
-            self.assertEqual(listen_count + 1, self._listen_count())
+            self.assertEqual(
+                client_count + 1, len(hass.data[api.DATA_STREAM_HUB]))
 
             hass.bus.fire('test_event1')
             data = self._stream_next_event(stream)
@@ -461,6 +550,20 @@ class TestAPI(unittest.TestCase):
             data = self._stream_next_event(stream)
             self.assertEqual('test_event3', data['event_type'])
 
+    def test_stream_hub_drops_slow_client(self):
+        """Test a client that falls behind is disconnected."""
+        hub = hass.data[api.DATA_STREAM_HUB]
+        queue = run_callback_threadsafe(
+            hass.loop, hub.async_attach, ['test_event_slow']).result()
+
+        for _ in range(api.STREAM_MAX_QUEUE + 1):
+            hass.bus.fire('test_event_slow')
+        hass.block_till_done()
+
+        self.assertEqual(1, queue.qsize())
+        self.assertIs(api._STREAM_STOP, queue.get_nowait())
+        self.assertNotIn(queue, hub._restrict)
+
     def _stream_next_event(self, stream):
         """Read the stream for next event while ignoring ping."""
         while True:
@@ -478,7 +581,3 @@ class TestAPI(unittest.TestCase):
                 break
 
         return json.loads(conv)
-
-    def _listen_count(self):
-        """Return number of event listeners."""
-        return sum(hass.bus.listeners.values())
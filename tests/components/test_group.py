@@ -278,6 +278,53 @@ class TestComponentsGroup(unittest.TestCase):
             sorted(group.expand_entity_ids(self.hass,
                                            ['group.group_of_groups'])))
 
+    def test_expand_entity_ids_follows_nested_group_changes(self):
+        """Test the expanded members follow changes of nested groups."""
+        light_group = group.Group.create_group(
+            self.hass, 'light', ['light.test_1'])
+        group.Group.create_group(self.hass, 'group_of_groups', [
+            'group.light', 'switch.test_1'])
+
+        self.assertEqual(
+            ['light.test_1', 'switch.test_1'],
+            group.expand_entity_ids(self.hass, ['group.group_of_groups']))
+
+        light_group.update_tracked_entity_ids(['light.test_2'])
+
+        self.assertEqual(
+            ['light.test_2', 'switch.test_1'],
+            group.expand_entity_ids(self.hass, ['group.group_of_groups']))
+
+    def test_group_state_follows_member_changes(self):
+        """Test the group state is kept from the counts of member states."""
+        self.hass.states.set('light.Bowl', STATE_ON)
+        self.hass.states.set('light.Ceiling', STATE_OFF)
+        test_group = group.Group.create_group(
+            self.hass, 'init_group', ['light.Bowl', 'light.Ceiling'])
+
+        self.hass.states.set('light.Ceiling', STATE_ON)
+        self.hass.states.set('light.Bowl', STATE_OFF)
+        self.hass.block_till_done()
+        self.assertEqual(STATE_ON, self.hass.states.get(
+            test_group.entity_id).state)
+
+        self.hass.states.set('light.Ceiling', 'unavailable')
+        self.hass.block_till_done()
+        self.assertEqual(STATE_OFF, self.hass.states.get(
+            test_group.entity_id).state)
+
+        self.hass.states.set('light.Ceiling', STATE_ON)
+        self.hass.block_till_done()
+        self.assertEqual(STATE_ON, self.hass.states.get(
+            test_group.entity_id).state)
+
+        self.hass.states.remove('light.Ceiling')
+        self.hass.block_till_done()
+        self.assertEqual(STATE_OFF, self.hass.states.get(
+            test_group.entity_id).state)
+        self.assertEqual(1, test_group._state_counts[STATE_OFF])
+        self.assertEqual(0, test_group._state_counts[STATE_ON])
+
     def test_set_assumed_state_based_on_tracked(self):
         """Test assumed state."""
         self.hass.states.set('light.Bowl', STATE_ON)
@@ -1,6 +1,7 @@
 """The tests the History component."""
 # pylint: disable=protected-access
 from datetime import timedelta
+import json
 import unittest
 from unittest.mock import patch, sentinel
 
@@ -8,6 +9,7 @@ from homeassistant.bootstrap import setup_component
 import homeassistant.core as ha
 import homeassistant.util.dt as dt_util
 from homeassistant.components import history, recorder
+from homeassistant.remote import JSONEncoder
 
 from tests.common import (
     mock_http_component, mock_state_change_event, get_test_home_assistant)
@@ -152,6 +154,32 @@ class TestComponentHistory(unittest.TestCase):
 
         self.assertEqual(states, hist[entity_id])
 
+    def test_get_rollups(self):
+        """Test getting rolled up numeric states."""
+        self.init_recorder()
+        start = (dt_util.utcnow() + timedelta(hours=1)).replace(
+            minute=0, second=0, microsecond=0)
+        entity_id = 'sensor.power'
+
+        for minutes, value in ((0, 10), (1, 20), (6, 30)):
+            point = start + timedelta(minutes=minutes)
+            mock_state_change_event(self.hass, ha.State(
+                entity_id, value, {'unit_of_measurement': 'W'},
+                point, point))
+        self.wait_recording_done()
+
+        hist = history.get_rollups(
+            start + timedelta(seconds=1), start + timedelta(hours=1),
+            entity_id, 300)
+
+        self.assertEqual(2, len(hist[entity_id]))
+        first, second = hist[entity_id]
+        self.assertEqual('15.0', first.state)
+        self.assertEqual('W', first.attributes['unit_of_measurement'])
+        self.assertEqual(10, first.attributes['min'])
+        self.assertEqual(start, first.last_updated)
+        self.assertEqual('30.0', second.state)
+
     def test_get_significant_states(self):
         """Test that only significant states are returned.
 
@@ -164,6 +192,18 @@ class TestComponentHistory(unittest.TestCase):
             zero, four, filters=history.Filters())
         assert states == hist
 
+    def test_stream_significant_states(self):
+        """Test that streamed states match the states returned at once."""
+        zero, four, states = self.record_states()
+        streamed = json.loads(''.join(history.stream_significant_states(
+            zero, four, filters=history.Filters())))
+
+        expected = json.loads(json.dumps(
+            sorted(states.values(), key=lambda states: states[0].entity_id),
+            cls=JSONEncoder))
+        streamed.sort(key=lambda states: states[0]['entity_id'])
+        assert expected == streamed
+
     def test_get_significant_states_entity_id(self):
         """Test that only significant states are returned for one entity."""
         zero, four, states = self.record_states()
@@ -1,9 +1,12 @@
 """The tests for the Home Assistant HTTP component."""
-# pylint: disable=protected-access
+# pylint: disable=protected-access,redefined-outer-name
+import asyncio
 import logging
 from ipaddress import ip_network
 from unittest.mock import patch
 
+import aiohttp
+import pytest
 import requests
 
 from homeassistant import bootstrap, const
@@ -227,3 +230,58 @@ class TestHttp:
         assert req.headers.get(allow_origin) == HTTP_BASE_URL
         assert req.headers.get(allow_headers) == \
             const.HTTP_HEADER_HA_AUTH.upper()
+
+
+class StreamView(http.HomeAssistantView):
+    """View that streams the JSON text pieces of a producer."""
+
+    url = '/api/test_stream'
+    name = 'api:test_stream'
+    requires_auth = False
+
+    def __init__(self, hass, produce):
+        """Initialize the view."""
+        super().__init__(hass)
+        self.produce = produce
+
+    @asyncio.coroutine
+    def get(self, request):
+        """Stream the produced pieces."""
+        response = yield from self.json_stream(request, self.produce)
+        return response
+
+
+@asyncio.coroutine
+def test_json_stream(hass, test_client):
+    """Test streaming JSON text."""
+    def produce():
+        """Produce a JSON list."""
+        yield '['
+        yield '1, 2'
+        yield ']'
+
+    assert (yield from bootstrap.async_setup_component(hass, http.DOMAIN))
+    hass.http.register_view(StreamView(hass, produce))
+    client = yield from test_client(hass.http.app)
+
+    resp = yield from client.get('/api/test_stream')
+    assert resp.status == 200
+    assert (yield from resp.json()) == [1, 2]
+
+
+@asyncio.coroutine
+def test_json_stream_aborts_on_error(hass, test_client):
+    """Test a failing producer does not end the stream as complete."""
+    def produce():
+        """Fail halfway through the list."""
+        yield '[1'
+        raise ValueError('broken')
+
+    assert (yield from bootstrap.async_setup_component(hass, http.DOMAIN))
+    hass.http.register_view(StreamView(hass, produce))
+    client = yield from test_client(hass.http.app)
+
+    resp = yield from client.get('/api/test_stream')
+    assert resp.status == 200
+    with pytest.raises(aiohttp.errors.ServerDisconnectedError):
+        yield from resp.read()
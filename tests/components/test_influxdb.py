@@ -101,6 +101,7 @@ class TestInfluxDB(unittest.TestCase):
         }
         assert setup_component(self.hass, influxdb.DOMAIN, config)
         self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        self.writer = self.hass.data[influxdb.DATA_INFLUXDB]
 
     def test_event_listener(self, mock_client):
         """Test the event listener."""
@@ -136,6 +137,7 @@ class TestInfluxDB(unittest.TestCase):
                 },
             }]
             self.handler_method(event)
+            self.writer.block_till_done()
             self.assertEqual(
                 mock_client.return_value.write_points.call_count, 1
             )
@@ -170,6 +172,7 @@ class TestInfluxDB(unittest.TestCase):
                 },
             }]
             self.handler_method(event)
+            self.writer.block_till_done()
             self.assertEqual(
                 mock_client.return_value.write_points.call_count, 1
             )
@@ -190,6 +193,7 @@ class TestInfluxDB(unittest.TestCase):
         mock_client.return_value.write_points.side_effect = \
             influx_client.exceptions.InfluxDBClientError('foo')
         self.handler_method(event)
+        self.writer.block_till_done()
 
     def test_event_listener_states(self, mock_client):
         """Test the event listener against ignored states."""
@@ -212,6 +216,7 @@ class TestInfluxDB(unittest.TestCase):
                 },
             }]
             self.handler_method(event)
+            self.writer.block_till_done()
             if state_state == 1:
                 self.assertEqual(
                     mock_client.return_value.write_points.call_count, 1
@@ -245,6 +250,7 @@ class TestInfluxDB(unittest.TestCase):
                 },
             }]
             self.handler_method(event)
+            self.writer.block_till_done()
             if entity_id == 'ok':
                 self.assertEqual(
                     mock_client.return_value.write_points.call_count, 1
@@ -256,3 +262,28 @@ class TestInfluxDB(unittest.TestCase):
             else:
                 self.assertFalse(mock_client.return_value.write_points.called)
             mock_client.return_value.write_points.reset_mock()
+
+    def test_event_listener_bad_point(self, mock_client):
+        """Test a point the database refuses does not drop the batch."""
+        self._setup()
+
+        def write_points(points):
+            """Refuse the batches holding the bad point."""
+            if any(point['fields']['value'] == 'bad' for point in points):
+                raise influx_client.exceptions.InfluxDBClientError(
+                    'field type conflict', 400)
+
+        mock_client.return_value.write_points.side_effect = write_points
+
+        for value in (1, 'bad', 3):
+            state = mock.MagicMock(
+                state=value, domain='fake', entity_id='fake.entity',
+                object_id='entity', attributes={})
+            self.handler_method(mock.MagicMock(
+                data={'new_state': state}, time_fired=12345))
+        self.writer.block_till_done()
+
+        self.assertEqual(
+            [[1, 'bad', 3], [1], ['bad', 3], ['bad'], [3]],
+            [[point['fields']['value'] for point in call[0][0]] for call
+             in mock_client.return_value.write_points.call_args_list])
@@ -121,6 +121,42 @@ class TestComponentZone(unittest.TestCase):
         active = zone.active_zone(self.hass, latitude, longitude)
         assert 'zone.smallest_zone' == active.entity_id
 
+    def test_active_zone_follows_zone_changes(self):
+        """Test the zone index is kept in sync with the zone states."""
+        latitude = 32.880600
+        longitude = -117.237561
+        assert bootstrap.setup_component(self.hass, zone.DOMAIN, {
+            'zone': None
+        })
+
+        assert zone.active_zone(self.hass, latitude, longitude) is None
+
+        self.hass.states.set('zone.test', zone.STATE, {
+            'latitude': latitude,
+            'longitude': longitude,
+            'radius': 250,
+        })
+        self.hass.block_till_done()
+
+        active = zone.active_zone(self.hass, latitude, longitude)
+        assert 'zone.test' == active.entity_id
+
+        self.hass.states.set('zone.test', zone.STATE, {
+            'latitude': latitude + 1,
+            'longitude': longitude,
+            'radius': 250,
+        })
+        self.hass.block_till_done()
+
+        assert zone.active_zone(self.hass, latitude, longitude) is None
+        active = zone.active_zone(self.hass, latitude + 1, longitude)
+        assert 'zone.test' == active.entity_id
+
+        self.hass.states.remove('zone.test')
+        self.hass.block_till_done()
+
+        assert zone.active_zone(self.hass, latitude + 1, longitude) is None
+
     def test_in_zone_works_for_passive_zones(self):
         """Test working in passive zones."""
         latitude = 32.880600
@@ -0,0 +1 @@
+"""The tests for the Z-Wave component."""
@@ -0,0 +1,68 @@
+"""The tests for the Z-Wave component setup helpers."""
+from unittest.mock import Mock
+
+from homeassistant.components import zwave
+from homeassistant.components.zwave import const
+
+
+def linear_scan(node, value):
+    """Match a value against every discovery entry, the way setup used to."""
+    components = []
+    for (component, generic_device_class, specific_device_class,
+         command_class, value_type, value_genre) in zwave.DISCOVERY_COMPONENTS:
+        if node.generic not in generic_device_class and \
+           None not in generic_device_class:
+            continue
+        if node.specific not in specific_device_class and \
+           None not in specific_device_class:
+            continue
+        if value.command_class not in command_class and \
+           None not in command_class:
+            continue
+        if value_type != value.type and value_type is not None:
+            continue
+        if value_genre != value.genre and value_genre is not None:
+            continue
+        components.append(component)
+    return tuple(components)
+
+
+def test_discovery_lookup_matches_linear_scan():
+    """Test the lookup table finds the same components as a full scan."""
+    lookup = zwave.discovery_lookup_factory(zwave.DISCOVERY_COMPONENTS)
+
+    cases = [
+        # Dimmer level
+        (const.GENERIC_TYPE_SWITCH_MULTILEVEL,
+         const.SPECIFIC_TYPE_POWER_SWITCH_MULTILEVEL,
+         const.COMMAND_CLASS_SWITCH_MULTILEVEL, const.TYPE_BYTE,
+         const.GENRE_USER, ('light',)),
+        # Binary switch
+        (const.GENERIC_TYPE_SWITCH_BINARY, 1,
+         const.COMMAND_CLASS_SWITCH_BINARY, const.TYPE_BOOL,
+         const.GENRE_USER, ('switch',)),
+        # Any device with a temperature reading
+        (const.GENERIC_TYPE_SWITCH_BINARY, 1,
+         const.COMMAND_CLASS_SENSOR_MULTILEVEL, const.TYPE_DECIMAL,
+         const.GENRE_USER, ('sensor',)),
+        # Right command class, wrong genre
+        (const.GENERIC_TYPE_SWITCH_MULTILEVEL,
+         const.SPECIFIC_TYPE_POWER_SWITCH_MULTILEVEL,
+         const.COMMAND_CLASS_SWITCH_MULTILEVEL, const.TYPE_BYTE,
+         const.GENRE_SYSTEM, ()),
+        # Configuration values are not discovered
+        (const.GENERIC_TYPE_SWITCH_BINARY, 1,
+         const.COMMAND_CLASS_CONFIGURATION, const.TYPE_BYTE,
+         const.GENRE_USER, ()),
+    ]
+
+    for (generic, specific, command_class, value_type, genre,
+         expected) in cases:
+        node = Mock(generic=generic, specific=specific)
+        value = Mock(command_class=command_class, type=value_type,
+                     genre=genre)
+
+        assert linear_scan(node, value) == expected
+        assert lookup(node, value) == expected
+        # Served from the table the second time
+        assert lookup(node, value) == expected
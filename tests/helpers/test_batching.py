@@ -0,0 +1,111 @@
+"""Test batching helpers."""
+import os
+import unittest
+from unittest import mock
+
+from homeassistant.helpers import batching
+
+from tests.common import get_test_home_assistant
+
+
+class TestBatchWriter(unittest.TestCase):
+    """Test the BatchWriter."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Setup things to be run when tests are started."""
+        self.hass = get_test_home_assistant()
+        self.spill_path = self.hass.config.path('test_batching.spill')
+        self.written = []
+
+    def tearDown(self):  # pylint: disable=invalid-name
+        """Stop everything that was started."""
+        self.hass.stop()
+        if os.path.isfile(self.spill_path):
+            os.remove(self.spill_path)
+
+    def _writer(self, write_batch=None, **kwargs):
+        """Create and start a writer."""
+        kwargs.setdefault('spill_path', self.spill_path)
+        writer = batching.BatchWriter(
+            self.hass, 'TestWriter', write_batch or self.written.append,
+            retry_exceptions=(OSError,), **kwargs)
+        writer.start()
+        return writer
+
+    def test_batch_by_size(self):
+        """Test items are written in batches of batch_size."""
+        writer = self._writer(batch_size=2, flush_interval=60)
+
+        for item in range(5):
+            writer.put(item)
+        writer.block_till_done()
+
+        self.assertEqual([[0, 1], [2, 3], [4]], self.written)
+
+    def test_flush_on_shutdown(self):
+        """Test pending items are written on shutdown."""
+        writer = self._writer(flush_interval=60)
+
+        writer.put('a')
+        writer.shutdown(None)
+
+        self.assertFalse(writer.is_alive())
+        self.assertEqual([['a']], self.written)
+
+    def test_drop_when_queue_full(self):
+        """Test put never blocks when the queue is full."""
+        writer = batching.BatchWriter(
+            self.hass, 'TestWriter', self.written.append, max_queue=1)
+
+        writer.put('a')
+        writer.put('b')
+
+        self.assertEqual(1, writer.dropped)
+
+    def test_spill_and_replay(self):
+        """Test failed batches are spilled and written once back online."""
+        write_batch = mock.Mock(side_effect=OSError('unreachable'))
+        writer = self._writer(write_batch)
+
+        writer.put({'value': 1})
+        writer.block_till_done()
+
+        self.assertTrue(os.path.isfile(self.spill_path))
+        self.assertEqual(1, write_batch.call_count)
+
+        # Still backing off, the batch goes straight to the spill file
+        write_batch.side_effect = None
+        writer.put({'value': 2})
+        writer.block_till_done()
+        self.assertEqual(1, write_batch.call_count)
+
+        writer._retry_at = None  # pylint: disable=protected-access
+        writer.put({'value': 3})
+        writer.block_till_done()
+
+        self.assertFalse(os.path.isfile(self.spill_path))
+        self.assertEqual([
+            mock.call([{'value': 1}, {'value': 2}]),
+            mock.call([{'value': 3}]),
+        ], write_batch.call_args_list[1:])
+
+    def test_hold_and_retry_without_spill_file(self):
+        """Test failed batches are held in memory without a spill file."""
+        write_batch = mock.Mock(side_effect=OSError('unreachable'))
+        writer = self._writer(write_batch, spill_path=None)
+
+        writer.put('a')
+        writer.block_till_done()
+
+        self.assertFalse(os.path.isfile(self.spill_path))
+        self.assertEqual(0, writer.dropped)
+
+        write_batch.side_effect = None
+        writer._retry_at = None  # pylint: disable=protected-access
+        writer.put('b')
+        writer.block_till_done()
+
+        self.assertEqual([
+            mock.call(['a']),
+            mock.call(['b']),
+        ], write_batch.call_args_list[1:])
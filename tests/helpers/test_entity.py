@@ -1,14 +1,17 @@
 """Test the entity helper."""
 # pylint: disable=protected-access
 import asyncio
-from unittest.mock import MagicMock
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 import homeassistant.helpers.entity as entity
+from homeassistant.core import POOL_DEVICE
 from homeassistant.const import ATTR_HIDDEN
+import homeassistant.util.dt as dt_util
 
-from tests.common import get_test_home_assistant
+from tests.common import get_test_home_assistant, fire_time_changed
 
 
 def test_generate_entity_id_requires_hass_or_ids():
@@ -43,6 +46,7 @@ def test_async_update_support(event_loop):
 
     ent = AsyncEntity()
     ent.hass.loop = event_loop
+    ent.hass.executors = {POOL_DEVICE: None}
 
     @asyncio.coroutine
     def test():
@@ -116,3 +120,54 @@ class TestHelpersEntity(object):
         ent = AsyncEntity()
         ent.update()
         assert len(async_update) == 1
+
+    def test_throttle_interval_writes_last_state(self):
+        """Test writes within the interval are coalesced into the last."""
+        entity.set_customize({'sensor.power': {
+            entity.CUSTOMIZE_THROTTLE_INTERVAL: 10}})
+        ent = entity.Entity()
+        ent.entity_id = 'sensor.power'
+        ent.hass = self.hass
+        now = dt_util.utcnow()
+
+        with patch('homeassistant.helpers.entity.dt_util.utcnow',
+                   return_value=now):
+            for value in range(3):
+                with patch.object(entity.Entity, 'state', value):
+                    ent.update_ha_state()
+
+        state = self.hass.states.get('sensor.power')
+        assert state.state == '0'
+        assert entity.CUSTOMIZE_THROTTLE_INTERVAL not in state.attributes
+
+        fire_time_changed(self.hass, now + timedelta(seconds=10))
+        self.hass.block_till_done()
+        assert self.hass.states.get('sensor.power').state == '2'
+
+    def test_throttle_deadband(self):
+        """Test small numeric changes are held back till the flush."""
+        entity.set_customize({'sensor.power': {
+            entity.CUSTOMIZE_THROTTLE_DEADBAND: 5}})
+        ent = entity.Entity()
+        ent.entity_id = 'sensor.power'
+        ent.hass = self.hass
+        now = dt_util.utcnow()
+
+        with patch('homeassistant.helpers.entity.dt_util.utcnow',
+                   return_value=now):
+            for value in (100, 103):
+                with patch.object(entity.Entity, 'state', value):
+                    ent.update_ha_state()
+            assert self.hass.states.get('sensor.power').state == '100'
+
+            with patch.object(entity.Entity, 'state', 105):
+                ent.update_ha_state()
+            assert self.hass.states.get('sensor.power').state == '105'
+
+            with patch.object(entity.Entity, 'state', 102):
+                ent.update_ha_state()
+
+        fire_time_changed(self.hass, now + timedelta(
+            seconds=entity.DEADBAND_FLUSH_INTERVAL))
+        self.hass.block_till_done()
+        assert self.hass.states.get('sensor.power').state == '102'
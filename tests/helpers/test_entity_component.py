@@ -2,7 +2,9 @@
 # pylint: disable=protected-access
 import asyncio
 from collections import OrderedDict
+from datetime import timedelta
 import logging
+import time
 import unittest
 from unittest.mock import patch, Mock
 
@@ -47,6 +49,16 @@ class EntityTest(Entity):
         """Return the unique ID of the entity."""
         return self._handle('unique_id')
 
+    @property
+    def available(self):
+        """Return if the entity is available."""
+        return self._handle('available')
+
+    @property
+    def scan_interval(self):
+        """Return the seconds between polls."""
+        return self._handle('scan_interval')
+
     def _handle(self, attr):
         """Helper for the attributes."""
         if attr in self._values:
@@ -106,12 +118,87 @@ class TestHelpersEntityComponent(unittest.TestCase):
         no_poll_ent.async_update.reset_mock()
         poll_ent.async_update.reset_mock()
 
-        fire_time_changed(self.hass, dt_util.utcnow().replace(second=0))
+        fire_time_changed(self.hass, dt_util.utcnow() + timedelta(seconds=20))
         self.hass.block_till_done()
 
         assert not no_poll_ent.async_update.called
         assert poll_ent.async_update.called
 
+    def test_polling_spread_with_entity_interval_and_backoff(self):
+        """Test entities are polled by their own interval and back off."""
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass, 20)
+        now = dt_util.utcnow()
+        updates = []
+
+        def poll_entity(**values):
+            """Create a polling entity that records its updates."""
+            ent = EntityTest(should_poll=True, **values)
+
+            @asyncio.coroutine
+            def async_update():
+                """Record the update."""
+                updates.append(ent.name)
+
+            ent.async_update = async_update
+            return ent
+
+        unavailable_ent = poll_entity(name='unavailable', available=False)
+        minutely_ent = poll_entity(name='minutely', scan_interval=60)
+
+        with patch('homeassistant.helpers.entity_component.random.uniform',
+                   return_value=0), \
+                patch('homeassistant.helpers.entity_component.dt_util.utcnow',
+                      return_value=now):
+            component.add_entities([unavailable_ent, minutely_ent])
+
+        def poll_at(seconds):
+            """Fire the time and return the entities that updated."""
+            updates.clear()
+            fire_time_changed(self.hass, now + timedelta(seconds=seconds))
+            self.hass.block_till_done()
+            return sorted(updates)
+
+        assert ['minutely', 'unavailable'] == poll_at(0)
+        # Unavailable backs off to twice the interval
+        assert [] == poll_at(20)
+        assert ['unavailable'] == poll_at(40)
+        assert ['minutely'] == poll_at(60)
+        # And to four times the interval
+        assert [] == poll_at(80)
+
+        unavailable_ent._values['available'] = True
+        assert ['minutely', 'unavailable'] == poll_at(120)
+        assert ['unavailable'] == poll_at(140)
+
+    def test_polling_sync_entities_one_at_a_time(self):
+        """Test sync entities of a platform do not update concurrently."""
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass, 20)
+        now = dt_util.utcnow()
+        running = []
+        overlaps = []
+
+        def update():
+            """Record if another update runs at the same time."""
+            running.append(1)
+            overlaps.append(len(running) > 1)
+            time.sleep(0.05)
+            running.pop()
+
+        entities = [EntityTest(should_poll=True) for _ in range(3)]
+        for ent in entities:
+            ent.update = update
+
+        with patch('homeassistant.helpers.entity_component.random.uniform',
+                   return_value=0), \
+                patch('homeassistant.helpers.entity_component.dt_util.utcnow',
+                      return_value=now):
+            component.add_entities(entities)
+
+        fire_time_changed(self.hass, now)
+        self.hass.block_till_done()
+
+        assert overlaps == [False, False, False]
+
     def test_update_state_adds_entities(self):
         """Test if updating poll entities cause an entity to be added works."""
         component = EntityComponent(_LOGGER, DOMAIN, self.hass)
@@ -123,7 +210,7 @@ class TestHelpersEntityComponent(unittest.TestCase):
         assert 1 == len(self.hass.states.entity_ids())
         ent2.update = lambda *_: component.add_entities([ent1])
 
-        fire_time_changed(self.hass, dt_util.utcnow().replace(second=0))
+        fire_time_changed(self.hass, dt_util.utcnow() + timedelta(seconds=15))
         self.hass.block_till_done()
 
         assert 2 == len(self.hass.states.entity_ids())
@@ -310,9 +397,11 @@ class TestHelpersEntityComponent(unittest.TestCase):
         assert ('platform_test', {}, {'msg': 'discovery_info'}) == \
             mock_setup.call_args[0]
 
+    @patch('homeassistant.helpers.entity_component.random.uniform',
+           side_effect=lambda low, high: high)
     @patch('homeassistant.helpers.entity_component.'
-           'async_track_utc_time_change')
-    def test_set_scan_interval_via_config(self, mock_track):
+           'async_track_point_in_utc_time')
+    def test_set_scan_interval_via_config(self, mock_track, mock_uniform):
         """Test the setting of the scan interval via configuration."""
         def platform_setup(hass, config, add_devices, discovery_info=None):
             """Test the platform setup."""
@@ -331,11 +420,14 @@ class TestHelpersEntityComponent(unittest.TestCase):
         })
 
         assert mock_track.called
-        assert [0, 30] == list(mock_track.call_args[1]['second'])
+        first_poll = mock_track.call_args[0][2] - dt_util.utcnow()
+        assert timedelta(seconds=29) < first_poll <= timedelta(seconds=30)
 
+    @patch('homeassistant.helpers.entity_component.random.uniform',
+           side_effect=lambda low, high: high)
     @patch('homeassistant.helpers.entity_component.'
-           'async_track_utc_time_change')
-    def test_set_scan_interval_via_platform(self, mock_track):
+           'async_track_point_in_utc_time')
+    def test_set_scan_interval_via_platform(self, mock_track, mock_uniform):
         """Test the setting of the scan interval via platform."""
         def platform_setup(hass, config, add_devices, discovery_info=None):
             """Test the platform setup."""
@@ -355,7 +447,8 @@ class TestHelpersEntityComponent(unittest.TestCase):
         })
 
         assert mock_track.called
-        assert [0, 30] == list(mock_track.call_args[1]['second'])
+        first_poll = mock_track.call_args[0][2] - dt_util.utcnow()
+        assert timedelta(seconds=29) < first_poll <= timedelta(seconds=30)
 
     def test_set_entity_namespace_via_config(self):
         """Test setting an entity namespace."""
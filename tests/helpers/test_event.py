@@ -10,6 +10,7 @@ from homeassistant.bootstrap import setup_component
 import homeassistant.core as ha
 from homeassistant.const import MATCH_ALL
 from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
     track_point_in_utc_time,
     track_point_in_time,
     track_utc_time_change,
@@ -19,6 +20,7 @@ from homeassistant.helpers.event import (
     track_sunset,
 )
 from homeassistant.components import sun
+from homeassistant.util.async import run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 
 from tests.common import get_test_home_assistant
@@ -76,6 +78,53 @@ class TestEventHelpers(unittest.TestCase):
         self.hass.block_till_done()
         self.assertEqual(2, len(runs))
 
+    def test_track_point_in_time_order(self):
+        """Test points in time run in order and only once they passed."""
+        start = datetime(2016, 11, 1, 12, 0, 0, tzinfo=dt_util.UTC)
+        runs = []
+
+        for seconds in (30, 10, 20, 40):
+            track_point_in_utc_time(
+                self.hass, ha.callback(
+                    lambda now, seconds=seconds: runs.append(seconds)),
+                start + timedelta(seconds=seconds))
+
+        unsub = track_point_in_utc_time(
+            self.hass, lambda now: runs.append(15),
+            start + timedelta(seconds=15))
+        unsub()
+
+        self._send_time_changed(start + timedelta(seconds=25))
+        self.hass.block_till_done()
+        self.assertEqual([10, 20], runs)
+
+        self._send_time_changed(start + timedelta(seconds=40))
+        self.hass.block_till_done()
+        self.assertEqual([10, 20, 30, 40], runs)
+
+    def test_track_point_in_time_added_by_action(self):
+        """Test a point in time added by an action waits for the next event."""
+        start = datetime(2016, 11, 1, 12, 0, 0, tzinfo=dt_util.UTC)
+        runs = []
+
+        @ha.callback
+        def action(now):
+            """Run again at a point that already passed."""
+            runs.append(now)
+            async_track_point_in_utc_time(self.hass, action, start)
+
+        run_callback_threadsafe(
+            self.hass.loop, async_track_point_in_utc_time, self.hass, action,
+            start).result()
+
+        self._send_time_changed(start)
+        self.hass.block_till_done()
+        self.assertEqual([start], runs)
+
+        self._send_time_changed(start + timedelta(seconds=1))
+        self.hass.block_till_done()
+        self.assertEqual([start, start + timedelta(seconds=1)], runs)
+
     def test_track_time_change(self):
         """Test tracking time change."""
         wildcard_runs = []
@@ -1,5 +1,6 @@
 """Test Home Assistant template helper methods."""
 from datetime import datetime
+import threading
 import unittest
 from unittest.mock import patch
 
@@ -15,6 +16,7 @@ from homeassistant.const import (
     MATCH_ALL,
 )
 import homeassistant.util.dt as dt_util
+from homeassistant.util.async import run_callback_threadsafe
 
 from tests.common import get_test_home_assistant
 
@@ -688,3 +690,134 @@ is_state_attr('device_tracker.phone_2', 'battery', 40)
     states.sensor.pick_humidity.state ~ „ %“
 }}
             """)))
+
+    def _render_tracked(self, template_str):
+        """Render a template and return the states it accessed."""
+        render_info = template.RenderInfo()
+        tpl = template.Template(template_str, self.hass)
+        run_callback_threadsafe(
+            self.hass.loop, tpl.async_render_tracked, render_info).result()
+        return render_info
+
+    def test_render_tracked_entities(self):
+        """Test the entities a template accesses are recorded."""
+        render_info = self._render_tracked("""
+{% if is_state('device_tracker.phone_1', 'home') %}
+    {{ states.sensor.Temperature.state }}
+{% else %}
+    {{ states('sensor.humidity') }}
+{% endif %}
+            """)
+
+        self.assertEqual(
+            {'device_tracker.phone_1', 'sensor.humidity'},
+            render_info.entities)
+        self.assertEqual(set(), render_info.domains)
+        self.assertFalse(render_info.all_states)
+        self.assertTrue(render_info.matches('sensor.humidity'))
+        self.assertFalse(render_info.matches('sensor.temperature'))
+
+    def test_render_tracked_domains_and_all_states(self):
+        """Test iterating states is recorded."""
+        render_info = self._render_tracked(
+            '{% for state in states.sensor %}{{ state.state }}{% endfor %}')
+
+        self.assertEqual({'sensor'}, render_info.domains)
+        self.assertFalse(render_info.all_states)
+        self.assertTrue(render_info.matches('sensor.new'))
+        self.assertFalse(render_info.matches('light.kitchen'))
+
+        render_info = self._render_tracked(
+            '{{ closest(states).entity_id }}')
+
+        self.assertTrue(render_info.all_states)
+        self.assertTrue(render_info.matches('light.kitchen'))
+
+    def test_render_tracked_closest_group(self):
+        """Test closest records the group and its members."""
+        group.Group.create_group(
+            self.hass, 'location group', ['test_domain.object'])
+
+        render_info = self._render_tracked(
+            '{{ closest("group.location_group") }}')
+
+        self.assertEqual(
+            {'group.location_group', 'test_domain.object'},
+            render_info.entities)
+
+    def test_compiled_code_shared(self):
+        """Test templates with the same source share the compiled code."""
+        source = '{{ states.sensor.shared_code.state }}'
+        stats = template.cache_stats()
+
+        tpl_1 = template.Template(source, self.hass)
+        tpl_2 = template.Template(source, self.hass)
+        tpl_1.ensure_valid()
+        tpl_2.ensure_valid()
+
+        # pylint: disable=protected-access
+        self.assertIs(tpl_1._compiled_code, tpl_2._compiled_code)
+        self.assertFalse(tpl_1._pure)
+        new_stats = template.cache_stats()
+        self.assertEqual(stats['compile_misses'] + 1,
+                         new_stats['compile_misses'])
+        self.assertEqual(stats['compile_hits'] + 1, new_stats['compile_hits'])
+
+    def test_render_cache_pure_value_template(self):
+        """Test render results of value only templates are cached."""
+        tpl = template.Template(
+            '{{ value_json.temperature | multiply(2) }}', self.hass)
+        stats = template.cache_stats()
+
+        for _ in range(3):
+            self.assertEqual(
+                '42.0', tpl.render_with_possible_json_value(
+                    '{"temperature": 21}'))
+
+        new_stats = template.cache_stats()
+        self.assertEqual(stats['render_misses'] + 1,
+                         new_stats['render_misses'])
+        self.assertEqual(stats['render_hits'] + 2, new_stats['render_hits'])
+
+    def test_render_cache_skips_impure_template(self):
+        """Test templates using states or time are not cached."""
+        stats = template.cache_stats()
+
+        for source in ('{{ value }} {{ states("sensor.test") }}',
+                       '{{ value | timestamp_local }}',
+                       '{{ [value, 2] | random }}',
+                       '{{ [[value]] | map("random") | join }}',
+                       '{% filter random %}{{ value }}{% endfilter %}',
+                       '{{ value }} {{ lipsum(1) }}',
+                       '{{ now() }}'):
+            template.Template(source, self.hass) \
+                .render_with_possible_json_value('1')
+
+        new_stats = template.cache_stats()
+        self.assertEqual(stats['render_misses'], new_stats['render_misses'])
+        self.assertEqual(stats['render_hits'], new_stats['render_hits'])
+
+    @patch('homeassistant.helpers.template.RENDER_CACHE_SIZE', 2)
+    def test_render_cache_from_threads(self):
+        """Test the render cache survives evictions from many threads."""
+        tpl = template.Template('{{ value | int * 2 }}', self.hass)
+        errors = []
+
+        def render(offset):
+            """Render values that keep evicting each other."""
+            try:
+                for value in range(200):
+                    assert str((value + offset) * 2) == \
+                        tpl.render_with_possible_json_value(
+                            str(value + offset))
+            except Exception as err:  # pylint: disable=broad-except
+                errors.append(err)
+
+        threads = [threading.Thread(target=render, args=(offset % 3,))
+                   for offset in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
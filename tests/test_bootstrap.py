@@ -2,13 +2,16 @@
 # pylint: disable=protected-access
 from unittest import mock
 import threading
+import time
 import logging
 
 import voluptuous as vol
 
-from homeassistant import bootstrap, loader
+from homeassistant import bootstrap, core, loader
 import homeassistant.util.dt as dt_util
+from homeassistant.util.async import run_coroutine_threadsafe
 from homeassistant.helpers.config_validation import PLATFORM_SCHEMA
+from homeassistant.helpers.entity_component import EntityComponent
 
 from tests.common import \
     get_test_home_assistant, MockModule, MockPlatform, \
@@ -247,6 +250,101 @@ class TestBootstrap:
         assert len(result) == 1
         assert result[0]
 
+    def test_setup_components_concurrently(self):
+        """Test components are set up concurrently after their dependencies."""
+        b_started = threading.Event()
+        calls = []
+
+        def setup_a(hass, config):
+            """Setup comp_a, which only returns once comp_b has started."""
+            calls.append('comp_a')
+            return b_started.wait(5)
+
+        def setup_b(hass, config):
+            """Setup comp_b."""
+            calls.append('comp_b')
+            b_started.set()
+            return True
+
+        def setup_c(hass, config):
+            """Setup comp_c after its dependency."""
+            calls.append('comp_c')
+            return 'comp_a' in hass.config.components
+
+        loader.set_component('comp_a', MockModule('comp_a', setup=setup_a))
+        loader.set_component('comp_b', MockModule('comp_b', setup=setup_b))
+        loader.set_component('comp_c', MockModule(
+            'comp_c', dependencies=['comp_a'], setup=setup_c))
+
+        run_coroutine_threadsafe(bootstrap._async_setup_components(
+            self.hass, ['comp_c', 'comp_b'], {}), self.hass.loop).result()
+
+        assert sorted(calls[:2]) == ['comp_a', 'comp_b']
+        assert calls[2] == 'comp_c'
+        for comp in ('comp_a', 'comp_b', 'comp_c'):
+            assert comp in self.hass.config.components
+            assert comp in self.hass.data[bootstrap.DATA_SETUP_TIMELINE]
+
+    def test_setup_dependency_already_in_progress(self):
+        """Test requesting a component that is being set up waits for it."""
+        b_started = threading.Event()
+        calls = []
+
+        def setup_a(hass, config):
+            """Setup comp_a once comp_b waits for it."""
+            calls.append('comp_a')
+            b_started.wait(5)
+            for _ in range(50):
+                if hass.data.get(bootstrap.DATA_SETUP_WAITS):
+                    break
+                time.sleep(0.01)
+            return 'comp_b' not in hass.config.components
+
+        def setup_b(hass, config):
+            """Setup comp_b, which sets up comp_a itself."""
+            b_started.set()
+            return bootstrap.setup_component(hass, 'comp_a')
+
+        loader.set_component('comp_a', MockModule('comp_a', setup=setup_a))
+        loader.set_component('comp_b', MockModule('comp_b', setup=setup_b))
+
+        run_coroutine_threadsafe(bootstrap._async_setup_components(
+            self.hass, ['comp_a', 'comp_b'], {}), self.hass.loop).result()
+
+        assert calls == ['comp_a']
+        assert 'comp_a' in self.hass.config.components
+        assert 'comp_b' in self.hass.config.components
+
+    def test_setup_more_sync_components_than_workers(self):
+        """Test sync setups waiting on their platforms do not starve."""
+        domains = ['comp_{}'.format(idx) for idx in range(
+            core.EXECUTOR_POOLS[core.POOL_DEFAULT] + 3)]
+
+        def setup_platform(hass, config, add_devices, discovery_info=None):
+            """Setup a platform."""
+            add_devices([])
+
+        def setup(hass, config):
+            """Setup an entity component and its platform."""
+            domain = next(domain for domain in domains if domain in config)
+            # Let the other setups start before the platform is set up
+            time.sleep(0.1)
+            EntityComponent(_LOGGER, domain, hass).setup(config)
+            return True
+
+        for domain in domains:
+            loader.set_component(domain, MockModule(domain, setup=setup))
+            loader.set_component(
+                '{}.test'.format(domain),
+                MockPlatform(setup_platform=setup_platform))
+
+        config = {domain: {'platform': 'test'} for domain in domains}
+        run_coroutine_threadsafe(bootstrap._async_setup_components(
+            self.hass, domains, config), self.hass.loop).result(10)
+
+        for domain in domains:
+            assert domain in self.hass.config.components
+
     def test_component_not_setup_missing_dependencies(self):
         """Test we do not setup a component if not all dependencies loaded."""
         deps = ['non_existing']
@@ -180,6 +180,9 @@ class TestConfig(unittest.TestCase):
             {'customize': 'bla'},
             {'customize': {'invalid_entity_id': {}}},
             {'customize': {'light.sensor': 100}},
+            {'customize': {'light.sensor': {'throttle_interval': -1}}},
+            {'executor_pools': {'unknown': 2}},
+            {'executor_pools': {'device': 0}},
         ):
             with pytest.raises(MultipleInvalid):
                 config_util.CORE_CONFIG_SCHEMA(value)
@@ -194,6 +197,9 @@ class TestConfig(unittest.TestCase):
                     'hidden': True,
                 },
             },
+            'executor_pools': {
+                'device': 20,
+            },
         })
 
     def test_entity_customization(self):
@@ -279,8 +285,10 @@ class TestConfig(unittest.TestCase):
                 'name': 'Huis',
                 CONF_UNIT_SYSTEM: CONF_UNIT_SYSTEM_IMPERIAL,
                 'time_zone': 'America/New_York',
+                'executor_pools': {'device': 20},
             }), self.hass.loop).result()
 
+        assert self.hass.executors['device'].max_workers == 20
         assert self.hass.config.latitude == 60
         assert self.hass.config.longitude == 50
         assert self.hass.config.elevation == 25
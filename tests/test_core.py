@@ -318,6 +318,37 @@ class TestEventBus(unittest.TestCase):
 
         assert len(calls) == 1
 
+    def test_listen_state_changed(self):
+        """Test listening for state changes of specific entities."""
+        calls = []
+
+        @ha.callback
+        def listener(event):
+            """Mock listener."""
+            calls.append(event.data['entity_id'])
+
+        old_count = self.bus.listeners.get(EVENT_STATE_CHANGED, 0)
+        unsub = run_callback_threadsafe(
+            self.hass.loop, self.bus.async_listen_state_changed,
+            ['light.kitchen', 'light.bed'], listener).result()
+
+        self.assertEqual(
+            old_count + 1, self.bus.listeners[EVENT_STATE_CHANGED])
+
+        for entity_id in ('light.kitchen', 'light.hall', 'light.bed'):
+            self.bus.fire(EVENT_STATE_CHANGED, {'entity_id': entity_id})
+        self.hass.block_till_done()
+
+        self.assertEqual(['light.kitchen', 'light.bed'], calls)
+
+        run_callback_threadsafe(self.hass.loop, unsub).result()
+        self.bus.fire(EVENT_STATE_CHANGED, {'entity_id': 'light.kitchen'})
+        self.hass.block_till_done()
+
+        self.assertEqual(2, len(calls))
+        self.assertEqual(
+            old_count, self.bus.listeners.get(EVENT_STATE_CHANGED, 0))
+
     def test_listen_once_event_with_callback(self):
         """Test listen_once_event method."""
         runs = []
@@ -504,6 +535,31 @@ class TestStateMachine(unittest.TestCase):
         self.assertTrue('light.bowl' in ent_ids)
         self.assertTrue('switch.ac' in ent_ids)
 
+        ent_ids = self.states.entity_ids('light')
+        self.assertEqual(['light.bowl'], ent_ids)
+
+        self.states.remove('light.bowl')
+        self.assertEqual([], self.states.entity_ids('light'))
+
+    def test_async_sorted(self):
+        """Test the sorted view is kept up to date."""
+        self.states.set('light.Alpha', 'off')
+
+        self.assertEqual(
+            ['light.alpha', 'light.bowl', 'switch.ac'],
+            [state.entity_id for state in run_callback_threadsafe(
+                self.hass.loop, self.states.async_sorted).result()])
+
+        self.states.set('light.Bowl', 'off')
+        self.states.remove('light.alpha')
+
+        states = run_callback_threadsafe(
+            self.hass.loop, self.states.async_sorted, 'light').result()
+        self.assertEqual(1, len(states))
+        self.assertEqual('off', states[0].state)
+        self.assertEqual([], run_callback_threadsafe(
+            self.hass.loop, self.states.async_sorted, 'sensor').result())
+
         ent_ids = self.states.entity_ids('light')
         self.assertEqual(1, len(ent_ids))
         self.assertTrue('light.bowl' in ent_ids)
@@ -1,6 +1,7 @@
 """Test Home Assistant remote methods and classes."""
 # pylint: disable=protected-access
 import asyncio
+import json
 import threading
 import unittest
 from unittest.mock import patch
@@ -9,7 +10,8 @@ import homeassistant.core as ha
 import homeassistant.bootstrap as bootstrap
 import homeassistant.remote as remote
 import homeassistant.components.http as http
-from homeassistant.const import HTTP_HEADER_HA_AUTH, EVENT_STATE_CHANGED
+from homeassistant.const import (
+    HTTP_HEADER_HA_AUTH, EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED)
 import homeassistant.util.dt as dt_util
 
 from tests.common import (
@@ -230,6 +232,24 @@ class TestRemoteMethods(unittest.TestCase):
         now = dt_util.utcnow()
         self.assertEqual(now.isoformat(), ha_json_enc.default(now))
 
+    def test_json_dumps(self):
+        """Test json_dumps matches the JSON Encoder and caches states."""
+        state = ha.State('test.json', 'on', {'when': dt_util.utcnow()})
+        event = ha.Event(EVENT_STATE_CHANGED, {
+            'entity_id': 'test.json', 'old_state': None, 'new_state': state})
+        data = {'states': [state], 'events': (event,), 'count': 1}
+
+        self.assertEqual(
+            json.loads(json.dumps(data, cls=remote.JSONEncoder)),
+            json.loads(remote.json_dumps(data)))
+
+        cached = remote.json_dumps(state)
+        self.assertIs(cached, remote.json_dumps(state))
+
+        self.assertEqual(
+            json.dumps(data, sort_keys=True, cls=remote.JSONEncoder),
+            remote.json_dumps(data, sort_keys=True))
+
 
 class TestRemoteClasses(unittest.TestCase):
     """Test the homeassistant.remote module."""
@@ -315,3 +335,48 @@ class TestRemoteClasses(unittest.TestCase):
     def test_get_config(self):
         """Test the return of the configuration."""
         self.assertEqual(hass.config.as_dict(), remote.get_config(master_api))
+
+
+@asyncio.coroutine
+def test_event_forwarder_without_bulk(hass, aioclient_mock):
+    """Test events are posted one by one to a target without bulk support."""
+    aioclient_mock.post('http://example.com:8123/api/events_bulk',
+                        status=404)
+    aioclient_mock.post('http://example.com:8123/api/events/test_event')
+
+    forwarder = remote.EventForwarder(hass)
+    forwarder.async_connect(remote.API('example.com', API_PASSWORD))
+
+    hass.bus.async_fire('test_event', {'order': 1})
+    yield from hass.async_block_till_done()
+    hass.bus.async_fire('test_event', {'order': 2})
+    yield from hass.async_block_till_done()
+
+    assert [url.split(':8123')[1] for _, url in aioclient_mock.mock_calls] \
+        == ['/api/events_bulk', '/api/events/test_event',
+            '/api/events/test_event']
+
+
+@asyncio.coroutine
+def test_event_forwarder_survives_errors(hass):
+    """Test a failing batch does not stop the forwarding."""
+    forwarder = remote.EventForwarder(hass)
+
+    with patch.object(forwarder, '_async_post',
+                      side_effect=TypeError('not serializable')) as mock_post:
+        forwarder.async_connect(remote.API('example.com', API_PASSWORD))
+
+        hass.bus.async_fire('test_event')
+        yield from hass.async_block_till_done()
+        hass.bus.async_fire('test_event')
+        yield from hass.async_block_till_done()
+
+    assert mock_post.call_count == 2
+    task, = forwarder._tasks.values()
+    assert not task.done()
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    yield from hass.async_block_till_done()
+
+    assert task.cancelled()
+    assert not forwarder._tasks
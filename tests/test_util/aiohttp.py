@@ -58,7 +58,8 @@ class AiohttpClientMocker:
         return len(self.mock_calls)
 
     @asyncio.coroutine
-    def match_request(self, method, url, *, auth=None): \
+    def match_request(self, method, url, *, auth=None, data=None,
+                      headers=None): \
             # pylint: disable=unused-variable
         """Match a request against pre-registered requests."""
         for response in self._mocks:
@@ -0,0 +1,64 @@
+"""Test Home Assistant executor utils."""
+import threading
+import unittest
+
+from homeassistant.util.executor import InstrumentedExecutor
+
+
+class TestInstrumentedExecutor(unittest.TestCase):
+    """Test the InstrumentedExecutor."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Setup things to be run when tests are started."""
+        self.executor = InstrumentedExecutor('test', 1)
+
+    def tearDown(self):  # pylint: disable=invalid-name
+        """Stop everything that was started."""
+        self.executor.shutdown()
+
+    def test_stats(self):
+        """Test queued, active and completed jobs are counted."""
+        release = threading.Event()
+        running = threading.Event()
+
+        def blocking_job():
+            """Block until released."""
+            running.set()
+            release.wait(5)
+            return 'done'
+
+        first = self.executor.submit(blocking_job)
+        second = self.executor.submit(lambda: 'queued')
+        running.wait(5)
+
+        stats = self.executor.stats()
+        self.assertEqual('test', stats['name'])
+        self.assertEqual(1, stats['active'])
+        self.assertEqual(1, stats['queued'])
+
+        release.set()
+        self.assertEqual('done', first.result(5))
+        self.assertEqual('queued', second.result(5))
+
+        stats = self.executor.stats()
+        self.assertEqual(0, stats['active'])
+        self.assertEqual(0, stats['queued'])
+        self.assertEqual(2, stats['completed'])
+        self.assertEqual(2, sum(stats['run_latency'].values()))
+        self.assertEqual(2, sum(stats['wait_latency'].values()))
+
+    def test_cancelled_job(self):
+        """Test a job cancelled before it ran is no longer queued."""
+        release = threading.Event()
+        self.executor.submit(release.wait, 5)
+        future = self.executor.submit(lambda: None)
+
+        self.assertTrue(future.cancel())
+        release.set()
+
+        self.assertEqual(0, self.executor.stats()['queued'])
+
+    def test_set_max_workers(self):
+        """Test changing the number of workers."""
+        self.executor.set_max_workers(3)
+        self.assertEqual(3, self.executor.max_workers)
@@ -112,6 +112,57 @@ class TestLocationUtil(TestCase):
         info = location_util.detect_location_info(_test_real=True)
         assert info is None
 
+    def test_distance_lower_bound(self):
+        """Test the lower bound does not exceed the distance."""
+        meters = location_util.distance_lower_bound(COORDINATES_PARIS[0],
+                                                    COORDINATES_PARIS[1],
+                                                    COORDINATES_NEW_YORK[0],
+                                                    COORDINATES_NEW_YORK[1])
+
+        assert 0.98 * DISTANCE_KM < meters / 1000 <= DISTANCE_KM
+
+    def test_grid_index_candidates(self):
+        """Test the grid index returns circles that might overlap."""
+        index = location_util.GridIndex()
+        index.add('paris', COORDINATES_PARIS[0], COORDINATES_PARIS[1], 1000)
+        index.add('new_york', COORDINATES_NEW_YORK[0],
+                  COORDINATES_NEW_YORK[1], 1000)
+
+        assert len(index) == 2
+        assert {'paris'} == index.candidates(*COORDINATES_PARIS)
+        # Just outside the circle but within the same cell
+        assert {'paris'} == index.candidates(COORDINATES_PARIS[0] + 0.0095,
+                                             COORDINATES_PARIS[1])
+        assert set() == index.candidates(COORDINATES_PARIS[0] + 1,
+                                         COORDINATES_PARIS[1])
+        # A query radius that reaches into the circle
+        assert {'paris'} == index.candidates(COORDINATES_PARIS[0] + 0.2,
+                                             COORDINATES_PARIS[1], 22000)
+
+    def test_grid_index_move_and_remove(self):
+        """Test moving and removing circles from the grid index."""
+        index = location_util.GridIndex()
+        index.add('zone', COORDINATES_PARIS[0], COORDINATES_PARIS[1], 100)
+        index.add('zone', COORDINATES_NEW_YORK[0], COORDINATES_NEW_YORK[1],
+                  100)
+
+        assert set() == index.candidates(*COORDINATES_PARIS)
+        assert {'zone'} == index.candidates(*COORDINATES_NEW_YORK)
+
+        index.remove('zone')
+        index.remove('unknown')
+
+        assert 'zone' not in index
+        assert set() == index.candidates(*COORDINATES_NEW_YORK)
+
+    def test_grid_index_wide_circles(self):
+        """Test circles around a pole or over many cells match any point."""
+        index = location_util.GridIndex()
+        index.add('pole', 89.9, 0, 50000)
+        index.add('big', COORDINATES_PARIS[0], COORDINATES_PARIS[1], 1000000)
+
+        assert {'pole', 'big'} == index.candidates(*COORDINATES_NEW_YORK)
+
     @patch('homeassistant.util.location.requests.get',
            side_effect=requests.RequestException)
     def test_freegeoip_query_raises(self, mock_get):